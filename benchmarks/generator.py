@@ -0,0 +1,89 @@
+"""Generates synthetic docker-compose files, with a tunable number of services and options per service.
+
+Usage: python -m benchmarks.generator [--services 1000] > docker-compose.yml
+"""
+import argparse
+import sys
+
+import yaml
+
+
+def get_service(index: int, labels: int = 5, env_vars: int = 5, ulimits: bool = True, logging: bool = True) -> dict:
+    service = {
+        "image": f"example/service{index}:latest",
+        "container_name": f"service{index}",
+        "restart": "always",
+        "ports": [f"{8000 + index % 1000}:80"],
+        "labels": [f"com.example.label{label}=value{label}" for label in range(labels)],
+        "environment": {f"VAR_{env}": f"value{env}" for env in range(env_vars)},
+    }
+    if ulimits:
+        service["ulimits"] = {"nproc": 65535, "nofile": {"soft": 20000, "hard": 40000}}
+    if logging:
+        service["logging"] = {"driver": "json-file", "options": {"max-size": "1k", "max-file": "3"}}
+    return service
+
+
+def get_network(index: int) -> dict:
+    ipam = {"config": {"subnet": "10.0.0.0/8"}}
+    return {"driver": "bridge", "labels": [f"com.example.network={index}"], "ipam": ipam}
+
+
+def get_volume(index: int) -> dict:
+    return {"driver": "local", "labels": [f"com.example.volume={index}"], "name": f"volume{index}"}
+
+
+def get_docker_compose(
+    services: int,
+    networks: int = None,
+    volumes: int = None,
+    labels: int = 5,
+    env_vars: int = 5,
+    ulimits: bool = True,
+    logging: bool = True,
+) -> dict:
+    """A docker-compose document, by default with one network and volume per ten services. Every service but the first
+    ``depends_on`` another, forming a tree so the services are started in ``log2(services)`` levels."""
+    networks = services // 10 if networks is None else networks
+    volumes = services // 10 if volumes is None else volumes
+    docker_compose = {"version": "3.8", "services": {}}
+    for index in range(services):
+        service = get_service(index, labels=labels, env_vars=env_vars, ulimits=ulimits, logging=logging)
+        if index:
+            service["depends_on"] = [f"service{(index - 1) // 2}"]
+        docker_compose["services"][f"service{index}"] = service
+
+    docker_compose["networks"] = {f"network{index}": get_network(index) for index in range(networks)}
+    docker_compose["volumes"] = {f"volume{index}": get_volume(index) for index in range(volumes)}
+    return docker_compose
+
+
+def dump(docker_compose: dict) -> str:
+    return yaml.dump(docker_compose, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper), sort_keys=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--services", type=int, default=1000, help="Number of services.")
+    parser.add_argument("--networks", type=int, help="Number of networks, defaults to one per ten services.")
+    parser.add_argument("--volumes", type=int, help="Number of volumes, defaults to one per ten services.")
+    parser.add_argument("--labels", type=int, default=5, help="Number of labels per service.")
+    parser.add_argument("--env-vars", type=int, default=5, help="Number of environment variables per service.")
+    parser.add_argument("--no-ulimits", action="store_true", help="Don't set ulimits on the services.")
+    parser.add_argument("--no-logging", action="store_true", help="Don't set logging options on the services.")
+    options = parser.parse_args()
+
+    docker_compose = get_docker_compose(
+        options.services,
+        networks=options.networks,
+        volumes=options.volumes,
+        labels=options.labels,
+        env_vars=options.env_vars,
+        ulimits=not options.no_ulimits,
+        logging=not options.no_logging,
+    )
+    sys.stdout.write(dump(docker_compose))
+
+
+if __name__ == "__main__":
+    main()
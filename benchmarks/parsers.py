@@ -0,0 +1,50 @@
+"""Measures how long the parsers take to convert a single service, network and volume.
+
+Usage: python -m benchmarks.parsers [--services 5000] [--repeat 5]
+"""
+import argparse
+import timeit
+
+from benchmarks.generator import get_network
+from benchmarks.generator import get_service
+from benchmarks.generator import get_volume
+from composerisation.docker_compose.networks.networks import NetworkParser
+from composerisation.docker_compose.services.services import ServicesParser
+from composerisation.docker_compose.volumes.volumes import VolumeParser
+
+
+def benchmark(name: str, convert, configs: list, repeat: int):
+    timer = timeit.Timer(lambda: [convert(index, config) for index, config in enumerate(configs)])
+    best = min(timer.repeat(repeat=repeat, number=1))
+    print(f"{name:<10} {best / len(configs) * 1e6:8.2f} us per item ({len(configs)} items, best of {repeat})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--services", type=int, default=5000, help="Number of items to convert per run.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs, the fastest is reported.")
+    options = parser.parse_args()
+
+    count = options.services
+    benchmark(
+        "services",
+        lambda index, config: ServicesParser(f"service{index}", service_options=config).get_start_command(),
+        [get_service(index) for index in range(count)],
+        options.repeat,
+    )
+    benchmark(
+        "networks",
+        lambda index, config: NetworkParser(network_name=f"network{index}", network_config=config).get_start_command(),
+        [get_network(index) for index in range(count)],
+        options.repeat,
+    )
+    benchmark(
+        "volumes",
+        lambda index, config: VolumeParser(volume_name=f"volume{index}", volume_config=config).get_start_command(),
+        [get_volume(index) for index in range(count)],
+        options.repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()
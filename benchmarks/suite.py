@@ -0,0 +1,128 @@
+"""Times each step of converting synthetic docker-compose files, and compares the throughput against a baseline.
+
+Each step is timed separately: parsing the yaml (load), converting to start commands (start), converting to delete
+commands (delete) and the whole cli (cli). Results are in services per second, the fastest of --repeat runs. With
+--baseline, any step more than --tolerance slower than the baseline is reported and we exit with an error.
+
+Usage: python -m benchmarks.suite [--services 10 100 1000 10000] [--output results.json] [--baseline FILE]
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import yaml
+
+from benchmarks.generator import dump
+from benchmarks.generator import get_docker_compose
+from composerisation.cli import cli
+from composerisation.converter import get_docker_delete_commands
+from composerisation.converter import get_docker_start_commands
+from composerisation.converter import load_docker_compose
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+STEPS = ["load", "start", "delete", "cli"]
+
+
+def get_repeat(services: int, repeat: int) -> int:
+    """Large files take a long time to convert, so are run fewer times."""
+    return max(1, min(repeat, 100_000 // (services * 10) or 1))
+
+
+def time_step(step, data: str, docker_compose: dict, repeat: int) -> float:
+    """The fastest of ``repeat`` runs of a step, in seconds. The conversion doesn't change the docker-compose dict, so
+    every run converts the same one."""
+    timings = []
+    for _ in range(repeat):
+        argument = data if step is load_docker_compose else docker_compose
+        start = time.perf_counter()
+        step(argument)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_cli(path: str):
+    with contextlib.redirect_stdout(io.StringIO()):
+        cli.main(["-l", "ERROR", "-i", path], standalone_mode=False)
+
+
+def benchmark(services: int, repeat: int) -> dict:
+    docker_compose = get_docker_compose(services)
+    data = dump(docker_compose)
+    repeat = get_repeat(services, repeat)
+
+    timings = {
+        "load": time_step(load_docker_compose, data, docker_compose, repeat),
+        "start": time_step(get_docker_start_commands, data, docker_compose, repeat),
+        "delete": time_step(get_docker_delete_commands, data, docker_compose, repeat),
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "docker-compose.yml")
+        with open(path, "w") as docker_compose_file:
+            docker_compose_file.write(data)
+        timings["cli"] = time_step(lambda _: run_cli(path), data, {}, repeat)
+
+    result = {step: {"seconds": timing, "services_per_second": services / timing} for step, timing in timings.items()}
+    print(
+        f"{services:>7} services  {len(data) / 1024:9.1f} KiB  "
+        + "  ".join(f"{step} {result[step]['services_per_second']:10.0f}/s" for step in STEPS)
+    )
+    return result
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Compares the throughput of each step against the baseline, sizes missing from either are skipped.
+
+    Returns:
+        list: Of messages, one for each step which is more than ``tolerance`` slower than the baseline.
+
+    """
+    regressions = []
+    for services, steps in results.items():
+        for step, result in steps.items():
+            expected = baseline.get(services, {}).get(step)
+            if expected is None:
+                continue
+
+            ratio = result["services_per_second"] / expected["services_per_second"]
+            if ratio < 1 - tolerance:
+                regressions.append(f"{step} ({services} services) is {1 - ratio:.0%} slower than the baseline.")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--services", type=int, nargs="+", default=[10, 100, 1000, 10000], help="File sizes.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs, the fastest is reported.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", nargs="?", const=BASELINE, help="Compare against this JSON file.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown against the baseline.")
+    options = parser.parse_args()
+
+    logging.getLogger("composerisation").setLevel(logging.ERROR)
+    print(f"Python {platform.python_version()}, libyaml {yaml.__with_libyaml__}")
+    results = {str(services): benchmark(services, options.repeat) for services in options.services}
+
+    if options.output:
+        with open(options.output, "w") as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+            output_file.write("\n")
+
+    if options.baseline:
+        with open(options.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), options.tolerance)
+        for regression in regressions:
+            print(regression)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {options.baseline}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Measures how many requests per second the website can convert, using the Flask test client.
+
+Usage: python -m benchmarks.website [--requests 2000] [--unique]
+"""
+import argparse
+import os
+import sys
+import time
+
+WEBSITE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "website")
+
+
+def get_app():
+    os.chdir(WEBSITE_DIR)
+    sys.path.insert(0, WEBSITE_DIR)
+    from main import app
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000, help="Number of requests to send.")
+    parser.add_argument("--unique", action="store_true", help="Send a different document with every request.")
+    options = parser.parse_args()
+
+    app = get_app()
+    client = app.test_client()
+    sample = open(os.path.join(WEBSITE_DIR, "static", "content", "yaml.txt")).read()
+    documents = [f"{sample}\n# {index}\n" if options.unique else sample for index in range(options.requests)]
+
+    start = time.perf_counter()
+    for document in documents:
+        response = client.post("/docker/compose", json={"docker_compose": document})
+        assert response.status_code == 200, response.status_code
+    elapsed = time.perf_counter() - start
+    print(f"{options.requests / elapsed:8.1f} requests/second ({options.requests} requests, unique={options.unique})")
+
+
+if __name__ == "__main__":
+    main()
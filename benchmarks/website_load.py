@@ -0,0 +1,138 @@
+"""Measures the latency of the website under concurrent requests, mixing small and large docker-compose files.
+
+Runs in-process, against the async app in ``asgi.py`` or with ``--flask`` against the Flask app in ``main.py`` called
+from a pool of threads (like a threaded WSGI server). Every document is unique so nothing is served from the cache.
+
+Usage: python -m benchmarks.website_load [--requests 400] [--concurrency 16] [--large 0.1] [--flask]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.generator import dump, get_docker_compose
+
+WEBSITE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "website")
+
+
+def get_module(name: str):
+    os.chdir(WEBSITE_DIR)
+    sys.path.insert(0, WEBSITE_DIR)
+    return __import__(name)
+
+
+def get_documents(requests: int, large: float, large_services: int, seed: int = 0) -> list:
+    """``(size, document)`` pairs in a random order, where ``large`` is the fraction of large documents."""
+    small_sample = open(os.path.join(WEBSITE_DIR, "static", "content", "yaml.txt")).read()
+    large_sample = dump(get_docker_compose(large_services))
+    rng = random.Random(seed)
+    documents = []
+    for index in range(requests):
+        if rng.random() < large:
+            documents.append(("large", f"{large_sample}\n# {index}\n"))
+        else:
+            documents.append(("small", f"{small_sample}\n# {index}\n"))
+    return documents
+
+
+async def post_asgi(app, document: str) -> int:
+    body = json.dumps({"docker_compose": document}).encode("utf-8")
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/docker/compose",
+        "query_string": b"",
+        "headers": [(b"content-type", b"application/json")],
+    }
+    status = None
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def run_asgi(documents: list, concurrency: int) -> list:
+    asgi = get_module("asgi")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request(size: str, document: str):
+        async with semaphore:
+            start = time.perf_counter()
+            status = await post_asgi(asgi.app, document)
+            return size, status, time.perf_counter() - start
+
+    try:
+        # Start the pools before timing, so the first requests don't pay for forking the workers.
+        await asyncio.gather(*[lane.convert("version: '3'") for lane in (asgi.small_lane, asgi.large_lane)])
+        return await asyncio.gather(*[request(size, document) for size, document in documents])
+    finally:
+        asgi.small_lane.shutdown()
+        asgi.large_lane.shutdown()
+
+
+def run_flask(documents: list, concurrency: int) -> list:
+    app = get_module("main").app
+
+    def request(item: tuple):
+        size, document = item
+        start = time.perf_counter()
+        response = app.test_client().post("/docker/compose", json={"docker_compose": document})
+        return size, response.status_code, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(request, documents))
+
+
+def percentile(latencies: list, percent: float) -> float:
+    return latencies[min(len(latencies) - 1, int(len(latencies) * percent / 100))]
+
+
+def report(results: list, elapsed: float):
+    print(f"{len(results) / elapsed:8.1f} requests/second ({len(results)} requests in {elapsed:.2f}s)")
+    print(f"{'size':>6} {'count':>6} {'429s':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for size in ("small", "large"):
+        statuses = [status for result_size, status, _ in results if result_size == size]
+        # Rejected requests return straight away, so only converted requests count towards the latency.
+        converted = [latency for result_size, status, latency in results if (result_size, status) == (size, 200)]
+        latencies = sorted(latency * 1000 for latency in converted)
+        if not latencies:
+            continue
+        rejected = statuses.count(429)
+        p50, p95, p99 = (percentile(latencies, percent) for percent in (50, 95, 99))
+        print(f"{size:>6} {len(statuses):6d} {rejected:6d} {p50:9.1f} {p95:9.1f} {p99:9.1f} {latencies[-1]:9.1f}")
+
+    unexpected = {status for _, status, _ in results} - {200, 429}
+    assert not unexpected, unexpected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400, help="Number of requests to send.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Number of requests in flight at once.")
+    parser.add_argument("--large", type=float, default=0.1, help="Fraction of requests with a large document.")
+    parser.add_argument("--large-services", type=int, default=500, help="Number of services in a large document.")
+    parser.add_argument("--flask", action="store_true", help="Use the Flask app rather than the async app.")
+    options = parser.parse_args()
+
+    documents = get_documents(options.requests, options.large, options.large_services)
+    start = time.perf_counter()
+    if options.flask:
+        results = run_flask(documents, options.concurrency)
+    else:
+        results = asyncio.get_event_loop().run_until_complete(run_asgi(documents, options.concurrency))
+    report(results, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Compares how long the pure Python and libyaml loaders take to parse docker-compose files.
+
+Usage: python -m benchmarks.yaml_loader [--services 100 1000 10000] [--repeat 3]
+"""
+import argparse
+import glob
+import timeit
+
+import yaml
+
+from benchmarks.generator import dump
+from benchmarks.generator import get_docker_compose
+
+
+def benchmark(name: str, data: str, repeat: int):
+    loaders = [yaml.SafeLoader] + ([yaml.CSafeLoader] if yaml.__with_libyaml__ else [])
+    timings = []
+    for loader in loaders:
+        timer = timeit.Timer(lambda: list(yaml.load_all(data, Loader=loader)))
+        number, _ = timer.autorange()
+        timings.append(min(timer.repeat(repeat=repeat, number=number)) / number)
+
+    results = "  ".join(f"{loader.__name__} {timing * 1000:9.2f} ms" for loader, timing in zip(loaders, timings))
+    speedup = f"  ({timings[0] / timings[-1]:.1f}x faster)" if len(timings) > 1 else ""
+    print(f"{name:<28} {len(data) / 1024:9.1f} KiB  {results}{speedup}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--services", type=int, nargs="+", default=[100, 1000, 10000], help="Synthetic file sizes.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs, the fastest is reported.")
+    options = parser.parse_args()
+
+    if not yaml.__with_libyaml__:
+        print("PyYaml was built without libyaml, only the pure Python loader is available.")
+
+    for path in sorted(glob.glob("tests/data/*.yml")):
+        if "invalid" not in path:
+            benchmark(path, open(path).read(), options.repeat)
+
+    for services in options.services:
+        benchmark(f"synthetic ({services} services)", dump(get_docker_compose(services)), options.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -18,7 +18,7 @@ setup(
     zip_safe=False,
     include_package_data=True,
     install_requires=["click>=7.0", "pyyaml>=5.1"],
-    entry_points={"console_scripts": ["composerisation = composerisation.cli:cli"]},
+    entry_points={"console_scripts": ["composerisation = composerisation.client:main"]},
     classifiers=[
         "Programming Language :: Python",
         "Intended Audience :: Developers",
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""This module converts many docker-compose files at once, spreading the work across a pool of processes. So we only
+pay for starting the interpreter once, rather than once per file.
+
+.. _Google Python Style Guide:
+    http://google.github.io/styleguide/pyguide.html
+
+"""
+import fnmatch
+import functools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+from typing import NamedTuple
+
+import yaml
+
+from .cache import ConversionCache
+from .converter import get_docker_commands
+from .converter import load_docker_compose_documents
+from .docker_compose.project import Project
+from .docker_compose.project import get_project
+from .utils import exceptions
+
+logger = logging.getLogger(__name__)
+
+DOCKER_COMPOSE_PATTERNS = ["docker-compose*.yml", "docker-compose*.yaml"]
+
+
+class BatchResult(NamedTuple):
+    """The result of converting a single docker-compose file.
+
+    Attributes:
+        path (str): Path to the docker-compose file.
+        output (str): The Docker cli commands, as printed by the cli. Empty if the conversion failed.
+        error (str): Why the conversion failed, empty if it succeeded.
+
+    """
+
+    path: str
+    output: str = ""
+    error: str = ""
+
+
+def find_docker_compose_files(input_dir: str) -> list:
+    """Recursively finds all of the docker-compose files, i.e. ``docker-compose.yml`` or
+    ``docker-compose.prod.yml``, in a directory.
+
+    Args:
+        input_dir (str): The directory to search.
+
+    Returns:
+        list: Sorted paths to the docker-compose files.
+
+    """
+    paths = []
+    for root, _, files in os.walk(input_dir):
+        for name in files:
+            if any(fnmatch.fnmatch(name, pattern) for pattern in DOCKER_COMPOSE_PATTERNS):
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+
+def get_output_path(path: str, input_dir: str, output_dir: str) -> str:
+    """Gets where to write the output of a docker-compose file, keeping the same directory structure as the input.
+    i.e. ``<input_dir>/app/docker-compose.yml`` becomes ``<output_dir>/app/docker-compose.sh``.
+
+    Args:
+        path (str): Path to the docker-compose file.
+        input_dir (str): The directory the docker-compose file was found in.
+        output_dir (str): The directory to write the outputs to.
+
+    Returns:
+        str: Path to write the output to.
+
+    """
+    relative_path = os.path.relpath(path, input_dir)
+    name, _ = os.path.splitext(relative_path)
+    return os.path.join(output_dir, f"{name}.sh")
+
+
+def convert_file(path: str, cache_dir: str = None, project: Project = None) -> BatchResult:
+    """Converts a single docker-compose file, any errors are returned rather than raised so one bad file doesn't stop
+    the rest of the batch.
+
+    Args:
+        path (str): Path to the docker-compose file.
+        cache_dir (str, optional): Directory of the cache of converted networks, volumes and services, see
+            ``composerisation.cache``.
+        project (Project, optional): The project to convert for, by default named after the current directory.
+
+    Returns:
+        BatchResult: The Docker cli commands or the reason it failed.
+
+    """
+    cache = ConversionCache(cache_dir) if cache_dir else None
+    project = project or get_project()
+    try:
+        commands = []
+        with open(path) as input_file:
+            for docker_compose in load_docker_compose_documents(input_file):
+                commands += get_docker_commands(docker_compose, cache=cache, project=project)
+    except OSError as e:
+        return BatchResult(path=path, error=f"Could not read file, {e.strerror}.")
+    except yaml.YAMLError:
+        return BatchResult(path=path, error=f"Invalid yaml file, {path}.")
+    except (exceptions.IncorrectConfigException, exceptions.CyclicDependencyException) as e:
+        return BatchResult(path=path, error=str(e))
+    except (AttributeError, TypeError, ValueError) as e:
+        # An option with the wrong type, i.e. a number where a list is expected, which the parsers don't check for.
+        logger.debug(f"Failed to convert {path}.", exc_info=True)
+        return BatchResult(path=path, error=f"Invalid config in {path}, {e}.")
+
+    return BatchResult(path=path, output="\n".join(commands))
+
+
+def convert_files(
+    paths: list, workers: int = None, log_level: str = "INFO", cache_dir: str = None, project: Project = None
+) -> Iterator[BatchResult]:
+    """Converts docker-compose files in parallel, using a pool of processes (one per CPU by default).
+
+    Args:
+        paths (list): Paths to the docker-compose files.
+        workers (int, optional): Number of processes to use.
+        log_level (str, optional): Log level used by the processes.
+        cache_dir (str, optional): Directory of the cache shared by the processes, the caller is expected to prune it.
+        project (Project, optional): The project to convert every file for, by default named after the current
+            directory.
+
+    Returns:
+        iterator: Of ``BatchResult``, in the same order as ``paths``.
+
+    """
+    workers = min(workers or os.cpu_count() or 1, len(paths) or 1)
+    chunksize = max(1, len(paths) // (workers * 4))
+    logger.info(f"Converting {len(paths)} docker-compose files using {workers} processes.")
+    with ProcessPoolExecutor(max_workers=workers, initializer=_set_log_level, initargs=(log_level,)) as executor:
+        convert = functools.partial(convert_file, cache_dir=cache_dir, project=project)
+        yield from executor.map(convert, paths, chunksize=chunksize)
+
+
+def _set_log_level(log_level: str):
+    """Sets the log level within each process in the pool, so it matches the cli.
+
+    Args:
+        log_level (str): The log level.
+
+    """
+    logging.getLogger("composerisation").setLevel(log_level)
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""This module caches the commands each network, volume and service converts to on disk, so when only a few
+services in a docker-compose file change only those services are converted again.
+
+Each entry is keyed by a hash of the config of the resource, the version of composerisation and anything else the
+commands depend on, such as the name of the project the services are converted for. So an entry is never
+out of date, a changed config simply has a different key. Entries are JSON files, written atomically so several
+processes (i.e. ``--input-dir``) can share the same cache. Once the cache is larger than its maximum size, the least
+recently used entries are removed.
+
+.. _Google Python Style Guide:
+    http://google.github.io/styleguide/pyguide.html
+
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+
+from .cli import __VERSION__
+from .docker_compose.command import Command
+
+logger = logging.getLogger(__name__)
+
+# Change this when the format of the entries changes, so old entries are ignored.
+CACHE_FORMAT = 1
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+ENTRY_SUFFIX = ".json"
+
+
+class CachedService(NamedTuple):
+    """The commands a service converts to, with the same methods as ``ServicesParser`` so it can be used in its place.
+
+    Attributes:
+        config_name (str): The name of the service.
+        build_command (Command): The `docker build` command, None if the service doesn't need to be built.
+        run_commands (:obj:`list` of :obj:`Command`): The `docker run` and `docker network connect` commands.
+        delete_commands (:obj:`list` of :obj:`Command`): The `docker stop` and `docker rm` commands.
+
+    """
+
+    config_name: str
+    build_command: Optional[Command]
+    run_commands: List[Command]
+    delete_commands: List[Command]
+
+    def get_build_command(self) -> Optional[Command]:
+        return self.build_command
+
+    def get_run_commands(self) -> list:
+        return list(self.run_commands)
+
+    def get_delete_command(self) -> list:
+        return list(self.delete_commands)
+
+
+class ConversionCache:
+    """An on-disk cache of the commands each resource in a docker-compose file converts to.
+
+    ::
+
+        cache = ConversionCache(".composerisation-cache")
+        commands = get_docker_commands(docker_compose, cache=cache)
+        cache.prune()
+
+    Args:
+        directory (str): The directory to keep the entries in, created if it doesn't exist.
+        max_size (int, optional): Once the entries take up more than this many bytes, ``prune`` removes the least
+            recently used entries.
+
+    Attributes:
+        hits (int): Number of resources found in the cache.
+        misses (int): Number of resources which had to be converted.
+
+    """
+
+    def __init__(self, directory: str, max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def get_commands(self, kind: str, name: str, config, context: dict, convert: Callable[[], dict]) -> dict:
+        """Gets the commands a resource converts to, from the cache if it has been converted before. Otherwise the
+        resource is converted and the commands are added to the cache.
+
+        Args:
+            kind (str): The type of resource i.e. ``service``.
+            name (str): The name of the resource.
+            config (any): The config of the resource, from the docker-compose file.
+            context (dict): Anything else the commands depend on, i.e. the default network.
+            convert (callable): Converts the resource, returning a dict of lists of ``Command``. Called only when the
+                resource isn't in the cache.
+
+        Returns:
+            dict: Of lists of ``Command``, as returned by ``convert``.
+
+        """
+        key = get_key(kind, name, config, context)
+        # The start and delete commands are converted separately, so each entry is kept in memory for the second.
+        commands = self._entries.get(key)
+        if commands is not None:
+            return commands
+
+        path = os.path.join(self.directory, f"{key}{ENTRY_SUFFIX}")
+        commands = self._read(path)
+        if commands is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            commands = convert()
+            self._write(path, commands)
+        self._entries[key] = commands
+        return commands
+
+    def get_service(self, name: str, options: dict, context: dict, convert: Callable[[], object]) -> CachedService:
+        """Gets the commands a service converts to, see ``get_commands``.
+
+        Args:
+            name (str): The name of the service.
+            options (dict): The config options of the service.
+            context (dict): Anything else the commands depend on, i.e. the default network.
+            convert (callable): Returns the ``ServicesParser`` for the service. Called only when the service isn't in
+                the cache.
+
+        Returns:
+            CachedService: The commands the service converts to.
+
+        """
+
+        def convert_service() -> dict:
+            service = convert()
+            build_command = service.get_build_command()
+            return {
+                "build": [build_command] if build_command else [],
+                "run": service.get_run_commands(),
+                "delete": service.get_delete_command(),
+            }
+
+        commands = self.get_commands("service", name, options, context, convert_service)
+        build_command = commands["build"][0] if commands["build"] else None
+        return CachedService(
+            config_name=name,
+            build_command=build_command,
+            run_commands=commands["run"],
+            delete_commands=commands["delete"],
+        )
+
+    def prune(self) -> int:
+        """Removes the least recently used entries, until the cache is no larger than ``max_size``.
+
+        Returns:
+            int: The number of entries removed.
+
+        """
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(ENTRY_SUFFIX):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        size = sum(entry_size for _, entry_size, _ in entries)
+        removed = 0
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+            removed += 1
+
+        logger.info(f"Cache had {self.hits} hits and {self.misses} misses, removed {removed} old entries.")
+        return removed
+
+    def _read(self, path: str) -> Optional[dict]:
+        """Reads an entry, marking it as recently used. Entries which can't be read are treated as missing."""
+        try:
+            with open(path) as entry_file:
+                entry = json.load(entry_file)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return {name: [Command(tuple(subcommand), args) for subcommand, args in entry[name]] for name in entry}
+
+    def _write(self, path: str, commands: Dict[str, List[Command]]):
+        """Writes an entry to a temporary file and then renames it, so other processes never read half an entry."""
+        entry = {name: [[command.subcommand, command.args] for command in commands[name]] for name in commands}
+        try:
+            with tempfile.NamedTemporaryFile("w", dir=self.directory, suffix=".tmp", delete=False) as entry_file:
+                json.dump(entry, entry_file, separators=(",", ":"))
+            os.replace(entry_file.name, path)
+        except OSError as e:
+            logger.warning(f"Could not write to the cache, {e}.")
+
+
+def get_key(kind: str, name: str, config, context: dict) -> str:
+    """Gets the key of a resource, a hash of its config, the version of composerisation and the context. The parsers
+    add arguments in the order the options are in the config, so configs with the same options in a different order
+    have different keys.
+
+    Args:
+        kind (str): The type of resource i.e. ``service``.
+        name (str): The name of the resource.
+        config (any): The config of the resource, from the docker-compose file.
+        context (dict): Anything else the commands depend on, i.e. the default network.
+
+    Returns:
+        str: The key.
+
+    """
+    data = [CACHE_FORMAT, __VERSION__, kind, name, _get_items(config), _get_items(context)]
+    serialized = json.dumps(data, separators=(",", ":"), default=str)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+def _get_items(value):
+    """Turns every mapping within a config into a list of its items, in order. So the key depends on the order of the
+    options and keys keep their type, JSON would turn both ``1`` and ``"1"`` into ``"1"``."""
+    if isinstance(value, dict):
+        return {"items": [[key, _get_items(item)] for key, item in value.items()]}
+    if isinstance(value, list):
+        return [_get_items(item) for item in value]
+    return value
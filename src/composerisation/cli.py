@@ -3,29 +3,145 @@ __VERSION__ = "0.1.2"
 import logging
 import os
 import sys
+from typing import TYPE_CHECKING
+from typing import Iterator
 
 import click
-import yaml
-
-from composerisation.docker_compose.networks.networks import NetworkParser
-from composerisation.docker_compose.services.services import ServicesParser
-from composerisation.docker_compose.volumes.volumes import VolumeParser
 
 from .utils import exceptions
 
-logging.basicConfig(stream=sys.stdout, level=logging.INFO)
+if TYPE_CHECKING:
+    from .cache import ConversionCache
+    from .docker_compose.project import Project
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_SCRIPT_JOBS = 4
+DEFAULT_CACHE_SIZE = 64
+# Moved to ``composerisation.converter``, still importable from here but only imported when they are used.
+CONVERTER_FUNCTIONS = frozenset(["get_docker_start_commands", "get_docker_delete_commands"])
+
+
+def __getattr__(name: str):
+    """Lazily re-exports the conversion functions which used to live in this module, so importing the cli doesn't
+    import the converter (and PyYaml and the parsers). Only works on Python 3.7 and later.
+    """
+    if name in CONVERTER_FUNCTIONS:
+        from composerisation import converter
+
+        return getattr(converter, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 @click.command()
+@click.version_option(version=__VERSION__)
 @click.option(
     "-i",
     "--input-file",
     type=click.File("r"),
-    default=sys.stdin,
+    default="-",
     required=True,
     help="Path to file to convert from docker-compose to Docker.",
 )
+@click.option(
+    "-d",
+    "--input-dir",
+    type=click.Path(exists=True, file_okay=False),
+    help="Directory to search for docker-compose*.yml files to convert, instead of --input-file.",
+)
+@click.option(
+    "-o",
+    "--output-dir",
+    type=click.Path(file_okay=False),
+    help="Directory to write one output file per docker-compose file, when using --input-dir.",
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    help="Number of processes used to convert files with --input-dir, or commands run at once with --apply and "
+    "--script-dir.",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Print each command as soon as it is converted. If the file is invalid some commands may already be printed.",
+)
+@click.option(
+    "--apply",
+    type=click.Choice(["start", "delete"]),
+    help="Run the start or delete commands, instead of printing them. Independent commands are run at the same time.",
+)
+@click.option(
+    "--continue-on-error",
+    is_flag=True,
+    help="When using --apply, keep running the commands which don't depend on a command that failed.",
+)
+@click.option(
+    "--script-dir",
+    type=click.Path(file_okay=False),
+    help="Directory to write a start.sh and stop.sh script to, which run independent commands in parallel.",
+)
+@click.option(
+    "--diff",
+    type=click.File("r"),
+    help="An older version of the docker-compose file, only print the commands to go from it to --input-file. Only "
+    "what changed is created, recreated or removed.",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help="Keep running and watch the file for changes, printing only the commands for what changed each time.",
+)
+@click.option(
+    "--remove-volumes",
+    is_flag=True,
+    help="With --diff or --watch, remove and create again volumes which changed and remove volumes which no longer "
+    "exist, deleting their data. External networks and volumes are never removed.",
+)
+@click.option(
+    "--serve",
+    type=click.Path(dir_okay=False),
+    help="Keep running and convert files for other composerisation commands, which send their arguments to this Unix "
+    "socket when COMPOSERISATION_SOCKET is set to it. Saves starting Python and importing the parsers for each file.",
+)
+@click.option(
+    "--memory-profile",
+    is_flag=True,
+    help="Print how much memory each stage of the conversion uses to stderr, this makes the conversion slower.",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Print how long each stage of the conversion and the slowest services take to stderr.",
+)
+@click.option(
+    "--profile-output",
+    type=click.Path(dir_okay=False, writable=True),
+    help="When using --profile, also run cProfile and save the stats to this file.",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    envvar="COMPOSERISATION_CACHE_DIR",
+    help="Directory to cache the commands each network, volume and service converts to, so only the ones which "
+    "changed since the last run are converted. Can also be set with COMPOSERISATION_CACHE_DIR.",
+)
+@click.option(
+    "--cache-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CACHE_SIZE,
+    show_default=True,
+    help="Maximum size of the cache in MiB, the least recently used entries are removed once it is larger.",
+)
+@click.option("--no-cache", is_flag=True, help="Don't use the cache, even if --cache-dir is set.")
+@click.option(
+    "-p",
+    "--project-name",
+    envvar="COMPOSE_PROJECT_NAME",
+    help="Name of the project, images, containers and the default network are named after it. Defaults to the name of "
+    "the current directory. Can also be set with COMPOSE_PROJECT_NAME.",
+)
 @click.option(
     "--log-level",
     "-l",
@@ -33,128 +149,389 @@ logger = logging.getLogger(__name__)
     type=click.Choice(["DEBUG", "INFO", "ERROR", "CRITICAL"]),
     help="Log level for the script.",
 )
-def cli(input_file: str, log_level: str) -> list:
+def cli(
+    input_file: str,
+    input_dir: str,
+    output_dir: str,
+    workers: int,
+    stream: bool,
+    apply: str,
+    continue_on_error: bool,
+    script_dir: str,
+    diff: click.File,
+    watch: bool,
+    remove_volumes: bool,
+    serve: str,
+    memory_profile: bool,
+    profile: bool,
+    profile_output: str,
+    cache_dir: str,
+    cache_size: int,
+    no_cache: bool,
+    project_name: str,
+    log_level: str,
+) -> list:
     """Converts docker-compose files to Docker comamnds."""
+    logging.basicConfig(stream=sys.stdout, level=logging.INFO)
     logger.setLevel(log_level)
-    docker_compose = get_docker_compose(input_file)
+    logging.getLogger("composerisation").setLevel(log_level)
+    modes = [("--input-dir", input_dir), ("--apply", apply), ("--script-dir", script_dir), ("--diff", diff)]
+    modes += [("--watch", watch), ("--serve", serve), ("--memory-profile", memory_profile), ("--profile", profile)]
+    used_modes = [name for name, value in modes if value]
+    if len(used_modes) > 1:
+        raise click.UsageError(f"{used_modes[0]} cannot be used with {used_modes[1]}.")
+
+    from composerisation.docker_compose.project import get_project
+
+    project = get_project(project_name)
+    cache = get_cache(cache_dir, cache_size) if cache_dir and not no_cache else None
+    if input_dir:
+        convert_directory(input_dir, output_dir, workers, log_level, cache, project)
+        return
+
+    if watch:
+        watch_docker_compose(input_file, project, remove_volumes)
+        return
+
+    if serve:
+        serve_daemon(serve)
+        return
+
+    from composerisation import converter
 
     try:
-        start_commands = get_docker_start_commands(docker_compose)
-        delete_commands = get_docker_delete_commands(docker_compose)
-    except exceptions.IncorrectConfigException as e:
-        error_message = f"Invalid key {e.incorrect_key} in {e.config_name}."
+        if memory_profile or profile:
+            print_profile(input_file, memory_profile, profile_output, project, cache)
+            return
+
+        if diff:
+            print_diff(diff, input_file, project, remove_volumes)
+            return
+
+        plans = []
+        for docker_compose in get_docker_compose_documents(input_file):
+            if script_dir or apply:
+                start, delete = (True, True) if script_dir else (apply == "start", apply == "delete")
+                plans.append(converter.get_docker_plan(docker_compose, cache, project, start=start, delete=delete))
+            elif stream:
+                for line in converter.generate_docker_commands(docker_compose, cache=cache, project=project):
+                    click.echo(line)
+            else:
+                commands = converter.get_docker_commands(docker_compose, cache=cache, project=project)
+                click.echo("\n".join(commands))
+    except (exceptions.IncorrectConfigException, exceptions.CyclicDependencyException) as e:
+        error_message = str(e)
         logger.error(error_message)
         click.echo(error_message, err=True)
         sys.exit(1)
 
-    commands = ["", "# Start Commands: ", ""] + start_commands + ["", "# Delete Commands: ", ""] + delete_commands
-    click.echo("\n".join(commands))
+    if script_dir or apply:
+        # The plans of every document are merged, so resources they share i.e. the default network are created once.
+        plan = converter.merge_docker_plans(plans)
+        if script_dir:
+            write_scripts(plan.start_stages, plan.delete_stages, script_dir, workers)
+        else:
+            if apply == "start":
+                apply_plan(plan.start_stages, workers, continue_on_error, plan.dependencies)
+            else:
+                apply_plan(plan.delete_stages, workers, continue_on_error)
 
 
-def get_docker_compose(input_file: click.File) -> dict:
-    """Gets the contents of the docker-compose file after it's been parsed by PyYaml. If the file cannot be opened or
-    parsed i.e. incorrect yaml. Then it will throw an error and exit.
+def print_diff(old_file: click.File, new_file: click.File, project: "Project" = None, remove_volumes: bool = False):
+    """Prints the commands to go from an old version of a docker-compose file to a new one, rather than deleting and
+    starting everything again (see ``composerisation.reconcile``).
 
     Args:
-        input_file (click.File): An file object (docker-compose).
+        old_file (click.File): The old version of the docker-compose file.
+        new_file (click.File): The new version of the docker-compose file.
+        project (Project, optional): The project to convert for.
+        remove_volumes (bool, optional): Remove volumes which changed or no longer exist, deleting their data.
 
-    Returns:
-        dict: Contents of the docker-compose file.
+    """
+    from composerisation.reconcile import get_resources, reconcile, render_reconciliation
+
+    previous = get_resources(get_docker_compose_documents(old_file), project=project)
+    current = get_resources(get_docker_compose_documents(new_file), project=project)
+    lines = render_reconciliation(reconcile(previous, current, remove_volumes=remove_volumes))
+    if lines:
+        click.echo("\n".join(lines))
+    else:
+        logger.info(f"There are no differences between {old_file.name} and {new_file.name}.")
+
+
+def watch_docker_compose(input_file: click.File, project: "Project" = None, remove_volumes: bool = False):
+    """Prints the commands for a docker-compose file, then waits for it to change and prints only the commands for
+    the networks, volumes and services which changed (see ``composerisation.watch``). If the file is invalid the error
+    is printed and we carry on watching, until interrupted with Ctrl+C.
+
+    Args:
+        input_file (click.File): The docker-compose file to watch, it can't be stdin.
+        project (Project, optional): The project to convert for.
+        remove_volumes (bool, optional): Remove volumes which changed or no longer exist, deleting their data.
 
     """
-    logger.info("Opening docker-compose file.")
+    import yaml
+
+    from composerisation.watch import Watcher, watch_file
+
+    path = input_file.name
+    if path == "<stdin>":
+        raise click.UsageError("--watch needs a file to watch, it cannot be used with stdin.")
+    input_file.close()
+    watcher = Watcher(project=project, remove_volumes=remove_volumes)
+
+    def on_change():
+        try:
+            with open(path) as docker_compose_file:
+                lines = watcher.update(docker_compose_file)
+        except OSError as e:
+            logger.warning(f"Could not read {path}, {e.strerror}.")
+            return
+        except yaml.YAMLError as e:
+            error_message = f"Invalid yaml file, {path}."
+            logger.error(f"{error_message} {e}")
+            click.echo(error_message, err=True)
+            return
+        except (exceptions.IncorrectConfigException, exceptions.CyclicDependencyException) as e:
+            error_message = str(e)
+            logger.error(error_message)
+            click.echo(error_message, err=True)
+            return
+
+        if lines:
+            click.echo("\n".join(lines))
+        else:
+            logger.info(f"{path} changed, but none of the networks, volumes or services did.")
+
+    logger.info(f"Watching {path} for changes, press Ctrl+C to stop.")
     try:
-        data = "".join(sys.stdin.readlines()) if input_file.name == "<stdin>" else input_file.read()
-        docker_compose = yaml.load(data, Loader=yaml.SafeLoader)
+        watch_file(path, on_change)
+    except KeyboardInterrupt:
+        pass
+
+
+def serve_daemon(socket_path: str):
+    """Runs a server which converts files for other composerisation commands, until interrupted with Ctrl+C or
+    terminated (see ``composerisation.daemon``).
+
+    Args:
+        socket_path (str): Path to the Unix socket to listen on.
+
+    """
+    import socket
+
+    from composerisation.daemon import serve
+
+    if not hasattr(socket, "AF_UNIX") or not hasattr(os, "fork"):
+        raise click.UsageError("--serve needs Unix domain sockets, which are not supported on this platform.")
+
+    try:
+        serve(socket_path)
+    except exceptions.DaemonRunningException as e:
+        error_message = str(e)
+        logger.error(error_message)
+        click.echo(error_message, err=True)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+
+
+def print_profile(
+    input_file: click.File,
+    memory: bool,
+    profile_output: str,
+    project: "Project" = None,
+    cache: "ConversionCache" = None,
+):
+    """Converts a docker-compose file, printing each command as soon as it is converted like ``--stream``, then
+    prints how long each stage of the conversion took or how much memory it used to stderr (see
+    ``composerisation.profiling``).
+
+    Args:
+        input_file (click.File): An file object (docker-compose).
+        memory (bool): Record how much memory is used rather than how long it takes.
+        profile_output (str): Where to save the ``cProfile`` stats, when recording how long it takes.
+        project (Project, optional): The project to convert for.
+        cache (ConversionCache, optional): Cache of the commands each resource converts to.
+
+    """
+    import yaml
+
+    from composerisation import profiling
+
+    profiler = profiling.MemoryProfiler() if memory else profiling.TimingProfiler(profile_output=profile_output)
+    try:
+        for line in profiling.profile_conversion(input_file, profiler, project=project, cache=cache):
+            click.echo(line)
     except yaml.YAMLError as e:
         error_message = f"Invalid yaml file, {input_file.name}."
-        logger.error(f"error_message, {e}")
+        logger.error(f"{error_message} {e}")
         click.echo(error_message, err=True)
         sys.exit(1)
+    click.echo(profiler.report(), err=True)
 
-    logger.info("Retrieved docker compose data.")
-    return docker_compose
 
-
-def get_docker_start_commands(docker_compose: dict) -> list:
-    """Gets all the Docker cli commands required to start your containers, this includes creating docker volumes,
-    networks and running images.
+def get_cache(cache_dir: str, cache_size: int) -> "ConversionCache":
+    """Opens the cache of converted networks, volumes and services. It is pruned once the cli has finished, even if
+    the cli exits with an error.
 
     Args:
-        docker_compose (dict): The contents of the docker-compose file.
+        cache_dir (str): The directory the cache is kept in.
+        cache_size (int): Maximum size of the cache in MiB.
 
     Returns:
-        list: Of Docker cli commands to create the same environment as created by docker-compose.
+        ConversionCache: The cache.
 
     """
-    logger.info("Converting docker-compose to commands required to start your docker container.")
-    start_commands = []
-    default_name = os.path.basename(os.getcwd())
-    default_network_name = f"{default_name}_network"
-    networks_data = docker_compose.get("networks", {})
-    networks_data[default_network_name] = {"driver": "bridge"}
-
-    logger.info("Converting 'networks' sections to docker cli commands.")
-    for name, config in networks_data.items():
-        networks = NetworkParser(network_name=name, network_config=config)
-        command = networks.get_start_command()
-        start_commands.append(command)
-
-    logger.info("Converting 'volumes' sections to docker cli commands.")
-    volumes_data = docker_compose.get("volumes", {})
-    for name, config in volumes_data.items():
-        volume = VolumeParser(volume_name=name, volume_config=config)
-        command = volume.get_start_command()
-        start_commands.append(command)
-
-    logger.info("Converting 'services' sections to docker cli commands.")
-    services_data = docker_compose.get("services", {})
-    for name, option in services_data.items():
-        if "networks" not in option:
-            option["network_mode"] = default_network_name
-
-        service = ServicesParser(service_name=name, service_options=option)
-        command = service.get_start_command()
-        start_commands += command
-
-    return start_commands
-
-
-def get_docker_delete_commands(docker_compose: dict) -> list:
-    """Gets all the Docker cli commands required to stop your containers.
+    from composerisation.cache import ConversionCache
+
+    cache = ConversionCache(cache_dir, max_size=cache_size * 1024 * 1024)
+    click.get_current_context().call_on_close(cache.prune)
+    return cache
+
+
+def write_scripts(start_plan: list, delete_plan: list, script_dir: str, workers: int):
+    """Writes a bash script to start your containers and another to delete them, independent commands within each
+    script are run in parallel.
 
     Args:
-        docker_compose (dict): The contents of the docker-compose file.
+        start_plan (list): The commands to start your containers, see ``get_docker_plan``.
+        delete_plan (list): The commands to delete your containers, see ``get_docker_plan``.
+        script_dir (str): The directory to write the scripts to.
+        workers (int): The default number of commands each script runs at once.
+
+    """
+    from composerisation.script import START_SCRIPT, STOP_SCRIPT, render_script, write_script
+
+    max_jobs = workers or DEFAULT_SCRIPT_JOBS
+    os.makedirs(script_dir, exist_ok=True)
+    for name, plan, description in [
+        (START_SCRIPT, start_plan, "Starts your containers"),
+        (STOP_SCRIPT, delete_plan, "Stops and removes your containers"),
+    ]:
+        path = os.path.join(script_dir, name)
+        write_script(path, render_script(plan, description, max_jobs=max_jobs))
+        logger.info(f"Wrote {path}.")
+
+
+def convert_directory(
+    input_dir: str,
+    output_dir: str,
+    workers: int,
+    log_level: str,
+    cache: "ConversionCache" = None,
+    project: "Project" = None,
+):
+    """Converts every docker-compose file found in a directory, using a pool of processes. Either writes one output
+    file per docker-compose file into ``output_dir`` or prints all of the outputs one after another. Files which fail
+    to convert are reported but do not stop the other files from being converted, we exit with an error at the end.
+
+    Args:
+        input_dir (str): The directory to search for docker-compose files.
+        output_dir (str): The directory to write the outputs to, if not set they are printed instead.
+        workers (int): The number of processes to use.
+        log_level (str): Log level used by the processes.
+        cache (ConversionCache, optional): Cache of the converted networks, volumes and services, shared by all of
+            the processes.
+        project (Project, optional): The project to convert every file for.
+
+    """
+    from composerisation.batch import convert_files, find_docker_compose_files, get_output_path
+
+    paths = find_docker_compose_files(input_dir)
+    logger.info(f"Found {len(paths)} docker-compose files in {input_dir}.")
+    failed = 0
+    cache_dir = cache.directory if cache else None
+    for result in convert_files(paths, workers=workers, log_level=log_level, cache_dir=cache_dir, project=project):
+        if result.error:
+            failed += 1
+            logger.error(result.error)
+            click.echo(f"{result.path}: {result.error}", err=True)
+        elif output_dir:
+            output_path = get_output_path(result.path, input_dir, output_dir)
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            with open(output_path, "w") as output_file:
+                output_file.write(result.output)
+        else:
+            click.echo(f"\n# {result.path}\n{result.output}")
+
+    logger.info(f"Converted {len(paths) - failed} of {len(paths)} docker-compose files.")
+    if failed:
+        sys.exit(1)
+
+
+def apply_plan(plan: list, workers: int, continue_on_error: bool, dependencies: dict = None):
+    """Runs the Docker cli commands to start or delete your containers, printing each command once it has finished.
+    Commands which don't depend on each other are run at the same time. If any command fails, its output is printed
+    and we exit with an error once the rest of the plan has finished (or been skipped).
+
+    Args:
+        plan (list): The start or delete stages, see ``get_docker_plan``.
+        workers (int): Maximum number of commands to run at once.
+        continue_on_error (bool): Keep running the commands which don't depend on a command that failed.
+        dependencies (dict, optional): The containers each container depends on, see ``DockerPlan``.
+
+    """
+    from composerisation.executor import run_plan
+
+    total = sum(len(chain) for stage in plan for chain in stage)
+    results = run_plan(plan, workers=workers, continue_on_error=continue_on_error, dependencies=dependencies)
+
+    failed = 0
+    for result in results:
+        click.echo(f"{result.command.render()}  # exit code {result.returncode}, {result.duration:.2f}s")
+        if not result.ok:
+            failed += 1
+            click.echo(result.output.rstrip("\n"), err=True)
+
+    logger.info(f"Ran {len(results)} of {total} commands, {failed} failed.")
+    if failed:
+        sys.exit(1)
+
+
+def get_docker_compose(input_file: click.File) -> dict:
+    """Gets the contents of the first docker-compose document in the file after it's been parsed by PyYaml, see
+    ``get_docker_compose_documents`` to get every document. If the file cannot be opened or parsed i.e. incorrect
+    yaml. Then it will throw an error and exit.
+
+    Args:
+        input_file (click.File): An file object (docker-compose).
 
     Returns:
-        list: Of Docker cli commands to stop the running containers remove them and also the network they are \
-            connect to.
+        dict: Contents of the docker-compose file, None if it is empty.
+
+    """
+    return next(get_docker_compose_documents(input_file), None)
+
+
+def get_docker_compose_documents(input_file: click.File) -> Iterator[dict]:
+    """Gets the contents of each docker-compose document in the file after it's been parsed by PyYaml. A file can
+    contain many documents separated by ``---``, each document is only parsed once the previous one has been
+    converted. So we only need to keep one document in memory at a time. If the file cannot be opened or parsed i.e.
+    incorrect yaml. Then it will throw an error and exit.
+
+    Args:
+        input_file (click.File): An file object (docker-compose).
+
+    Yields:
+        dict: Contents of each docker-compose document.
 
     """
-    logger.info("Converting docker-compose to commands required to delete your docker container.")
-    delete_commands = []
-    networks_data = docker_compose.get("networks", {})
-    default_name = os.path.basename(os.getcwd())
-    default_network_name = f"{default_name}_network"
-    networks_data[default_network_name] = {"driver": "bridge", "name": default_network_name}
-
-    logger.info("Converting 'services' sections to docker cli commands.")
-    services_data = docker_compose.get("services", {})
-    for name, option in services_data.items():
-        if "networks" not in option:
-            option["network_mode"] = default_network_name
-
-        service = ServicesParser(service_name=name, service_options=option)
-        command = service.get_delete_command()
-        delete_commands += command
-
-    logger.info("Converting 'networks' sections to docker cli commands.")
-    for name, config in networks_data.items():
-        networks = NetworkParser(network_name=name, network_config=config)
-        command = networks.get_delete_command()
-        delete_commands.append(command)
-
-    return delete_commands
+    import yaml
+
+    from composerisation.converter import load_docker_compose_documents
+    from composerisation.utils import loader
+
+    logger.info(f"Opening docker-compose file, using the {loader.get_loader_name()} yaml loader.")
+    try:
+        for docker_compose in load_docker_compose_documents(input_file):
+            logger.info("Retrieved docker compose data.")
+            yield docker_compose
+    except yaml.YAMLError as e:
+        error_message = f"Invalid yaml file, {input_file.name}."
+        logger.error(f"error_message, {e}")
+        click.echo(error_message, err=True)
+        sys.exit(1)
 
 
 if __name__ == "__main__":
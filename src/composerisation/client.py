@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""This module is the entry point of the ``composerisation`` command. When ``COMPOSERISATION_SOCKET`` is set to the
+socket of a server started with ``--serve`` (see ``composerisation.daemon``), the arguments are forwarded to the
+server rather than running the cli in this process. So we don't pay for importing click, PyYaml and the parsers.
+If the server can't be reached, the cli runs in this process as normal.
+
+This module only imports the standard library, the cli is imported only when it has to run in this process.
+
+.. _Google Python Style Guide:
+    http://google.github.io/styleguide/pyguide.html
+
+"""
+import io
+import json
+import os
+import socket
+import sys
+from typing import List
+from typing import Optional
+from typing import TextIO
+
+SOCKET_ENV = "COMPOSERISATION_SOCKET"
+# Options which always run in this process, they either start a server or keep running until interrupted.
+IN_PROCESS_OPTIONS = frozenset(["--serve", "--watch", "--help", "--version"])
+
+
+def main(args: List[str] = None):
+    """Runs the cli, on the server if ``COMPOSERISATION_SOCKET`` is set and the server is running. Exits with the
+    exit code of the cli. The cli only runs in this process if we couldn't connect to the server, once the server has
+    the request it may have run the cli already. So running it again could i.e. ``--apply`` the commands twice.
+
+    Args:
+        args (list, optional): The cli arguments, by default ``sys.argv[1:]``.
+
+    """
+    args = sys.argv[1:] if args is None else list(args)
+    socket_path = os.environ.get(SOCKET_ENV)
+    options = {arg.split("=", 1)[0] for arg in args}
+    if socket_path and hasattr(socket, "AF_UNIX") and not IN_PROCESS_OPTIONS.intersection(options):
+        stdin = sys.stdin.read() if reads_stdin(args) else None
+        exit_code = forward(socket_path, args, stdin)
+        if exit_code is not None:
+            sys.exit(exit_code)
+        # We've already read stdin, so the cli reads it from a copy.
+        if stdin is not None:
+            sys.stdin = io.TextIOWrapper(io.BytesIO(stdin.encode()), encoding="utf-8")
+
+    from .cli import cli
+
+    cli(args)
+
+
+def forward(
+    socket_path: str, args: List[str], stdin: str = None, stdout: TextIO = None, stderr: TextIO = None
+) -> Optional[int]:
+    """Sends the arguments to the server along with the working directory, environment variables and stdin, then
+    writes what the cli prints as the server sends it. If the server fails after we've connected, i.e. the process
+    running the cli crashed, it is an error as we can't tell if the cli ran or not.
+
+    Args:
+        socket_path (str): Path to the socket of the server.
+        args (list): The cli arguments.
+        stdin (str, optional): The contents of stdin, if the cli reads the docker-compose file from it.
+        stdout (TextIO, optional): Where to write what the cli prints to stdout, by default ``sys.stdout``.
+        stderr (TextIO, optional): Where to write what the cli prints to stderr, by default ``sys.stderr``.
+
+    Returns:
+        int: The exit code of the cli. None if we couldn't connect to the server.
+
+    """
+    outputs = {"stdout": stdout or sys.stdout, "stderr": stderr or sys.stderr}
+    request = {"args": args, "cwd": os.getcwd(), "env": dict(os.environ), "stdin": stdin}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except OSError:
+            return None
+
+        try:
+            client.sendall(json.dumps(request).encode())
+            client.shutdown(socket.SHUT_WR)
+            with client.makefile("rb") as response:
+                for line in response:
+                    frame = json.loads(line.decode())
+                    if "exit_code" in frame:
+                        return frame["exit_code"]
+                    for name, output in outputs.items():
+                        if name in frame:
+                            output.write(frame[name])
+                            output.flush()
+        except (OSError, ValueError):
+            pass
+
+    outputs["stderr"].write(f"No response from the server on {socket_path}, the command may or may not have run.\n")
+    return 1
+
+
+def reads_stdin(args: List[str]) -> bool:
+    """Checks if the cli would read the docker-compose file from stdin, that is ``--input-file`` is ``-`` (the
+    default) and ``--input-dir`` isn't used.
+
+    Args:
+        args (list): The cli arguments.
+
+    Returns:
+        bool: True if the cli reads from stdin.
+
+    """
+    input_file = "-"
+    arguments = iter(args)
+    for arg in arguments:
+        if arg in ("-d", "--input-dir") or arg.startswith("--input-dir="):
+            return False
+        elif arg in ("-i", "--input-file"):
+            input_file = next(arguments, "-")
+        elif arg.startswith("--input-file="):
+            input_file = arg.split("=", 1)[1]
+        elif arg.startswith("-i"):
+            input_file = arg[2:]
+        elif arg == "--":
+            break
+    return input_file == "-"
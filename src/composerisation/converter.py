@@ -0,0 +1,713 @@
+# -*- coding: utf-8 -*-
+"""This module converts the contents of docker-compose files into Docker cli commands, this is everything the cli
+does besides reading the options and printing the output. The cli only imports this module (and so PyYaml and the
+parsers) once it needs to convert a file, so ``--help`` and ``--version`` start quickly.
+
+.. _Google Python Style Guide:
+    http://google.github.io/styleguide/pyguide.html
+
+"""
+import contextlib
+import functools
+import logging
+from typing import TYPE_CHECKING
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import TextIO
+from typing import Union
+
+from .docker_compose.command import Command
+from .docker_compose.networks.networks import NetworkParser
+from .docker_compose.project import Project
+from .docker_compose.project import get_project
+from .docker_compose.services.build import merge_build_commands
+from .docker_compose.services.depends_on import get_dependencies
+from .docker_compose.services.depends_on import get_start_levels
+from .docker_compose.services.services import ServicesParser
+from .docker_compose.volumes.volumes import VolumeParser
+from .utils import exceptions
+from .utils import loader
+
+if TYPE_CHECKING:
+    from .cache import ConversionCache
+    from .profiling import MemoryProfiler
+    from .profiling import TimingProfiler
+
+logger = logging.getLogger(__name__)
+
+SECTIONS = ["services", "networks", "volumes"]
+
+
+def load_docker_compose(data: str) -> dict:
+    """Parses the contents of a docker-compose file using PyYaml, with libyaml if it is available.
+
+    Args:
+        data (str): The contents of the docker-compose file.
+
+    Returns:
+        dict: Contents of the docker-compose file.
+
+    Raises:
+        YAMLError: When the data is not valid yaml.
+
+    """
+    return loader.load(data)
+
+
+def load_docker_compose_documents(stream: Union[str, TextIO]) -> Iterator[dict]:
+    """Parses each document in a docker-compose file using PyYaml, one at a time. Empty documents are skipped.
+
+    Args:
+        stream (str, file): The contents of the docker-compose file, or the file to read them from.
+
+    Yields:
+        dict: Contents of each docker-compose document.
+
+    Raises:
+        YAMLError: When the data is not valid yaml.
+        IncorrectConfigException: When a document isn't a mapping, or its services, networks, volumes or the options
+            of a service aren't.
+
+    """
+    for docker_compose in loader.load_all(stream):
+        if docker_compose is not None:
+            check_docker_compose(docker_compose)
+            yield docker_compose
+
+
+def check_docker_compose(docker_compose):
+    """Checks a docker-compose document is a mapping, as are its services, networks and volumes when it sets them and
+    the options of each service. So a file which is valid yaml but not a docker-compose file, i.e. ``hello``, fails
+    with a config error rather than deep within the parsers.
+
+    Args:
+        docker_compose: Contents of the docker-compose document.
+
+    Raises:
+        InvalidDocumentException: When the document isn't a mapping.
+        IncorrectConfigException: When its services, networks or volumes, or the options of a service, aren't a
+            mapping.
+
+    """
+    if not isinstance(docker_compose, dict):
+        raise exceptions.InvalidDocumentException(document_type=type(docker_compose).__name__)
+
+    for section in SECTIONS:
+        if section in docker_compose and not isinstance(docker_compose[section], dict):
+            raise exceptions.IncorrectConfigException(config_name="docker-compose file", incorrect_key=section)
+
+    for name, options in docker_compose.get("services", {}).items():
+        if not isinstance(options, dict):
+            raise exceptions.IncorrectConfigException(config_name="services", incorrect_key=name)
+
+
+class DockerPlan(NamedTuple):
+    """The commands to start and then delete your containers, converted in a single pass over the docker-compose
+    file. Each stage is a list of chains of commands which can be run at the same time, see
+    ``composerisation.executor``.
+
+    Attributes:
+        start_stages (list): Of stages to start your containers, empty if they weren't asked for. Networks, volumes
+            and images are all created in the first stage, then there is a stage for each level of services.
+        delete_stages (list): Of stages to delete your containers, empty if they weren't asked for. Services are
+            deleted a level at a time, then the networks are removed.
+        dependencies (dict): The names of the containers each container depends on, from `depends_on`. So if a
+            container fails to start, ``run_plan`` can skip the containers which depend on it.
+
+    """
+
+    start_stages: List[list]
+    delete_stages: List[list]
+    dependencies: Dict[str, List[str]]
+
+    def get_start_commands(self) -> list:
+        """Gets the start commands in the order they would be run one at a time, see ``get_docker_start_commands``.
+
+        Returns:
+            list: Of ``Command``.
+
+        """
+        return [command for stage in self.start_stages for chain in stage for command in chain]
+
+    def get_delete_commands(self) -> list:
+        """Gets the delete commands in the order they would be run one at a time, see ``get_docker_delete_commands``.
+
+        Returns:
+            list: Of ``Command``.
+
+        """
+        return [command for stage in self.delete_stages for chain in stage for command in chain]
+
+
+def get_docker_commands(docker_compose: dict, cache: "ConversionCache" = None, project: Project = None) -> list:
+    """Gets all the Docker cli commands required to start and then delete your containers, with a comment before
+    each section. This is what is printed by the cli.
+
+    Args:
+        docker_compose (dict): The contents of the docker-compose file.
+        cache (ConversionCache, optional): Cache of the commands each resource converts to, see \
+            ``composerisation.cache``.
+        project (Project, optional): The project to convert for, by default named after the current directory.
+
+    Returns:
+        list: Of lines to output, the start commands followed by the delete commands.
+
+    """
+    return list(generate_docker_commands(docker_compose, cache=cache, project=project))
+
+
+def generate_docker_commands(
+    docker_compose: dict,
+    cache: "ConversionCache" = None,
+    project: Project = None,
+    profiler: Union["MemoryProfiler", "TimingProfiler"] = None,
+) -> Iterator[str]:
+    """Same as ``get_docker_commands`` but each line is yielded as soon as it has been converted, rather than
+    waiting for the whole docker-compose file to be converted. The network and volume commands are yielded before any
+    service is converted. The parsers of each level of services are only created once the level is reached, and only
+    their delete commands are kept for the end, not the parsers.
+
+    Every image is built before the first service is started and identical builds are merged (see
+    ``get_build_commands``), so the `build` option of every service is converted before the first `docker run`
+    command is yielded.
+
+    Args:
+        docker_compose (dict): The contents of the docker-compose file.
+        cache (ConversionCache, optional): Cache of the commands each resource converts to, see \
+            ``composerisation.cache``.
+        project (Project, optional): The project to convert for, by default named after the current directory.
+        profiler (MemoryProfiler, TimingProfiler, optional): Records each stage of the conversion and each service,
+            see ``composerisation.profiling``.
+
+    Yields:
+        str: Lines to output, the start commands followed by the delete commands.
+
+    """
+    project = project or get_project()
+    with _get_stage(profiler)("levels"):
+        levels = get_start_levels(docker_compose.get("services", {}))
+    delete_levels = []
+    start_commands = generate_start_commands(
+        docker_compose, project, levels, cache=cache, delete_levels=delete_levels, profiler=profiler
+    )
+    networks = get_network_parsers(docker_compose, project)
+    delete_commands = generate_delete_commands(networks, delete_levels, profiler=profiler)
+    yield from render_docker_commands(start_commands, delete_commands)
+
+
+def render_docker_commands(start_commands: Iterable[Command], delete_commands: Iterable[Command]) -> Iterator[str]:
+    """Renders the start and delete commands into the lines printed by the cli, with a comment before each section.
+
+    Args:
+        start_commands (iterable): Of ``Command`` to start your containers.
+        delete_commands (iterable): Of ``Command`` to delete your containers, only used once the start commands have
+            been rendered.
+
+    Yields:
+        str: Lines to output, the start commands followed by the delete commands.
+
+    """
+    yield from ["", "# Start Commands: ", ""]
+    for command in start_commands:
+        yield command.render()
+    yield from ["", "# Delete Commands: ", ""]
+    for command in delete_commands:
+        yield command.render()
+
+
+def get_docker_start_commands(docker_compose: dict, cache: "ConversionCache" = None, project: Project = None) -> list:
+    """Gets all the Docker cli commands required to start your containers, this includes creating docker volumes,
+    networks, building images and running images. Every image is built before any service is started, services which
+    build the same image share a single build. Services are started after the services they `depends_on`.
+
+    Args:
+        docker_compose (dict): The contents of the docker-compose file.
+        cache (ConversionCache, optional): Cache of the commands each resource converts to, see \
+            ``composerisation.cache``.
+        project (Project, optional): The project to convert for, by default named after the current directory.
+
+    Returns:
+        list: Of Docker cli commands (``Command``) to create the same environment as created by docker-compose.
+
+    """
+    return list(generate_docker_start_commands(docker_compose, cache=cache, project=project))
+
+
+def generate_docker_start_commands(
+    docker_compose: dict, cache: "ConversionCache" = None, project: Project = None
+) -> Iterator[Command]:
+    """Same as ``get_docker_start_commands`` but each command is yielded as soon as it has been converted.
+
+    Args:
+        docker_compose (dict): The contents of the docker-compose file.
+        cache (ConversionCache, optional): Cache of the commands each resource converts to, see \
+            ``composerisation.cache``.
+        project (Project, optional): The project to convert for, by default named after the current directory.
+
+    Yields:
+        Command: Docker cli commands to create the same environment as created by docker-compose.
+
+    """
+    project = project or get_project()
+    levels = get_start_levels(docker_compose.get("services", {}))
+    yield from generate_start_commands(docker_compose, project, levels, cache=cache)
+
+
+def generate_start_commands(
+    docker_compose: dict,
+    project: Project,
+    levels: list,
+    cache: "ConversionCache" = None,
+    delete_levels: list = None,
+    profiler: Union["MemoryProfiler", "TimingProfiler"] = None,
+) -> Iterator[Command]:
+    """Converts the networks, volumes and services into the commands to start your containers. The parsers of each
+    level of services are created once for the builds and again once the level is reached, so they are never all held
+    at once.
+
+    Args:
+        docker_compose (dict): The contents of the docker-compose file.
+        project (Project): The project to convert for.
+        levels (list): Of levels of service names, as returned by ``get_start_levels``.
+        cache (ConversionCache, optional): Cache of the commands each resource converts to, see \
+            ``composerisation.cache``.
+        delete_levels (list, optional): If given, the delete commands of each level of services are appended to it
+            once the level has been converted, for ``generate_delete_commands``.
+        profiler (MemoryProfiler, TimingProfiler, optional): Records each stage of the conversion and each service,
+            see ``composerisation.profiling``. A stage includes whatever the caller does with the commands it yields.
+
+    Yields:
+        Command: Docker cli commands to create the same environment as created by docker-compose.
+
+    """
+    stage = _get_stage(profiler)
+    logger.info("Converting docker-compose to commands required to start your docker container.")
+    logger.info("Converting 'networks' sections to docker cli commands.")
+    with stage("networks"):
+        yield from generate_network_start_commands(get_network_parsers(docker_compose, project), cache=cache)
+
+    logger.info("Converting 'volumes' sections to docker cli commands.")
+    with stage("volumes"):
+        yield from generate_volume_start_commands(docker_compose, cache=cache)
+
+    logger.info("Converting 'services' sections to docker cli commands.")
+    with stage("builds"):
+        yield from get_build_commands(generate_service_levels(docker_compose, project, levels, cache=cache))
+
+    with stage("services"):
+        for level in generate_service_levels(docker_compose, project, levels, cache=cache):
+            for service in level:
+                with _get_resource(profiler)(service.config_name):
+                    run_commands = service.get_run_commands()
+                yield from run_commands
+            if delete_levels is not None:
+                delete_levels.append([service.get_delete_command() for service in level])
+
+
+def get_network_parsers(docker_compose: dict, project: Project) -> list:
+    """Gets a parser for each network in the `networks` section, including the default network.
+
+    Args:
+        docker_compose (dict): The contents of the docker-compose file.
+        project (Project): The project to convert for, services which don't set any `networks` are connected to its
+            default network.
+
+    Returns:
+        list: Of ``NetworkParser``.
+
+    """
+    networks_data = {**docker_compose.get("networks", {}), project.network_name: {"driver": "bridge"}}
+    return [NetworkParser(network_name=name, network_config=config) for name, config in networks_data.items()]
+
+
+def generate_network_start_commands(networks: list, cache: "ConversionCache" = None) -> Iterator[Command]:
+    """Converts the networks to `docker network create` commands.
+
+    Args:
+        networks (list): Of ``NetworkParser``, as returned by ``get_network_parsers``.
+        cache (ConversionCache, optional): Cache of the commands each resource converts to, see \
+            ``composerisation.cache``.
+
+    Yields:
+        Command: A `docker network create` command for each network.
+
+    """
+    for network in networks:
+        yield get_start_command("network", network.config_name, network.config_options, lambda: network, cache)
+
+
+def generate_volume_start_commands(docker_compose: dict, cache: "ConversionCache" = None) -> Iterator[Command]:
+    """Converts the `volumes` section to `docker volume create` commands.
+
+    Args:
+        docker_compose (dict): The contents of the docker-compose file.
+        cache (ConversionCache, optional): Cache of the commands each resource converts to, see \
+            ``composerisation.cache``.
+
+    Yields:
+        Command: A `docker volume create` command for each volume.
+
+    """
+    volumes_data = docker_compose.get("volumes", {})
+    for name, config in volumes_data.items():
+        volume = functools.partial(VolumeParser, volume_name=name, volume_config=config)
+        yield get_start_command("volume", name, config, volume, cache)
+
+
+def get_start_command(
+    kind: str, name: str, config: dict, get_parser: Callable, cache: "ConversionCache" = None
+) -> Command:
+    """Converts a network or volume to the command to create it, from the cache if it has been converted before.
+
+    Args:
+        kind (str): The type of resource i.e. ``network``.
+        name (str): The name of the resource.
+        config (dict): The config of the resource.
+        get_parser (callable): Returns the parser for the resource, only called if it isn't in the cache.
+        cache (ConversionCache, optional): Cache of the commands each resource converts to, see \
+            ``composerisation.cache``.
+
+    Returns:
+        Command: The command to create the resource.
+
+    """
+    if cache is None:
+        return get_parser().get_start_command()
+
+    # Networks and volumes are named in the docker-compose file, so their commands only depend on their config.
+    commands = cache.get_commands(kind, name, config, {}, lambda: {"start": [get_parser().get_start_command()]})
+    return commands["start"][0]
+
+
+def get_cache_context(project: Project) -> dict:
+    """Gets everything besides its config which the commands of a service depend on, so it is part of the cache key.
+    Images, containers and the default network are named after the project.
+
+    Args:
+        project (Project): The project to convert for.
+
+    Returns:
+        dict: The context of the service.
+
+    """
+    return {"project": project.name}
+
+
+def get_docker_plan(
+    docker_compose: dict,
+    cache: "ConversionCache" = None,
+    project: Project = None,
+    start: bool = True,
+    delete: bool = True,
+) -> DockerPlan:
+    """Gets the commands to start and delete your containers, grouped by which commands can be run at the same time
+    (see ``composerisation.executor``). Each network and service is only parsed once for both sets of commands.
+
+    A service is only started once the services it `depends_on` have started, there is a stage for each level of
+    services from ``get_start_levels``. Each service is its own chain, running the image and then connecting it to its
+    networks. Services are deleted in the reverse order, then once all of the containers are gone the networks are
+    removed.
+
+    Args:
+        docker_compose (dict): The contents of the docker-compose file.
+        cache (ConversionCache, optional): Cache of the commands each resource converts to, see \
+            ``composerisation.cache``.
+        project (Project, optional): The project to convert for, by default named after the current directory.
+        start (bool, optional): Convert the commands to start your containers.
+        delete (bool, optional): Convert the commands to delete your containers.
+
+    Returns:
+        DockerPlan: The start and delete stages.
+
+    """
+    project = project or get_project()
+    networks = get_network_parsers(docker_compose, project)
+    service_levels = get_service_levels(docker_compose, project, cache=cache)
+
+    start_stages = []
+    dependencies = {}
+    if start:
+        resources = [[command] for command in generate_network_start_commands(networks, cache=cache)]
+        resources += [[command] for command in generate_volume_start_commands(docker_compose, cache=cache)]
+        resources += [[build_command] for build_command in get_build_commands(service_levels)]
+        start_stages.append(resources)
+
+        services_data = docker_compose.get("services", {})
+        containers = {}
+        for level in service_levels:
+            stage = []
+            for service in level:
+                chain = service.get_run_commands()
+                container_name = chain[0].get_options("--name")[0]
+                containers[service.config_name] = container_name
+                depends_on = get_dependencies(service.config_name, services_data[service.config_name])
+                dependencies[container_name] = [containers[name] for name in depends_on if name in containers]
+                stage.append(chain)
+            start_stages.append(stage)
+
+    delete_stages = []
+    if delete:
+        for level in reversed(service_levels):
+            delete_stages.append([service.get_delete_command() for service in level])
+        delete_stages.append([[network.get_delete_command()] for network in networks])
+    return DockerPlan(start_stages=start_stages, delete_stages=delete_stages, dependencies=dependencies)
+
+
+def merge_docker_plans(plans: Iterable[DockerPlan]) -> DockerPlan:
+    """Merges the plans of each document in a file into a single plan, so they can be run together. Every network,
+    volume and image is created in the first stage and removed in the last, only once even if several documents create
+    it i.e. the default network. So a network isn't removed while the services of another document still use it. The
+    services of each document are started and deleted in the order of the documents.
+
+    Args:
+        plans (iterable): Of ``DockerPlan``, one for each document as returned by ``get_docker_plan``.
+
+    Returns:
+        DockerPlan: The start and delete stages of every document.
+
+    """
+    resources, service_stages, delete_stages, networks = [], [], [], []
+    dependencies = {}
+    start = delete = False
+    for plan in plans:
+        dependencies.update(plan.dependencies)
+        if plan.start_stages:
+            start = True
+            first_stage, *levels = plan.start_stages
+            resources.append(first_stage)
+            service_stages += levels
+        if plan.delete_stages:
+            delete = True
+            *levels, last_stage = plan.delete_stages
+            delete_stages += levels
+            networks.append(last_stage)
+
+    start_stages = [_get_unique_chains(resources), *service_stages] if start else []
+    if delete:
+        delete_stages.append(_get_unique_chains(networks))
+    return DockerPlan(start_stages=start_stages, delete_stages=delete_stages, dependencies=dependencies)
+
+
+def _get_unique_chains(stages: list) -> list:
+    """Joins stages into one, keeping only the first of any chains with the same commands.
+
+    Args:
+        stages (list): Of stages, each a list of chains of ``Command``.
+
+    Returns:
+        list: Of the unique chains, in the order they were first seen.
+
+    """
+    seen = set()
+    chains = []
+    for stage in stages:
+        for chain in stage:
+            key = tuple(command.render() for command in chain)
+            if key not in seen:
+                seen.add(key)
+                chains.append(chain)
+    return chains
+
+
+def get_docker_start_plan(docker_compose: dict, cache: "ConversionCache" = None, project: Project = None) -> list:
+    """Gets the same commands as ``get_docker_start_commands`` but grouped by which commands can be run at the same
+    time, see ``get_docker_plan``.
+
+    Args:
+        docker_compose (dict): The contents of the docker-compose file.
+        cache (ConversionCache, optional): Cache of the commands each resource converts to, see \
+            ``composerisation.cache``.
+        project (Project, optional): The project to convert for, by default named after the current directory.
+
+    Returns:
+        list: Of stages, each stage is a list of chains and each chain is a list of ``Command``.
+
+    """
+    return get_docker_plan(docker_compose, cache=cache, project=project, delete=False).start_stages
+
+
+def get_service_levels(docker_compose: dict, project: Project, cache: "ConversionCache" = None) -> list:
+    """Gets a parser for each service, grouped into the levels they can be started in (see ``get_start_levels``).
+    Services which don't set any `networks` are connected to the default network. With a cache, services which have
+    been converted before are a ``CachedService`` instead of a parser.
+
+    Args:
+        docker_compose (dict): The contents of the docker-compose file.
+        project (Project): The project to convert for, services which don't set any `networks` are connected to its
+            default network.
+        cache (ConversionCache, optional): Cache of the commands each resource converts to, see \
+            ``composerisation.cache``.
+
+    Returns:
+        list: Of levels, each level is a list of ``ServicesParser`` or ``CachedService``.
+
+    """
+    levels = get_start_levels(docker_compose.get("services", {}))
+    return list(generate_service_levels(docker_compose, project, levels, cache=cache))
+
+
+def generate_service_levels(
+    docker_compose: dict, project: Project, levels: list, cache: "ConversionCache" = None
+) -> Iterator[list]:
+    """Same as ``get_service_levels``, but the parsers of each level are only created once the level is reached.
+
+    Args:
+        docker_compose (dict): The contents of the docker-compose file.
+        project (Project): The project to convert for.
+        levels (list): Of levels of service names, as returned by ``get_start_levels``.
+        cache (ConversionCache, optional): Cache of the commands each resource converts to, see \
+            ``composerisation.cache``.
+
+    Yields:
+        list: Of ``ServicesParser`` or ``CachedService``, for each level.
+
+    """
+    services_data = docker_compose.get("services", {})
+    context = get_cache_context(project)
+    for level in levels:
+        services = []
+        for name in level:
+            option = services_data[name]
+            if "networks" not in option:
+                option = {**option, "network_mode": project.network_name}
+
+            convert = functools.partial(ServicesParser, service_name=name, service_options=option, project=project)
+            if cache is None:
+                services.append(convert())
+            else:
+                services.append(cache.get_service(name, option, context, convert))
+        yield services
+
+
+def get_build_commands(service_levels: list) -> list:
+    """Gets the `docker build` commands to build the images for every service. Services which build the exact same
+    image share a single build, which tags the image for each of them (see ``merge_build_commands``).
+
+    Args:
+        service_levels (iterable): Of levels of ``ServicesParser``, as returned by ``get_service_levels``.
+
+    Returns:
+        list: Of the distinct `docker build` commands (``Command``).
+
+    """
+    build_commands = []
+    for level in service_levels:
+        for service in level:
+            build_command = service.get_build_command()
+            if build_command:
+                build_commands.append(build_command)
+
+    merged_commands = merge_build_commands(build_commands)
+    collapsed = len(build_commands) - len(merged_commands)
+    if collapsed:
+        logger.info(f"Collapsed {collapsed} identical builds, building {len(merged_commands)} images.")
+    return merged_commands
+
+
+def get_docker_delete_plan(docker_compose: dict, cache: "ConversionCache" = None, project: Project = None) -> list:
+    """Gets the same commands as ``get_docker_delete_commands`` but grouped by which commands can be run at the same
+    time, see ``get_docker_plan``.
+
+    Args:
+        docker_compose (dict): The contents of the docker-compose file.
+        cache (ConversionCache, optional): Cache of the commands each resource converts to, see \
+            ``composerisation.cache``.
+        project (Project, optional): The project to convert for, by default named after the current directory.
+
+    Returns:
+        list: Of stages, each stage is a list of chains and each chain is a list of ``Command``.
+
+    """
+    return get_docker_plan(docker_compose, cache=cache, project=project, start=False).delete_stages
+
+
+def get_docker_delete_commands(docker_compose: dict, cache: "ConversionCache" = None, project: Project = None) -> list:
+    """Gets all the Docker cli commands required to stop your containers. Services are stopped in the reverse of the
+    order they are started in, so a service is stopped before the services it `depends_on`.
+
+    Args:
+        docker_compose (dict): The contents of the docker-compose file.
+        cache (ConversionCache, optional): Cache of the commands each resource converts to, see \
+            ``composerisation.cache``.
+        project (Project, optional): The project to convert for, by default named after the current directory.
+
+    Returns:
+        list: Of Docker cli commands (``Command``) to stop the running containers remove them and also the network \
+            they are connect to.
+
+    """
+    return list(generate_docker_delete_commands(docker_compose, cache=cache, project=project))
+
+
+def generate_docker_delete_commands(
+    docker_compose: dict, cache: "ConversionCache" = None, project: Project = None
+) -> Iterator[Command]:
+    """Same as ``get_docker_delete_commands`` but each command is yielded as soon as it has been converted.
+
+    Args:
+        docker_compose (dict): The contents of the docker-compose file.
+        cache (ConversionCache, optional): Cache of the commands each resource converts to, see \
+            ``composerisation.cache``.
+        project (Project, optional): The project to convert for, by default named after the current directory.
+
+    Yields:
+        Command: Docker cli commands to stop the running containers remove them and also the network they are \
+            connect to.
+
+    """
+    project = project or get_project()
+    networks = get_network_parsers(docker_compose, project)
+    levels = get_start_levels(docker_compose.get("services", {}))
+    delete_levels = []
+    for level in generate_service_levels(docker_compose, project, levels, cache=cache):
+        delete_levels.append([service.get_delete_command() for service in level])
+    yield from generate_delete_commands(networks, delete_levels)
+
+
+def generate_delete_commands(
+    networks: list, delete_levels: list, profiler: Union["MemoryProfiler", "TimingProfiler"] = None
+) -> Iterator[Command]:
+    """Converts the services and networks into the commands to delete your containers.
+
+    Args:
+        networks (list): Of ``NetworkParser``, as returned by ``get_network_parsers``.
+        delete_levels (list): Of levels of services, each a list of the `docker stop` and `docker rm` commands of
+            each service in the level.
+        profiler (MemoryProfiler, TimingProfiler, optional): Records the stage, see ``generate_start_commands``.
+
+    Yields:
+        Command: Docker cli commands to stop the running containers remove them and also the network they are \
+            connect to.
+
+    """
+    logger.info("Converting docker-compose to commands required to delete your docker container.")
+    with _get_stage(profiler)("delete"):
+        logger.info("Converting 'services' sections to docker cli commands.")
+        for level in reversed(delete_levels):
+            for delete_commands in level:
+                yield from delete_commands
+
+        logger.info("Converting 'networks' sections to docker cli commands.")
+        for network in networks:
+            yield network.get_delete_command()
+
+
+def _get_stage(profiler: Union["MemoryProfiler", "TimingProfiler", None]) -> Callable:
+    """Gets the context manager which records a stage of the conversion, one which records nothing without a
+    profiler."""
+    return profiler.stage if profiler else _record_nothing
+
+
+def _get_resource(profiler: Union["MemoryProfiler", "TimingProfiler", None]) -> Callable:
+    """Gets the context manager which records converting a single service, one which records nothing without a
+    profiler."""
+    return profiler.resource if profiler else _record_nothing
+
+
+@contextlib.contextmanager
+def _record_nothing(name: str):
+    yield
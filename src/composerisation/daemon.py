@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""This module is a server (``--serve``) which runs the cli for clients over a Unix domain socket, see
+``composerisation.client``. The server imports PyYaml and the parsers once when it starts, each request then runs in
+a process forked from the server. So a request only pays for the conversion, not for starting Python and importing
+composerisation again.
+
+A request is a JSON object with the cli arguments, the working directory, the environment variables and the
+contents of stdin (or null) of the client. The client sends its request and then shuts down its side of the socket.
+The response is a JSON object per line. Everything the cli prints is sent as soon as it is printed, as
+``{"stdout": "..."}`` or ``{"stderr": "..."}``, so ``--stream`` and ``--apply`` print as they go. Then the server
+sends the exit code of the cli as ``{"exit_code": 0}`` and closes the socket.
+
+.. _Google Python Style Guide:
+    http://google.github.io/styleguide/pyguide.html
+
+"""
+import io
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from typing import BinaryIO
+
+from .utils import exceptions
+
+logger = logging.getLogger(__name__)
+
+# Imported before the server starts, so the processes forked for each request don't have to import them.
+WARM_MODULES = [
+    "yaml",
+    "composerisation.batch",
+    "composerisation.cache",
+    "composerisation.converter",
+    "composerisation.executor",
+    "composerisation.reconcile",
+    "composerisation.script",
+]
+
+
+class DaemonServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    """Listens on a Unix domain socket, forking a process to handle each request. Only the user running the server
+    can connect to the socket, as requests can read and write any file the user can.
+
+    Args:
+        socket_path (str): Path to the socket.
+        handler (socketserver.BaseRequestHandler): Handles each request.
+
+    """
+
+    def server_bind(self):
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+
+class DaemonHandler(socketserver.StreamRequestHandler):
+    """Runs the cli for a single request, within the process forked for it."""
+
+    def handle(self):
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        data = self.rfile.read()
+        # i.e. ``remove_stale_socket`` checking if the server is running.
+        if not data:
+            return
+
+        try:
+            request = json.loads(data.decode())
+        except ValueError as e:
+            logger.error(f"Invalid request, {e}.")
+            return
+
+        lock = threading.Lock()
+        stdout, stderr = FrameWriter(self.wfile, "stdout", lock), FrameWriter(self.wfile, "stderr", lock)
+        exit_code = run_cli(request["args"], request["cwd"], request["env"], request.get("stdin"), stdout, stderr)
+        stdout.send({"exit_code": exit_code})
+
+
+class FrameWriter(io.RawIOBase):
+    """Sends everything written to it to the client straight away, as a frame of the response (see the module
+    docstring). Threads running commands for ``--apply`` log at the same time as the cli prints, so the frames of
+    stdout and stderr share a lock to keep them whole.
+
+    Args:
+        wfile (BinaryIO): The socket of the client.
+        name (str): Which output this is, ``stdout`` or ``stderr``.
+        lock (threading.Lock): Held while a frame is sent.
+
+    """
+
+    def __init__(self, wfile: BinaryIO, name: str, lock: threading.Lock):
+        super().__init__()
+        self.wfile = wfile
+        self.name = name
+        self.lock = lock
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        if data:
+            self.send({self.name: bytes(data).decode("utf-8", errors="replace")})
+        return len(data)
+
+    def send(self, frame: dict):
+        """Sends a single frame of the response.
+
+        Args:
+            frame (dict): i.e. ``{"stdout": "..."}``.
+
+        """
+        with self.lock:
+            self.wfile.write(json.dumps(frame).encode() + b"\n")
+
+
+def run_cli(args: list, cwd: str, env: dict, stdin: str, stdout: BinaryIO, stderr: BinaryIO) -> int:
+    """Runs the cli as if it was run by the client, with its working directory, environment variables and stdin. This
+    changes the state of the whole process, so it must only be called in the process forked for the request.
+
+    Args:
+        args (list): The cli arguments, i.e. ``["-i", "docker-compose.yml"]``.
+        cwd (str): The working directory of the client.
+        env (dict): The environment variables of the client.
+        stdin (str): What the client read from stdin if the cli reads the docker-compose file from it, else None.
+        stdout (BinaryIO): Where everything the cli prints to stdout is written, as soon as it is printed.
+        stderr (BinaryIO): Where everything the cli prints to stderr is written.
+
+    Returns:
+        int: The exit code of the cli.
+
+    """
+    from .cli import cli
+
+    os.chdir(cwd)
+    os.environ.clear()
+    os.environ.update(env)
+    # The cli logs to stdout, so the handlers from the server are replaced by one logging to the client's stdout.
+    for handler in logging.root.handlers[:]:
+        logging.root.removeHandler(handler)
+
+    sys.stdin = io.TextIOWrapper(io.BytesIO((stdin or "").encode()), encoding="utf-8")
+    sys.stdout = io.TextIOWrapper(stdout, encoding="utf-8", write_through=True)
+    sys.stderr = io.TextIOWrapper(stderr, encoding="utf-8", write_through=True)
+    try:
+        cli.main(args, prog_name="composerisation")
+        exit_code = 0
+    except SystemExit as e:
+        exit_code = get_exit_code(e.code)
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    return exit_code
+
+
+def get_exit_code(code) -> int:
+    """Gets the exit code a process exits with after ``sys.exit(code)``. The same as Python, None is 0 and anything
+    besides an integer, i.e. a message, is printed to stderr and is 1.
+
+    Args:
+        code (any): The code of the ``SystemExit``.
+
+    Returns:
+        int: The exit code.
+
+    """
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def serve(socket_path: str):
+    """Imports everything the cli needs and then handles requests on the socket, until interrupted or terminated. The
+    socket is removed once the server stops.
+
+    Args:
+        socket_path (str): Path to the socket, i.e. ``/tmp/composerisation.sock``.
+
+    Raises:
+        DaemonRunningException: When a server is already listening on the socket.
+
+    """
+    for module in WARM_MODULES:
+        __import__(module)
+
+    remove_stale_socket(socket_path)
+    with DaemonServer(socket_path, DaemonHandler) as server:
+        logger.info(f"Listening on {socket_path}, press Ctrl+C to stop.")
+        # ``shutdown`` waits for ``serve_forever`` to return, so it can't be called from the thread running it.
+        signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+        try:
+            server.serve_forever()
+        finally:
+            os.remove(socket_path)
+
+
+def remove_stale_socket(socket_path: str):
+    """Removes a socket left behind by a server which didn't stop cleanly, so a new server can listen on it.
+
+    Args:
+        socket_path (str): Path to the socket.
+
+    Raises:
+        DaemonRunningException: When a server is still listening on the socket.
+
+    """
+    if not os.path.exists(socket_path):
+        return
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except OSError:
+            logger.info(f"Removing stale socket {socket_path}.")
+            os.remove(socket_path)
+            return
+    raise exceptions.DaemonRunningException(socket_path=socket_path)
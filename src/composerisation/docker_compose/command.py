@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""This module contains the structure all of the parsers build their docker commands in, before they are turned into
+shell commands.
+
+.. _Google Python Style Guide:
+    http://google.github.io/styleguide/pyguide.html
+
+"""
+import re
+from typing import List
+from typing import Mapping
+from typing import NamedTuple
+from typing import Tuple
+
+SAFE_ARG = re.compile(r"[\w@%+=:,./-]+", re.ASCII)
+ESCAPE_CHARS = re.compile(r'(["\\`])')
+VARIABLE = re.compile(
+    r"\$(?:\{(?P<braced>[A-Za-z_]\w*)(?:(?P<operator>:?-)(?P<default>[^}]*))?\}|(?P<name>[A-Za-z_]\w*))", re.ASCII
+)
+
+
+class Command(NamedTuple):
+    """A single docker command, stored as the docker subcommand and the arguments passed to it. The parsers append
+    arguments to ``args`` and it is only rendered into a shell command at the very end, so anything that wants to
+    run the command can use ``argv`` directly.
+
+    For example ``docker network connect --alias db backend example_db`` is stored as:
+
+    ::
+
+        Command(subcommand=("network", "connect"), args=["--alias", "db", "backend", "example_db"])
+
+    Attributes:
+        subcommand (:obj:`tuple` of :obj:`str`): The docker subcommand i.e. ``("network", "create")``.
+        args (:obj:`list` of :obj:`str`): The arguments passed to the subcommand.
+
+    """
+
+    subcommand: Tuple[str, ...]
+    args: List[str]
+
+    @property
+    def argv(self) -> list:
+        """list: The full command, including ``docker``, as you would pass it to ``subprocess``."""
+        return ["docker", *self.subcommand, *self.args]
+
+    def get_options(self, *names: str) -> list:
+        """Gets the value of every option with one of the given names, in the order they are passed.
+
+        Args:
+            *names (str): The names of the option i.e. ``"--volume", "-v"``.
+
+        Returns:
+            list: Of values i.e. ``["data:/data", "/tmp:/tmp"]`` for ``--volume data:/data -v /tmp:/tmp``.
+
+        """
+        return [value for name, value in zip(self.args, self.args[1:]) if name in names]
+
+    def render(self) -> str:
+        """Renders the command so it can be run by a shell, any arguments which need to be quoted are.
+
+        Returns:
+            str: The docker command i.e. ``docker run --label "description=Accounting webapp" --detach nginx``.
+
+        """
+        return " ".join(quote(arg) for arg in self.argv)
+
+
+def quote(arg: str) -> str:
+    """Quotes an argument so it is passed to docker as a single argument by the shell. We use double quotes so you
+    can still reference environment variables i.e. ``$HOME`` within your docker-compose file. Arguments which don't
+    need quoting are left as they are.
+
+    Args:
+        arg (str): The argument to quote.
+
+    Returns:
+        str: The quoted argument.
+
+    """
+    if SAFE_ARG.fullmatch(arg):
+        return arg
+
+    escaped_arg = ESCAPE_CHARS.sub(r"\\\1", arg)
+    return f'"{escaped_arg}"'
+
+
+def expand_variables(arg: str, environ: Mapping[str, str]) -> str:
+    """Expands the environment variables in an argument, the same way the shell does when the rendered command is run
+    (see ``quote``). So running a command without a shell, i.e. ``--apply``, gives docker the same arguments as
+    running the printed command. ``$NAME``, ``${NAME}``, ``${NAME:-default}`` and ``${NAME-default}`` are expanded,
+    unset variables expand to an empty string. Other shell syntax, i.e. ``$(command)`` or ``$1``, is left as it is.
+
+    Args:
+        arg (str): The argument to expand i.e. ``nginx:${TAG:-latest}``.
+        environ (dict): The environment variables i.e. ``os.environ``.
+
+    Returns:
+        str: The expanded argument i.e. ``nginx:latest``.
+
+    """
+
+    def expand(match):
+        name = match.group("braced") or match.group("name")
+        value = environ.get(name)
+        operator = match.group("operator")
+        if (operator == ":-" and not value) or (operator == "-" and value is None):
+            return expand_variables(match.group("default"), environ)
+        return value or ""
+
+    return VARIABLE.sub(expand, arg)
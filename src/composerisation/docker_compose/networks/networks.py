@@ -6,6 +6,7 @@
 
 """
 
+from ..command import Command
 from ..parser import Parser
 
 
@@ -33,7 +34,7 @@ class NetworkParser(Parser):
 
     ::
 
-    docker network create --driver foobar --opt 'foo=bar' --opt 'baz=1' --name my-network example
+    docker network create --driver foobar --opt foo=bar --opt baz=1 --name my-network example
 
     Following config options are ignored:
 
@@ -45,56 +46,47 @@ class NetworkParser(Parser):
 
     """
 
+    args = {
+        "driver": {"type": [str], "name": "--driver"},
+        "driver_opts": {"type": [list, dict], "name": "--opt"},
+        "attachable": {"type": [bool], "name": "--attachable"},
+        "internal": {"type": [bool], "name": "--internal"},
+        "external": {"type": [bool], "name": "--external"},
+        "labels": {"type": [list, dict], "name": "--label"},
+        "name": {"type": [str], "name": "--name"},
+    }
+    special_args = {"ipam": "_parse_ipam"}
+    ignore_args = frozenset(["enable_ipv6"])
+
     def __init__(self, network_name: str, network_config: dict):
         self.network_name = network_name
-        args = {
-            "driver": {"type": [str], "name": "--driver"},
-            "driver_opts": {"type": [list, dict], "name": "--opt"},
-            "attachable": {"type": [bool], "name": "--attachable"},
-            "internal": {"type": [bool], "name": "--internal"},
-            "external": {"type": [bool], "name": "--external"},
-            "labels": {"type": [list, dict], "name": "--label"},
-            "name": {"type": [str], "name": "--name"},
-        }
-        special_args = {
-            "ipam": self._parse_ipam,
-        }
-        ignore_args = ["enable_ipv6"]
-
-        super().__init__(
-            args=args,
-            config_name=network_name,
-            config_options=network_config,
-            special_args=special_args,
-            ignore_args=ignore_args,
-        )
-
-    def get_start_command(self) -> str:
+        super().__init__(config_name=network_name, config_options=network_config)
+
+    def get_start_command(self) -> Command:
         """Converts the docker compose syntax to normal docker commands. The command will create networks that can be
         attached to container.
 
         Returns:
-            list: A list of volume create commands.
+            Command: The network create command.
 
         """
         args = self._get_args()
-        network_command = f"docker network create {args} {self.network_name}"
-        return network_command
+        args.append(self.network_name)
+        return Command(subcommand=("network", "create"), args=args)
 
-    def get_delete_command(self) -> str:
+    def get_delete_command(self) -> Command:
         """This function returns the command required to delete the network.
 
         Returns:
-            str: Docker command to delete the network.
+            Command: Docker command to delete the network.
 
         """
-        network_command = f"docker network rm {self.network_name}"
-        return network_command
+        return Command(subcommand=("network", "rm"), args=[self.network_name])
 
-    def _parse_ipam(self, ipam: dict) -> str:
+    def _parse_ipam(self, args: list, ipam: dict):
         """For parsing any ``ipam`` options with in docker-compose the logic for this is a bit more complicated as
-        compared with normal args. We need to parse the ``ipam` object. This function will get passed to the
-        `_get_args()` function as `kwargs`.
+        compared with normal args. We need to parse the ``ipam` object. This method is listed in
+        ``special_args``, so `_get_args()` will use it to convert ``ipam``.
 
         Example ``ipam`` config option below.
 
@@ -104,26 +96,23 @@ class NetworkParser(Parser):
                 "ipam": {"driver": "default", "config": {"subnet": "172.28.0.0/16"}}
             }
 
-        Example arguments returned.
+        Example arguments added.
 
         ::
 
             --ipam-driver default --ipam-opt subnet=172.28.0.0./16
 
         Args:
+            args (list): The arguments to add the ``ipam`` arguments to.
             ipam (dict): The ipam config options (see example above).
 
-        Returns:
-            str: The equivalent cli arguments for docker commands for ``ipam`` option in docker-compose networks.
-
         """
-        ipam_args = ""
         driver = ipam.get("driver", "")
         if driver:
-            ipam_args += f"--ipam-driver {driver} "
+            args.append("--ipam-driver")
+            args.append(driver)
         ipam_opts = self._get_config_val(config=ipam, config_key="config")
 
         for name, value in ipam_opts.items():
-            ipam_args += f"--ipam-opt {name}={value} "
-
-        return ipam_args
+            args.append("--ipam-opt")
+            args.append(f"{name}={value}")
@@ -5,11 +5,14 @@
     http://google.github.io/styleguide/pyguide.html
 
 """
-import os
 from collections import ChainMap
+from types import MappingProxyType
+from typing import Callable
 from typing import Union
 
 from ..utils import exceptions
+from .project import Project
+from .project import get_project
 
 
 class Parser:
@@ -25,40 +28,73 @@ class Parser:
 
     Then when we receive container_name within a service it will convert that to `--name <container_name>`.
 
+    Each child class defines which arguments it accepts as class attributes. When the class is created these are
+    compiled once into ``_dispatch``, which maps each config key directly to the function that adds its arguments. So
+    converting a config option is a single lookup, no matter how many parsers we create.
+
     Args:
-        args (dict): Valid arguments this parser will except. It will include the type they are expected to be in i.e. a list and the name of the argument.
         config_name (str): The name of the config i.e. could be a network name or volume name.
         config_options (dict): The network option in the service (see example above).
-        special_args (:obj:`dict`, optional): Defaults to empty dict. Some arguments need specific logic so we have \
-            functions to create the arguments for them here.
-        ignore_args (:obj:`list`, optional): Defaults to empty list. List of args to ignore, either we do not support \
-            them or they are handled else where.
+        project (Project, optional): The project we are converting for, which default names are based on.
 
     Attributes:
-        args (dict): Valid arguments this parser will except. It will include the type they are expected to be in i.e. a list and the name of the argument.
+        args (dict): Valid arguments this parser will except. It will include the type they are expected to be in \
+            i.e. a list and the name of the argument.
+        special_args (dict): Some arguments need specific logic, this maps them to the name of the method that \
+            creates the arguments for them.
+        ignore_args (:obj:`frozenset` of :obj:`str`): Args to ignore, either we do not support them or they are \
+            handled else where.
         config_name (str): The name of the config i.e. could be a network name or volume name.
         config_options (dict): The network option in the service (see example above).
-        special_args (dict): Some arguments need specific logic so we have functions to create the arguments for \
-            them here.
-        ignore_args (:obj:`list` of :obj:`str`): List or args to ignore, either we do not support them or they are \
-            handled else where.
+        project (Project): The project we are converting for, None until it is needed if it wasn't given.
 
     """
 
-    def __init__(self, args: dict, config_name: str, config_options: dict, special_args=None, ignore_args=None):
-        if special_args is None:
-            special_args = {}
+    args = {}
+    special_args = {}
+    ignore_args = frozenset()
+    _dispatch = MappingProxyType({})
 
-        if ignore_args is None:
-            ignore_args = []
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = MappingProxyType(cls._compile_dispatch())
 
-        self.args = args
+    def __init__(self, config_name: str, config_options: dict, project: Project = None):
         self.config_name = config_name
         self.config_options = config_options
-        self.special_args = special_args
-        self.ignore_args = ignore_args
+        self.project = project
+
+    @classmethod
+    def _compile_dispatch(cls) -> dict:
+        """Compiles the ``args``, ``special_args`` and ``ignore_args`` of the class into a single dict. Which maps
+        each config key to a function, taking the parser, the list of arguments and the config value, that adds the
+        arguments for that config option to the list.
+
+        Logic goes as follows:
+
+            * If the `config_key` i.e. `ulimits` is in our special args, then we will use that specific method \
+                to convert it.
+            * If the key is in the ignore list skip it i.e. it is `command` we handle that logic in `ServiceParser` \
+                as it needs specific ordering.
+            * Else convert the current item into arguments using the type it is expected to be.
 
-    def _get_args(self) -> str:
+        Returns:
+            dict: Config key to the function that adds its arguments.
+
+        """
+        dispatch = {}
+        for config_key, arg in cls.args.items():
+            dispatch[config_key] = _get_normal_args_func(arg["type"], arg["name"])
+
+        for config_key in cls.ignore_args:
+            dispatch[config_key] = _ignore_args
+
+        for config_key, method_name in cls.special_args.items():
+            dispatch[config_key] = getattr(cls, method_name)
+
+        return dispatch
+
+    def _get_args(self) -> list:
         """Converts the list of docker compose options into a list of arguments for the various docker commands,
         such as docker run --name container1.
 
@@ -82,87 +118,30 @@ class Parser:
 
         ::
 
-            --label com.example.description=Accounting webapp --label com.example.department=Finance \
-            --label com.example.label-with-empty-value --link db --link db:database --link redis \
-            --network bridge --pid host
-
-
-        Example kwargs
-
-        ::
-
-            {"ulimits": self._parse_ulimits, "logging": self._parse_logging}
-
-        Logic goes as follows:
-
-            * If the `config_key` i.e. `ulimits` is our special args list (kwargs), then we will use that specific \
-                function we passed into kwargs to convert it.
-            * If the key is in the ignore list skip it i.e. it is `command` we handle that logic in `ServiceParser` \
-                as it needs specific ordering.
-            * Else convert the current item into arguments (string).
-
-        Args:
-            kwargs: Any "extra" functions where the argument conversion logic isn't straight forward, so we need to define \
-                extra specific functionality to convert it to arguments.
-
-        Returns:
-            str: The equivalent cli arguments for docker commands to the docker cli syntax.
-
-        """
-        args = ""
-
-        for config_key, config_option in self.config_options.items():
-            if config_key in self.special_args:
-                get_args_func = self.special_args[config_key]
-                args += get_args_func(config_option)
-            elif config_key in self.ignore_args:
-                continue
-            else:
-                args += self._get_normal_args(config_key, config_option)
-
-        return args.strip()
-
-    def _get_normal_args(self, config_name: str, config_value: Union[list, dict, str, bool]) -> str:
-        """This gets the args back for a "normal" type where the logic is predefined and striaght forward. The
-        config_value can be of many types.
-
-        * List and dicts are treated the same; we may need multiple cli arguments for them
-        * Booleans mean we just have to specify the argument i.e like a flag
-        * Finally lists that should be strings need to be converted to strings
-
-        Args:
-            config_name (str): The name of the current config i.e. ``labels``.
-            config_value (any): The value of the config.
+            ["--label", "com.example.description=Accounting webapp", "--label", "com.example.department=Finance",
+             "--label", "com.example.label-with-empty-value", "--link", "db", "--link", "db:database", "--link",
+             "redis", "--network", "bridge", "--pid", "host"]
 
         Returns:
-            str: The argument as a string i.e. ``--label xxx``.
+            list: The equivalent cli arguments for docker commands to the docker cli syntax.
 
         Raises:
             IncorrectConfigException: When an incorrect key is in the wrong section of the docker-compose file.
 
         """
-        try:
-            arg = self.args[config_name]
-        except KeyError as e:
-            incorrect_key = e.args[0]
-            raise exceptions.IncorrectConfigException(config_name=self.config_name, incorrect_key=incorrect_key)
-        arg_type, name = arg["type"], arg["name"]
-
-        arg_is_dict_or_list = set(arg_type).intersection([list, dict])
-        arg_is_str = isinstance(config_value, str)
-
-        if arg_is_dict_or_list and not arg_is_str:
-            args = self._convert_list_to_args(config_value, name)
-        elif bool in arg_type:
-            args = f"{name} "
-        else:
-            if isinstance(config_value, list) and str in arg_type:
-                config_value = " ".join(config_value)
-            args = f"{name} {config_value} "
+        args = []
+        dispatch = self._dispatch
+
+        for config_key, config_option in self.config_options.items():
+            try:
+                add_args_func = dispatch[config_key]
+            except KeyError:
+                raise exceptions.IncorrectConfigException(config_name=self.config_name, incorrect_key=config_key)
+            add_args_func(self, args, config_option)
 
         return args
 
-    def _convert_list_to_args(self, config_val: Union[list, dict], name: str) -> str:
+    def _add_list_args(self, args: list, config_val: Union[list, dict], name: str):
         """Lists will become multiple arguments i.e. you can have multiple `--label` or `--extra-hosts` defined.
         So for every item in the list we just add an extra argument i.e. each label in the list adds another
         ``--label``. If the config option is a dict we will need to convert that into a list first.
@@ -179,23 +158,19 @@ class Parser:
         in to list of strs as shown above.
 
         Args:
+            args (list): The arguments to add to i.e. ``["--label", "lab1", "--label", "lab2"]``.
             config_val(list or dict): The config value we are converting into arguments.
             name (str): The name of the argument i.e. ``--label``.
 
-        Returns:
-            str: The list as an argument string i.e. ``--label lab1 --label lab2``.
-
         """
-        args = ""
         if isinstance(config_val, dict):
             config_val = self._convert_dict_to_list(config_val)
-        elif isinstance(config_val, list) and isinstance(config_val[0], dict):
+        elif config_val and isinstance(config_val[0], dict):
             config_val = self._convert_list_dict_to_list(config_val)
 
         for item in config_val:
-            args += f'{name} "{item}" '
-
-        return args
+            args.append(name)
+            args.append(str(item))
 
     def _convert_dict_to_list(self, configs: dict) -> list:
         """This function will convert any dict args into list args. Sometimes in yaml files you can define
@@ -329,26 +304,83 @@ class Parser:
 
     def _get_image_name(self) -> str:
         """Gets the Docker image name, if no ``image`` config option is set then we assign it a defult name. Which is
-        ``<folder_name>_<service_name>``.
+        ``<project_name>_<service_name>``.
 
         Returns:
             str: The Docker image name.
 
         """
-        dirname = os.path.basename(os.getcwd())
-        default_image_name = f"{dirname}_{self.config_name}"
-        image_name = self.config_options.get("image", default_image_name)
-        return image_name
+        if "image" in self.config_options:
+            return self.config_options["image"]
+        return self._get_project().get_resource_name(self.config_name)
 
     def _get_container_name(self) -> str:
         """Gets the Docker container name, if no ``container`` name is set, use the default contaienr name.
-        Which is ``<folder_name>_<service_name>``.
+        Which is ``<project_name>_<service_name>``.
 
         Returns:
             str: The Docker image name.
 
         """
-        dirname = os.path.basename(os.getcwd())
-        default_container_name = f"{dirname}_{self.config_name}"
-        container_name = self.config_options.get("container_name", default_container_name)
-        return container_name
+        if "container_name" in self.config_options:
+            return self.config_options["container_name"]
+        return self._get_project().get_resource_name(self.config_name)
+
+    def _get_project(self) -> Project:
+        """Gets the project the config is converted for, if it wasn't given it is named after the current directory.
+
+        Returns:
+            Project: The project.
+
+        """
+        if self.project is None:
+            self.project = get_project()
+        return self.project
+
+
+def _get_normal_args_func(arg_type: list, name: str) -> Callable[[Parser, list, Union[list, dict, str, bool]], None]:
+    """Gets the function used to convert a "normal" argument, where the logic is predefined and striaght forward.
+    Which function we need only depends on the type of argument, so we can work it out once per argument. The
+    config_value can be of many types.
+
+    * List and dicts are treated the same; we may need multiple cli arguments for them
+    * Booleans mean we just have to specify the argument i.e like a flag
+    * Finally lists that should be strings need to be converted to strings
+
+    Args:
+        arg_type (list): The types the argument can be i.e. ``[list, dict]``.
+        name (str): The name of the argument i.e. ``--label``.
+
+    Returns:
+        function: Which takes the parser, the list of arguments and the config value and adds the argument to the \
+            list i.e. ``["--label", "xxx"]``.
+
+    """
+    arg_is_dict_or_list = list in arg_type or dict in arg_type
+    arg_is_str = str in arg_type
+
+    def add_list_args(parser: Parser, args: list, config_value: Union[list, dict, str]):
+        if isinstance(config_value, str):
+            args.append(name)
+            args.append(config_value)
+        else:
+            parser._add_list_args(args, config_value, name)
+
+    def add_flag_args(parser: Parser, args: list, config_value: bool):
+        args.append(name)
+
+    def add_str_args(parser: Parser, args: list, config_value: Union[list, str]):
+        if isinstance(config_value, list) and arg_is_str:
+            config_value = " ".join(str(value) for value in config_value)
+        args.append(name)
+        args.append(str(config_value))
+
+    if arg_is_dict_or_list:
+        return add_list_args
+    elif bool in arg_type:
+        return add_flag_args
+    return add_str_args
+
+
+def _ignore_args(parser: Parser, args: list, config_value):
+    """Used for arguments we ignore, they don't add any arguments."""
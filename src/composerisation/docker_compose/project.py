@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""This module contains the project a docker-compose file is converted for, which decides what the images,
+containers and default network are named when the docker-compose file doesn't name them itself.
+
+.. _Google Python Style Guide:
+    http://google.github.io/styleguide/pyguide.html
+
+"""
+import os
+from typing import NamedTuple
+
+
+class Project(NamedTuple):
+    """The project a docker-compose file is converted for. It is worked out once per conversion and shared by all of
+    the parsers, so naming each service doesn't need to look at the current directory again.
+
+    Like docker-compose, images and containers are named ``<project>_<service>`` and services which don't set any
+    `networks` are connected to ``<project>_network``.
+
+    Attributes:
+        name (str): The name of the project i.e. ``example``.
+
+    """
+
+    name: str
+
+    @property
+    def network_name(self) -> str:
+        """str: The default network, services which don't set any `networks` are connected to it."""
+        return f"{self.name}_network"
+
+    def get_resource_name(self, service_name: str) -> str:
+        """Gets the default name of the image or container of a service.
+
+        Args:
+            service_name (str): The name of the service.
+
+        Returns:
+            str: The name i.e. ``example_web``.
+
+        """
+        return f"{self.name}_{service_name}"
+
+
+def get_project(name: str = None) -> Project:
+    """Gets the project, named after the current directory when no name is given like docker-compose does.
+
+    Args:
+        name (str, optional): The name of the project.
+
+    Returns:
+        Project: The project.
+
+    """
+    return Project(name=name or os.path.basename(os.getcwd()))
@@ -6,6 +6,7 @@
 
 """
 
+from ..command import Command
 from ..parser import Parser
 
 
@@ -37,7 +38,7 @@ class ServiceBuildParser(Parser):
 
     ::
 
-        docker build --f Dockerfile-alternate --build-arg buildno=1 --tag build2 ./dir"
+        docker build --file ./dir/Dockerfile-alternate --build-arg buildno=1 --tag build2 ./dir
 
     Args:
         service_name (str): The name (tag) of the image when created.
@@ -45,46 +46,79 @@ class ServiceBuildParser(Parser):
 
     """
 
+    args = {
+        "args": {"type": [list, dict], "name": "--build-arg"},
+        "cache_from": {"type": [list, dict], "name": "--cache-from"},
+        "labels": {"type": [list, dict], "name": "--label"},
+        "shm_size": {"type": [str], "name": "--shm-size"},
+        "target": {"type": [str], "name": "--target"},
+    }
+    ignore_args = frozenset(["context"])
+    special_args = {"dockerfile": "_parse_dockerfile"}
+
     def __init__(self, service_name: str, build_config: dict):
-        args = {
-            "args": {"type": [list, dict], "name": "--build-arg"},
-            "cache_from": {"type": [list, dict], "name": "--cache-from"},
-            "labels": {"type": [list, dict], "name": "--label"},
-            "shm_size": {"type": [str], "name": "--shm-size"},
-            "target": {"type": [str], "name": "--target"},
-        }
-        ignore_args = ["context"]
-        special_args = {"dockerfile": self._parse_dockerfile}
-        super().__init__(
-            args=args,
-            config_name=service_name,
-            config_options=build_config,
-            ignore_args=ignore_args,
-            special_args=special_args,
-        )
-
-    def get_command(self) -> str:
+        super().__init__(config_name=service_name, config_options=build_config)
+
+    def get_command(self) -> Command:
         """Converts the docker compose syntax to normal docker commands. The command will build a docker image.
 
         Returns:
-            str: The docker build command, to build the docker image.
+            Command: The docker build command, to build the docker image.
 
         """
         args = self._get_args()
-        context = self.config_options.get("context", ".")
-        build_command = f"docker build {args} --tag {self.config_name} {context}"
-        return build_command
+        args.append("--tag")
+        args.append(self.config_name)
+        args.append(self.config_options.get("context", "."))
+        return Command(subcommand=("build",), args=args)
 
-    def _parse_dockerfile(self, dockerfile: str) -> str:
+    def _parse_dockerfile(self, args: list, dockerfile: str):
         """For parsing any ``dockerfile`` option in ``docker-compose``.
 
         Args:
+            args (list): The arguments to add the ``--file`` argument to.
             dockerfile (str): The name of the Dockerfile.
 
-        Returns:
-            str: The equivalent cli arguments for docker commands for `dockerfile` option in docker-compose.
-
         """
         context = self.config_options.get("context", ".")
-        dockerfile = f"--file {context}/{dockerfile} "
-        return dockerfile
+        args.append("--file")
+        args.append(f"{context}/{dockerfile}")
+
+
+def merge_build_commands(build_commands: list) -> list:
+    """Merges `docker build` commands which would build the exact same image, so each image is only built once. Two
+    builds are the same if everything but their ``--tag`` is the same, i.e. the same context, dockerfile, args and
+    target. As the args are generated from the build config, the config is normalised i.e. ``args`` given as a list
+    or a mapping give the same arguments. The merged command tags the image for every service that needs it.
+
+    ::
+
+        docker build --tag example_worker .
+        docker build --tag example_scheduler .
+
+    Becomes:
+
+    ::
+
+        docker build --tag example_worker --tag example_scheduler .
+
+    Args:
+        build_commands (list): Of `docker build` commands (``Command``), as returned by
+            ``ServiceBuildParser.get_command``.
+
+    Returns:
+        list: Of the distinct `docker build` commands, in the order each build was first needed.
+
+    """
+    tags = {}
+    for command in build_commands:
+        *args, _, tag, context = command.args
+        image_tags = tags.setdefault((tuple(args), context), [])
+        if tag not in image_tags:
+            image_tags.append(tag)
+
+    merged_commands = []
+    for (args, context), image_tags in tags.items():
+        tag_args = [arg for tag in image_tags for arg in ("--tag", tag)]
+        merged_commands.append(Command(subcommand=("build",), args=[*args, *tag_args, context]))
+    return merged_commands
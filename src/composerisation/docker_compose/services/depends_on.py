@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""This module works out which order the services need to be started in, from the `depends_on` option within
+services. Services are grouped into levels, a service only depends on services in earlier levels. So every service in
+the same level can be started at the same time, once the previous level has started.
+
+.. _Google Python Style Guide:
+    http://google.github.io/styleguide/pyguide.html
+
+"""
+import logging
+
+from ...utils import exceptions
+
+logger = logging.getLogger(__name__)
+
+
+def get_dependencies(service_name: str, service_options: dict) -> list:
+    """Gets the names of the services a service depends on. The `depends_on` option can either be a list of services
+    or a mapping of services to the condition to wait for (long syntax). We cannot wait for a condition using the
+    docker cli, so the conditions are ignored.
+
+    ::
+
+        depends_on:
+            - db
+            - redis
+
+        depends_on:
+            db:
+                condition: service_healthy
+
+    Args:
+        service_name (str): The service name.
+        service_options (dict): The service config options.
+
+    Returns:
+        list: The names of the services it depends on.
+
+    Raises:
+        IncorrectConfigException: When `depends_on` is neither a list or a mapping.
+
+    """
+    depends_on = service_options.get("depends_on", [])
+    if not isinstance(depends_on, (list, dict)):
+        raise exceptions.IncorrectConfigException(config_name=service_name, incorrect_key="depends_on")
+    return list(depends_on)
+
+
+def get_start_levels(services_data: dict) -> list:
+    """Groups the services by when they can be started, using Kahn's algorithm. The first level contains the services
+    which don't depend on anything, the second level the services which only depend on services in the first level and
+    so on. Within a level, services are in the same order as the docker-compose file. Services should be deleted in
+    the reverse order.
+
+    Dependencies on services which aren't in the docker-compose file are ignored, with a warning.
+
+    Args:
+        services_data (dict): The services section of the docker-compose file.
+
+    Returns:
+        list: Of levels, each level is a list of service names.
+
+    Raises:
+        CyclicDependencyException: When services depend on each other, so they can never be started.
+
+    """
+    dependencies = {}
+    for name, options in services_data.items():
+        dependencies[name] = []
+        for dependency in get_dependencies(name, options):
+            if dependency in services_data:
+                dependencies[name].append(dependency)
+            else:
+                logger.warning(f"Service {name} depends on undefined service {dependency}, ignoring it.")
+
+    # Kahn's algorithm, each service is visited once when its last dependency starts. So a long chain of services
+    # depending on each other takes linear time, rather than scanning every service left for each level.
+    order = {name: index for index, name in enumerate(services_data)}
+    in_degree = {}
+    dependents = {name: [] for name in services_data}
+    for name, names in dependencies.items():
+        unique_names = set(names)
+        in_degree[name] = len(unique_names)
+        for dependency in unique_names:
+            dependents[dependency].append(name)
+
+    levels = []
+    started = 0
+    level = [name for name in services_data if not in_degree[name]]
+    while level:
+        levels.append(level)
+        started += len(level)
+        next_level = []
+        for name in level:
+            for dependent in dependents[name]:
+                in_degree[dependent] -= 1
+                if not in_degree[dependent]:
+                    next_level.append(dependent)
+        level = sorted(next_level, key=order.__getitem__)
+
+    if started < len(services_data):
+        remaining = [name for name in services_data if in_degree[name]]
+        raise exceptions.CyclicDependencyException(services=_find_cycle(remaining, dependencies))
+    return levels
+
+
+def _find_cycle(remaining: list, dependencies: dict) -> list:
+    """Finds a cycle amongst the services which could not be started, so we can show the user what caused it. Every
+    service left depends on at least one other service left, so following the dependencies must lead to a cycle.
+
+    Args:
+        remaining (list): The services which could not be started.
+        dependencies (dict): The services each service depends on.
+
+    Returns:
+        list: The services in the cycle, the first service is repeated at the end i.e. ``["a", "b", "a"]``.
+
+    """
+    path = [remaining[0]]
+    while path.count(path[-1]) == 1:
+        path.append(next(name for name in dependencies[path[-1]] if name in remaining))
+    return path[path.index(path[-1]) :]
@@ -6,6 +6,7 @@
 
 """
 
+from ..command import Command
 from ..parser import Parser
 
 
@@ -48,24 +49,26 @@ class ServiceNetworkParser(Parser):
 
     """
 
+    args = {
+        "aliases": {"type": [list], "name": "--alias"},
+        "driver": {"type": [str], "name": "--driver-opt"},
+        "ipv4_address": {"type": [str], "name": "--ip"},
+        "ipv6_address": {"type": [str], "name": "--ip6"},
+    }
+
     def __init__(self, service_name: str, network_name: str, network_config: dict):
         self.service_name = service_name
-        args = {
-            "aliases": {"type": [list], "name": "--alias"},
-            "driver": {"type": [str], "name": "--driver-opt"},
-            "ipv4_address": {"type": [str], "name": "--ip"},
-            "ipv6_address": {"type": [str], "name": "--ip6"},
-        }
-        super().__init__(args=args, config_name=network_name, config_options=network_config)
-
-    def get_command(self) -> list:
+        super().__init__(config_name=network_name, config_options=network_config)
+
+    def get_command(self) -> Command:
         """Converts the docker compose syntax to normal docker commands. For each network defined in the services
         we generate one `docker network connect` command.
 
         Returns:
-            list: A list of `docker network connect` commands to connect a network to the container.
+            Command: A `docker network connect` command to connect a network to the container.
 
         """
         args = self._get_args()
-        network_command = f"docker network connect {args} {self.config_name} {self.service_name}"
-        return network_command
+        args.append(self.config_name)
+        args.append(self.service_name)
+        return Command(subcommand=("network", "connect"), args=args)
@@ -6,8 +6,12 @@ images and connecting networks.
     http://google.github.io/styleguide/pyguide.html
 
 """
+import shlex
+from typing import Optional
 
+from ..command import Command
 from ..parser import Parser
+from ..project import Project
 from .build import ServiceBuildParser
 from .networks import ServiceNetworkParser
 
@@ -67,41 +71,42 @@ class ServicesParser(Parser):
     Args:
         service_name (str): The service name.
         service_options (dict): The service config options.
+        project (Project, optional): The project we are converting for, which default names are based on.
 
     """
 
-    def __init__(self, service_name: str, service_options: dict):
-        args = {
-            "cap_add": {"type": [list], "name": "--cap-add"},
-            "cap_drop": {"type": [list], "name": "--cap-drop"},
-            "cgroup_parent": {"type": [str], "name": "--cgroup-parent"},
-            "container_name": {"type": [str], "name": "--name"},
-            "device": {"type": [list], "name": "--device"},
-            "dns": {"type": [list, str], "name": "--dns"},
-            "dns_search": {"type": [list, str], "name": "--dns-search"},
-            "entrypoint": {"type": [str], "name": "--entrypoint"},
-            "env_file": {"type": [list, str], "name": "--env-file"},
-            "environment": {"type": [list, dict], "name": "--environment"},
-            "expose": {"type": [list], "name": "--expose"},
-            "extra_hosts": {"type": [list], "name": "--add-host"},
-            "init": {"type": [bool], "name": "--init"},
-            "isolation": {"type": [str], "name": "--isolation"},
-            "labels": {"type": [list], "name": "--label"},
-            "links": {"type": [list], "name": "--link"},
-            "network_mode": {"type": [str], "name": "--network"},
-            "pid": {"type": [str], "name": "--pid"},
-            "ports": {"type": [list], "name": "--publish"},
-            "restart": {"type": [str], "name": "--restart"},
-            "security_opt": {"type": [list], "name": "--security-opt"},
-            "stop_grace_period": {"type": [str], "name": "--stop-timeout"},
-            "stop_signal": {"type": [str], "name": "--stop-signal"},
-            "sysctls": {"type": [list, dict], "name": "--sysctl"},
-            "tmpfs": {"type": [list], "name": "--tmpfs"},
-            "userns_mode": {"type": [str], "name": "--userns"},
-            "volumes": {"type": [list], "name": "--volume"},
-        }
-        special_args = {"ulimits": self._parse_ulimits, "logging": self._parse_logging}
-        ignore_args = [
+    args = {
+        "cap_add": {"type": [list], "name": "--cap-add"},
+        "cap_drop": {"type": [list], "name": "--cap-drop"},
+        "cgroup_parent": {"type": [str], "name": "--cgroup-parent"},
+        "container_name": {"type": [str], "name": "--name"},
+        "device": {"type": [list], "name": "--device"},
+        "dns": {"type": [list, str], "name": "--dns"},
+        "dns_search": {"type": [list, str], "name": "--dns-search"},
+        "entrypoint": {"type": [str], "name": "--entrypoint"},
+        "env_file": {"type": [list, str], "name": "--env-file"},
+        "environment": {"type": [list, dict], "name": "--environment"},
+        "expose": {"type": [list], "name": "--expose"},
+        "extra_hosts": {"type": [list], "name": "--add-host"},
+        "init": {"type": [bool], "name": "--init"},
+        "isolation": {"type": [str], "name": "--isolation"},
+        "labels": {"type": [list], "name": "--label"},
+        "links": {"type": [list], "name": "--link"},
+        "network_mode": {"type": [str], "name": "--network"},
+        "pid": {"type": [str], "name": "--pid"},
+        "ports": {"type": [list], "name": "--publish"},
+        "restart": {"type": [str], "name": "--restart"},
+        "security_opt": {"type": [list], "name": "--security-opt"},
+        "stop_grace_period": {"type": [str], "name": "--stop-timeout"},
+        "stop_signal": {"type": [str], "name": "--stop-signal"},
+        "sysctls": {"type": [list, dict], "name": "--sysctl"},
+        "tmpfs": {"type": [list], "name": "--tmpfs"},
+        "userns_mode": {"type": [str], "name": "--userns"},
+        "volumes": {"type": [list], "name": "--volume"},
+    }
+    special_args = {"ulimits": "_parse_ulimits", "logging": "_parse_logging"}
+    ignore_args = frozenset(
+        [
             "build",
             "command",
             "configs",
@@ -114,13 +119,10 @@ class ServicesParser(Parser):
             "image",
             "secrets",
         ]
-        super().__init__(
-            args=args,
-            config_name=service_name,
-            config_options=service_options,
-            special_args=special_args,
-            ignore_args=ignore_args,
-        )
+    )
+
+    def __init__(self, service_name: str, service_options: dict, project: Project = None):
+        super().__init__(config_name=service_name, config_options=service_options, project=project)
 
     def get_start_command(self) -> list:
         """This function returns a list of all the commands you will need to recreate the docker-compose service
@@ -136,17 +138,38 @@ class ServicesParser(Parser):
 
         """
         service_commands = []
+        build_command = self.get_build_command()
+        if build_command:
+            service_commands.append(build_command)
+
+        service_commands += self.get_run_commands()
+        return service_commands
+
+    def get_build_command(self) -> Optional[Command]:
+        """This function returns the `docker build` command for the service, if it has a `build` config option.
+
+        Returns:
+            Command: The `docker build` command, None if the service doesn't need to be built.
+
+        """
+        if "build" not in self.config_options:
+            return None
+
         image_name = self._get_image_name()
-        container_name = self._get_container_name()
+        build = ServiceBuildParser(service_name=image_name, build_config=self.config_options["build"])
+        return build.get_command()
 
-        if "build" in self.config_options:
-            build_config = self.config_options["build"]
-            build = ServiceBuildParser(service_name=image_name, build_config=build_config)
-            build_command = build.get_command()
-            service_commands.append(build_command)
+    def get_run_commands(self) -> list:
+        """This function returns the commands to run the service once its image exists, the `docker run` command
+        followed by a `docker network connect` for each network it is connected to.
 
-        run_command = self._add_run_command(container_name, image_name)
-        service_commands.append(run_command)
+        Returns:
+            list: Of the `docker run` and `docker network connect` commands.
+
+        """
+        image_name = self._get_image_name()
+        container_name = self._get_container_name()
+        service_commands = [self._add_run_command(container_name, image_name)]
 
         if "networks" in self.config_options:
             networks_config = self.config_options["networks"]
@@ -156,30 +179,34 @@ class ServicesParser(Parser):
                 service_commands.append(network_command)
         return service_commands
 
-    def _add_run_command(self, container_name: str, image_name: str) -> str:
+    def _add_run_command(self, container_name: str, image_name: str) -> Command:
         """This function will get the equivalent `docker run` command for a given service config in docker compose.
         Including the args required. If a name is not specified the container will be named after the service.
 
+        A ``command`` given as a string is split the same way a shell would, a list is passed as it is.
+
         Args:
             container_name (str): What to call the container once it's running.
             image_name (str): The name of the image we will run.
 
         Returns:
-            str: The `docker run` commands for the given `service_options`. This will start our docker image and run \
-                it.
+            Command: The `docker run` commands for the given `service_options`. This will start our docker image and \
+                run it.
 
         """
         args = self._get_args()
         if "container_name" not in self.config_options:
-            args += f" --name {container_name}"
+            args.append("--name")
+            args.append(container_name)
 
-        command = self.config_options.get("command", "")
-        if isinstance(command, list):
-            command = " ".join(command)
-            command = f'"{command}"'
+        args.append("--detach")
+        args.append(image_name)
 
-        run_command = f"docker run {args} --detach {image_name} {command}".strip()
-        return run_command
+        command = self.config_options.get("command", [])
+        if isinstance(command, str):
+            command = shlex.split(command)
+        args += [str(arg) for arg in command]
+        return Command(subcommand=("run",), args=args)
 
     def get_delete_command(self) -> list:
         """This function returns the a list of commands to remove the docker container from your system.
@@ -189,14 +216,14 @@ class ServicesParser(Parser):
 
         """
         container_name = self._get_container_name()
-        stop_command = f"docker stop {container_name}"
-        remove_command = f"docker rm {container_name}"
+        stop_command = Command(subcommand=("stop",), args=[container_name])
+        remove_command = Command(subcommand=("rm",), args=[container_name])
         return [stop_command, remove_command]
 
-    def _parse_ulimits(self, ulimits: dict) -> str:
+    def _parse_ulimits(self, args: list, ulimits: dict):
         """For parsing any `ulimits` options with in docker-compose the logic for this is a bit more complicated as
         compared with normal args. The key and value parsed can be of any value and they can also define hard & soft
-        values.This function will get passed to the `_get_args()` function as `kwargs`.
+        values. This method is listed in ``special_args``, so `_get_args()` will use it to convert `ulimits`.
 
         Example `ulimits` config option below.
 
@@ -204,35 +231,31 @@ class ServicesParser(Parser):
 
             {"nproc": 65535, "nofile": {"soft": 20000, "hard": 40000}}
 
-        Example arguments returned.
+        Example arguments added.
 
         ::
 
             --ulimit nproc=65535 --ulimit nofile=20000:40000
 
         Args:
+            args (list): The arguments to add the `ulimits` arguments to.
             ulimits (dict): The ulimits config options (see example above).
 
-        Returns:
-            str: The equivalent cli arguments for docker commands for `ulimits` option in docker-compose.
-
         """
-        ulimit_args = ""
         for name, value in ulimits.items():
             if isinstance(value, dict):
                 soft, hard = value["soft"], value["hard"]
-                ulimit = f"--ulimit {name}={soft}:{hard} "
+                ulimit = f"{name}={soft}:{hard}"
             else:
-                ulimit = f"--ulimit {name}={value} "
-            ulimit_args += ulimit
-
-        return ulimit_args
+                ulimit = f"{name}={value}"
+            args.append("--ulimit")
+            args.append(ulimit)
 
-    def _parse_logging(self, logging: dict) -> str:
+    def _parse_logging(self, args: list, logging: dict):
         """For parsing any `logging` options with in docker-compose the logic for this is a bit more complicated as
         compared with normal args. We need to parse the `logging` object. For example it can contain a driving logger
-        and then extra logging options where the key and value can be "anything". This function will get passed to the
-        `_get_args()` function as `kwargs`.
+        and then extra logging options where the key and value can be "anything". This method is listed in
+        ``special_args``, so `_get_args()` will use it to convert `logging`.
 
         Example `logging` config option below.
 
@@ -241,25 +264,21 @@ class ServicesParser(Parser):
             {"driver": "json-file", "options": {"max-size": "1k", "max-file": "3"}}
 
 
-        Example arguments returned.
+        Example arguments added.
 
         ::
 
             --log-driver json-file --log-opt max-size=1k --log-opt max-file=3
 
         Args:
+            args (list): The arguments to add the `logging` arguments to.
             logging (dict): The logging config options (see example above).
 
-        Returns:
-            str: The equivalent cli arguments for docker commands for `logging` option in docker-compose.
-
         """
-        logging_args = ""
-        driver = logging.get("driver", "")
-        logging_args += f"--log-driver {driver} "
+        args.append("--log-driver")
+        args.append(logging.get("driver", ""))
         logging_opts = self._get_config_val(config=logging, config_key="options")
 
         for name, value in logging_opts.items():
-            logging_args += f"--log-opt {name}={value} "
-
-        return logging_args
+            args.append("--log-opt")
+            args.append(f"{name}={value}")
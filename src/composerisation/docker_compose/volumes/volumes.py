@@ -6,6 +6,7 @@
 
 """
 
+from ..command import Command
 from ..parser import Parser
 
 
@@ -53,9 +54,9 @@ class VolumeParser(Parser):
 
     ::
 
-        docker volume create --driver foobar --opt type=nfs --opt 'o=addr=10.40.0.199,nolock,soft,rw example' \
-        --opt 'device=:/docker/example' --label 'com.example.description=Database volume' \
-        --label 'com.example.department=IT/Ops' --label 'com.example.label-with-empty-value' \
+        docker volume create --driver foobar --opt type=nfs --opt o=addr=10.40.0.199,nolock,soft,rw \
+        --opt device=:/docker/example --label "com.example.description=Database volume" \
+        --label com.example.department=IT/Ops --label com.example.label-with-empty-value \
         --name my-app-data example
 
     Args:
@@ -63,27 +64,28 @@ class VolumeParser(Parser):
 
     """
 
+    args = {
+        "driver": {"type": [str], "name": "--driver"},
+        "driver_opts": {"type": [list, dict], "name": "--opt"},
+        "labels": {"type": [list, dict], "name": "--label"},
+        "name": {"type": [str], "name": "--name"},
+    }
+
     def __init__(self, volume_name: str, volume_config: dict):
-        args = {
-            "driver": {"type": [str], "name": "--driver"},
-            "driver_opts": {"type": [list, dict], "name": "--opt"},
-            "labels": {"type": [list, dict], "name": "--label"},
-            "name": {"type": [str], "name": "--name"},
-        }
-        super().__init__(args=args, config_name=volume_name, config_options=volume_config)
-
-    def get_start_command(self) -> list:
+        super().__init__(config_name=volume_name, config_options=volume_config)
+
+    def get_start_command(self) -> Command:
         """Converts the docker compose syntax to normal docker commands. The command will create volumes that can be
         attached to container. If the volume has been created externally we don't need the comamnd
         hence we skip it.
 
         Returns:
-            str: The volume create Docker command.
+            Command: The volume create Docker command.
 
         """
-        args = ""
+        args = []
         if self.config_options and "external" not in self.config_options:
             args = self._get_args()
 
-        volume_command = f"docker volume create {args} {self.config_name}"
-        return volume_command
+        args.append(self.config_name)
+        return Command(subcommand=("volume", "create"), args=args)
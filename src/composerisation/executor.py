@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""This module runs the Docker cli commands itself, rather than printing them so they can be piped into a shell. The
+commands are grouped into a plan which says which commands can run at the same time:
+
+- A plan is a list of stages, each stage is only started once the previous stage has finished.
+- A stage is a list of chains, the chains within a stage run at the same time as each other.
+- A chain is a list of commands (``Command``), which must run one after another i.e. build an image then run it.
+
+What each chain creates and uses (networks, volumes, images and containers) is worked out from the arguments of its
+commands, see ``get_resources``. So when a chain fails, the chains in later stages which need what it was meant to
+create can be skipped.
+
+.. _Google Python Style Guide:
+    http://google.github.io/styleguide/pyguide.html
+
+"""
+import logging
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+from typing import List
+from typing import Mapping
+from typing import NamedTuple
+from typing import Set
+from typing import Tuple
+
+from .docker_compose.command import Command
+from .docker_compose.command import expand_variables
+
+logger = logging.getLogger(__name__)
+
+
+class CommandResult(NamedTuple):
+    """The result of running a single docker command.
+
+    Attributes:
+        command (Command): The command that was run.
+        returncode (int): The exit code of the command.
+        duration (float): How long the command took to run, in seconds.
+        output (str): Everything the command printed, stdout and stderr.
+
+    """
+
+    command: Command
+    returncode: int
+    duration: float
+    output: str = ""
+
+    @property
+    def ok(self) -> bool:
+        """bool: True if the command succeeded."""
+        return self.returncode == 0
+
+
+def run_plan(
+    plan: list, workers: int = None, continue_on_error: bool = False, dependencies: Mapping[str, Iterable[str]] = None
+) -> List[CommandResult]:
+    """Runs every command in a plan, using a pool of threads. When a command fails, the rest of its chain is skipped
+    as it depends on the failed command. By default we also stop starting new commands in any other chain and don't
+    start the next stage (fail fast).
+
+    If ``continue_on_error`` is set, every other chain and stage still runs, except the chains in later stages which
+    use a network, volume, image or container that a failed chain was meant to create (see ``get_resources``), or
+    which start a service that `depends_on` one of those containers. They are skipped as well, and so is anything
+    which needs what they would have created.
+
+    Args:
+        plan (list): The stages to run, see the module docstring.
+        workers (int, optional): Maximum number of commands to run at once.
+        continue_on_error (bool, optional): Keep running the rest of the plan when a command fails.
+        dependencies (dict, optional): The containers each container depends on, from `depends_on`, see
+            ``DockerPlan``.
+
+    Returns:
+        list: Of ``CommandResult``, for each command which was run.
+
+    """
+    results = []
+    failed = threading.Event()
+    missing = set()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for stage in plan:
+            futures = []
+            for chain in stage:
+                created, used = get_resources(chain, dependencies or {})
+                skipped_because = used & missing
+                if skipped_because:
+                    resources = ", ".join(f"{kind} {name}" for kind, name in sorted(skipped_because))
+                    logger.error(f"Skipped {chain[0].render()}, as {resources} failed to be created.")
+                    missing |= created
+                    continue
+                futures.append((chain, created, executor.submit(_run_chain, chain, failed, continue_on_error)))
+
+            for chain, created, future in futures:
+                chain_results = future.result()
+                results += chain_results
+                if len(chain_results) < len(chain) or not all(result.ok for result in chain_results):
+                    missing |= created
+
+            if failed.is_set() and not continue_on_error:
+                break
+    return results
+
+
+def get_resources(chain: list, dependencies: Mapping[str, Iterable[str]]) -> Tuple[Set[tuple], Set[tuple]]:
+    """Works out what a chain creates and what it uses from the arguments of its commands, each as a
+    ``(kind, name)`` pair i.e. ``("network", "backend")``.
+
+    - `docker network create` and `docker volume create` create the network or volume named by their last argument.
+    - `docker build` creates the images it tags.
+    - `docker run` creates the container it names, and uses its image, its `--network`, the named volumes in its
+      `--volume` and `--mount` options, the containers in its `--link` and `--volumes-from` options and the containers
+      it depends on (from ``dependencies``).
+    - `docker network connect` uses the network and the container.
+
+    Args:
+        chain (list): Of ``Command``.
+        dependencies (dict): The containers each container depends on, from `depends_on`.
+
+    Returns:
+        tuple: The set of resources the chain creates and the set of resources it uses.
+
+    """
+    created, used = set(), set()
+    for command in chain:
+        if command.subcommand in (("network", "create"), ("volume", "create")):
+            created.add((command.subcommand[0], command.args[-1]))
+        elif command.subcommand == ("build",):
+            created.update(("image", tag) for tag in command.get_options("--tag", "-t"))
+        elif command.subcommand == ("network", "connect"):
+            used.update([("network", command.args[-2]), ("container", command.args[-1])])
+        elif command.subcommand == ("run",):
+            used.update(_get_run_resources(command, dependencies))
+            created.update(("container", name) for name in command.get_options("--name"))
+    return created, used - created
+
+
+def run_command(command: Command) -> CommandResult:
+    """Runs a single docker command, waiting for it to finish. The command isn't run by a shell, so environment
+    variables in its arguments are expanded here, the same as the shell would expand them in the printed command.
+
+    Args:
+        command (Command): The command to run.
+
+    Returns:
+        CommandResult: The exit code, duration and output of the command.
+
+    """
+    logger.debug(f"Running {command.render()}")
+    start = time.perf_counter()
+    try:
+        process = subprocess.run(
+            [expand_variables(arg, os.environ) for arg in command.argv],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+        )
+        returncode, output = process.returncode, process.stdout
+    except OSError as e:
+        returncode, output = 127, f"Could not run docker, {e.strerror}."
+    duration = time.perf_counter() - start
+    return CommandResult(command=command, returncode=returncode, duration=duration, output=output)
+
+
+def _run_chain(chain: list, failed: threading.Event, continue_on_error: bool) -> List[CommandResult]:
+    """Runs each command in a chain one after another, stopping at the first command which fails.
+
+    Args:
+        chain (list): Of commands to run in order.
+        failed (threading.Event): Set once any command in the plan has failed.
+        continue_on_error (bool): If not set, stop once any command in the plan has failed.
+
+    Returns:
+        list: Of ``CommandResult``, for each command which was run.
+
+    """
+    results = []
+    for command in chain:
+        if failed.is_set() and not continue_on_error:
+            break
+
+        result = run_command(command)
+        results.append(result)
+        if not result.ok:
+            logger.error(f"{command.render()} failed with exit code {result.returncode}.")
+            failed.set()
+            break
+    return results
+
+
+def _get_run_resources(command: Command, dependencies: Mapping[str, Iterable[str]]) -> Iterable[tuple]:
+    """Gets the resources a `docker run` command uses, see ``get_resources``. Which argument is the image isn't
+    known without knowing every option of `docker run`, so every argument is treated as an image it might use."""
+    yield from (("image", arg) for arg in command.args)
+    for network in command.get_options("--network", "--net"):
+        kind, _, name = network.rpartition(":")
+        yield ("container", name) if kind == "container" else ("network", network)
+    for volume in command.get_options("--volume", "-v"):
+        yield "volume", volume.split(":", 1)[0]
+    for mount in command.get_options("--mount"):
+        options = dict(option.partition("=")[::2] for option in mount.split(","))
+        yield "volume", options.get("source", options.get("src", ""))
+    for container in command.get_options("--link", "--volumes-from"):
+        yield "container", container.split(":", 1)[0]
+    for name in command.get_options("--name"):
+        yield from (("container", dependency) for dependency in dependencies.get(name, []))
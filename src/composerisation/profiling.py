@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""This module measures how long each stage of converting a docker-compose file takes (``--profile``) or how much
+memory it uses, using ``tracemalloc`` (``--memory-profile``). The file is converted by the same generators as
+``--stream``, which call the profiler at the start and end of each stage (see ``generate_docker_commands``). The
+stages are parsing each yaml document, working out the levels of services, converting the networks, volumes, builds
+and services to start commands and the delete commands. Each line is rendered and printed within the stage which
+converted it, so a stage's peak is what the streamed conversion holds on to while it runs.
+
+Tracing every allocation makes the conversion several times slower, so memory is only recorded per stage. Timings
+are also recorded for each service.
+
+.. _Google Python Style Guide:
+    http://google.github.io/styleguide/pyguide.html
+
+"""
+import contextlib
+import cProfile
+import time
+import tracemalloc
+from typing import TYPE_CHECKING
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import TextIO
+from typing import Union
+
+from .converter import generate_docker_commands
+from .converter import load_docker_compose_documents
+from .docker_compose.project import Project
+from .docker_compose.project import get_project
+
+if TYPE_CHECKING:
+    from .cache import ConversionCache
+
+IGNORE_FILES = [tracemalloc.__file__, contextlib.__file__]
+
+
+class StageMemory(NamedTuple):
+    """How much memory a single stage used.
+
+    Attributes:
+        name (str): The name of the stage i.e. ``parse``.
+        peak (int): The most memory allocated at once during the stage, in bytes, on top of what was allocated before.
+        retained (int): Memory still allocated at the end of the stage, in bytes, i.e. the result of the stage.
+        top (:obj:`list` of :obj:`tracemalloc.StatisticDiff`): The lines which allocated the most memory.
+
+    """
+
+    name: str
+    peak: int
+    retained: int
+    top: List[tracemalloc.StatisticDiff]
+
+
+class Timing(NamedTuple):
+    """How long a single stage, or converting a single resource, took.
+
+    Attributes:
+        name (str): The name of the stage i.e. ``parse``, or the resource i.e. ``web``.
+        seconds (float): The wall time taken.
+
+    """
+
+    name: str
+    seconds: float
+
+
+class TimingProfiler:
+    """Records how long each stage and each service takes to convert, while it is used as a context manager. It can
+    also run ``cProfile`` at the same time, saving the stats so they can be read with ``pstats`` or ``snakeviz``.
+
+    Args:
+        top (int, optional): How many of the slowest services to report.
+        profile_output (str, optional): Where to save the ``cProfile`` stats, if not set ``cProfile`` isn't run.
+
+    """
+
+    def __init__(self, top: int = 10, profile_output: str = None):
+        self.top = top
+        self.profile_output = profile_output
+        self.stages = []
+        self.resources = []
+        self._cprofile = cProfile.Profile() if profile_output else None
+
+    def __enter__(self):
+        if self._cprofile:
+            self._cprofile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._cprofile:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.profile_output)
+
+    @property
+    def total(self) -> float:
+        """float: The total time taken by every stage, in seconds."""
+        return sum(stage.seconds for stage in self.stages)
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """Records how long everything run within the context takes.
+
+        Args:
+            name (str): The name of the stage.
+
+        """
+        start = time.perf_counter()
+        yield
+        self.stages.append(Timing(name=name, seconds=time.perf_counter() - start))
+
+    @contextlib.contextmanager
+    def resource(self, name: str):
+        """Records how long it takes to convert a single resource, i.e. a service, within a stage.
+
+        Args:
+            name (str): The name of the resource.
+
+        """
+        start = time.perf_counter()
+        yield
+        self.resources.append(Timing(name=name, seconds=time.perf_counter() - start))
+
+    def report(self) -> str:
+        """Formats the time taken by each stage as a table, stages with the same name are added together. Followed
+        by the slowest services.
+
+        Returns:
+            str: The report.
+
+        """
+        stages = {}
+        for stage in self.stages:
+            stages[stage.name] = stages.get(stage.name, 0) + stage.seconds
+
+        total = self.total or 1
+        lines = [f"{'Stage':<12} {'Time':>12} {'%':>6}"]
+        for name, seconds in stages.items():
+            lines.append(f"{name:<12} {format_duration(seconds):>12} {seconds / total:>6.1%}")
+        lines.append(f"{'Total':<12} {format_duration(self.total):>12}")
+
+        slowest = sorted(self.resources, key=lambda resource: resource.seconds, reverse=True)[: self.top]
+        if slowest:
+            lines.append(f"Slowest {len(slowest)} of {len(self.resources)} services:")
+            lines += [f"    {format_duration(resource.seconds):>12}  {resource.name}" for resource in slowest]
+        if self.profile_output:
+            lines.append(f"cProfile stats saved to {self.profile_output}.")
+        return "\n".join(lines)
+
+
+class MemoryProfiler:
+    """Records the memory used by each stage, tracing allocations while it is used as a context manager.
+
+    ::
+
+        with MemoryProfiler() as profiler:
+            with profiler.stage("parse"):
+                docker_compose = load_docker_compose(data)
+        print(profiler.report())
+
+    Args:
+        top (int, optional): How many of the lines which allocated the most memory to record per stage.
+
+    """
+
+    def __init__(self, top: int = 5):
+        self.top = top
+        self.stages = []
+
+    def __enter__(self):
+        tracemalloc.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def resource(self, name: str):
+        """Memory isn't recorded per resource, taking a snapshot for every service would take far too long."""
+        yield
+
+    @property
+    def peak(self) -> int:
+        """int: The peak of the stage which used the most memory, in bytes."""
+        return max((stage.peak for stage in self.stages), default=0)
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """Records the memory used by everything run within the context.
+
+        Args:
+            name (str): The name of the stage.
+
+        """
+        before = tracemalloc.take_snapshot()
+        start, _ = tracemalloc.get_traced_memory()
+        _reset_peak()
+        yield
+
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        statistics = after.compare_to(before, "lineno")
+        top = [statistic for statistic in statistics if statistic.traceback[0].filename not in IGNORE_FILES]
+        top = top[: self.top]
+        self.stages.append(StageMemory(name=name, peak=peak - start, retained=current - start, top=top))
+
+    def report(self) -> str:
+        """Formats the memory used by each stage as a table, with the lines which allocated the most memory below each
+        stage.
+
+        Returns:
+            str: The report.
+
+        """
+        lines = [f"{'Stage':<12} {'Peak':>12} {'Retained':>12}"]
+        for stage in self.stages:
+            lines.append(f"{stage.name:<12} {format_size(stage.peak):>12} {format_size(stage.retained):>12}")
+            for statistic in stage.top:
+                frame = statistic.traceback[0]
+                lines.append(f"    {format_size(statistic.size_diff):>12}  {frame.filename}:{frame.lineno}")
+        lines.append(f"{'Peak':<12} {format_size(self.peak):>12}")
+        return "\n".join(lines)
+
+
+def profile_conversion(
+    stream: Union[str, TextIO],
+    profiler: Union[MemoryProfiler, TimingProfiler],
+    project: Project = None,
+    cache: "ConversionCache" = None,
+) -> Iterator[str]:
+    """Converts a docker-compose file, the same as the cli does with ``--stream``, recording each stage with the
+    profiler. The profiler records until every line has been yielded.
+
+    Args:
+        stream (str, file): The contents of the docker-compose file, or the file to read it from.
+        profiler (MemoryProfiler, TimingProfiler): Records each stage.
+        project (Project, optional): The project to convert for, by default named after the current directory.
+        cache (ConversionCache, optional): Cache of the commands each resource converts to, see \
+            ``composerisation.cache``.
+
+    Yields:
+        str: The lines the cli would print.
+
+    Raises:
+        YAMLError: When the data is not valid yaml.
+
+    """
+    project = project or get_project()
+    with profiler:
+        documents = load_docker_compose_documents(stream)
+        while True:
+            with profiler.stage("parse"):
+                docker_compose = next(documents, None)
+            if docker_compose is None:
+                break
+            yield from generate_docker_commands(docker_compose, cache=cache, project=project, profiler=profiler)
+
+
+def format_duration(seconds: float) -> str:
+    """Formats a duration so it is easy to read i.e. ``1.50 ms``.
+
+    Args:
+        seconds (float): The duration.
+
+    Returns:
+        str: The formatted duration.
+
+    """
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} us"
+
+
+def format_size(size: int) -> str:
+    """Formats a number of bytes so it is easy to read i.e. ``1.5 MiB``.
+
+    Args:
+        size (int): The number of bytes, can be negative.
+
+    Returns:
+        str: The formatted size.
+
+    """
+    for unit in ["B", "KiB", "MiB"]:
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def _reset_peak():
+    """Resets the peak, so it only includes the current stage. ``tracemalloc.reset_peak`` was added in Python 3.9, on
+    older versions the peak includes earlier stages."""
+    if hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+"""This module works out the fewest commands needed to go from one version of a docker-compose file to another,
+rather than deleting and starting everything again. Used by ``--diff`` and ``--watch``.
+
+Each network, volume and service is converted separately and compared by the commands it converts to. So only
+services whose `docker build` or `docker run` commands changed are recreated, services whose only change is the
+networks they are connected to are disconnected from and connected to just those networks, and only new networks and
+volumes are created. Networks which changed are removed and created again, along with any services using them, as
+docker can't change them in place.
+
+Removing a volume deletes its data, so volumes which changed or were removed from the file are kept unless
+``remove_volumes`` is set. External networks and volumes are managed outside of the docker-compose file, so they are
+never removed.
+
+.. _Google Python Style Guide:
+    http://google.github.io/styleguide/pyguide.html
+
+"""
+import functools
+from typing import Callable
+from typing import Iterable
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+from .converter import get_service_levels
+from .converter import render_docker_commands
+from .docker_compose.command import Command
+from .docker_compose.networks.networks import NetworkParser
+from .docker_compose.project import Project
+from .docker_compose.project import get_project
+from .docker_compose.services.build import merge_build_commands
+from .docker_compose.services.depends_on import get_start_levels
+from .docker_compose.services.services import ServicesParser
+from .docker_compose.volumes.volumes import VolumeParser
+
+
+class Resource(NamedTuple):
+    """The commands a single network, volume or service converted to.
+
+    Attributes:
+        build_commands (:obj:`list` of :obj:`Command`): The `docker build` command, if the service is built.
+        start_commands (:obj:`list` of :obj:`Command`): The command to create the network or volume, or to run the
+            service.
+        connect_commands (:obj:`list` of :obj:`Command`): The `docker network connect` commands of the service.
+        delete_commands (:obj:`list` of :obj:`Command`): The commands to remove the resource.
+        config (dict): The config the resource was converted from, to tell if it has changed.
+
+    """
+
+    build_commands: List[Command]
+    start_commands: List[Command]
+    connect_commands: List[Command]
+    delete_commands: List[Command]
+    config: dict = None
+
+
+class Reconciliation(NamedTuple):
+    """What changed between two versions of a docker-compose file and the commands to go from one to the other.
+
+    Attributes:
+        added (list): Keys of the new resources, i.e. ``(0, "service", "web")``.
+        changed (list): Keys of the resources which have to be removed and created again.
+        reconnected (list): Keys of the services which only need to be connected to different networks.
+        removed (list): Keys of the resources which no longer exist.
+        kept (list): Keys of the networks and volumes which changed or no longer exist, but aren't removed. Either
+            they are external or they are volumes and removing volumes wasn't asked for.
+        delete_commands (:obj:`list` of :obj:`Command`): The commands to remove the old resources.
+        start_commands (:obj:`list` of :obj:`Command`): The commands to create the new resources.
+
+    """
+
+    added: List[Tuple[int, str, str]]
+    changed: List[Tuple[int, str, str]]
+    reconnected: List[Tuple[int, str, str]]
+    removed: List[Tuple[int, str, str]]
+    kept: List[Tuple[int, str, str]]
+    delete_commands: List[Command]
+    start_commands: List[Command]
+
+
+def get_resources(documents: Iterable[dict], previous: dict = None, project: Project = None) -> dict:
+    """Converts each network, volume and service in a docker-compose file separately.
+
+    Args:
+        documents (iterable): The contents of each docker-compose document in the file.
+        previous (dict, optional): Resources from an earlier version of the file, any resource with the same config is
+            reused rather than converted again.
+        project (Project, optional): The project to convert for, by default named after the current directory.
+
+    Returns:
+        dict: Of ``Resource`` by ``(document, kind, name)`` i.e. ``(0, "service", "web")``, in the order they are
+            created. Networks, then volumes, then services in the order they are started.
+
+    Raises:
+        IncorrectConfigException: When a resource has an invalid config.
+        CyclicDependencyException: When services depend on each other.
+
+    """
+    previous = previous or {}
+    project = project or get_project()
+    resources = {}
+    for index, docker_compose in enumerate(documents):
+        networks_data = {**docker_compose.get("networks", {}), project.network_name: {"driver": "bridge"}}
+        for name, config in networks_data.items():
+            key = (index, "network", name)
+            convert = functools.partial(_convert_network, name, config)
+            resources[key] = _get_resource(previous.get(key), config, convert)
+
+        for name, config in docker_compose.get("volumes", {}).items():
+            key = (index, "volume", name)
+            convert = functools.partial(_convert_volume, name, config)
+            resources[key] = _get_resource(previous.get(key), config, convert)
+
+        for level in get_service_levels(docker_compose, project):
+            for service in level:
+                key = (index, "service", service.config_name)
+                convert = functools.partial(_convert_service, service)
+                resources[key] = _get_resource(previous.get(key), service.config_options, convert)
+    return resources
+
+
+def _get_resource(previous: Optional[Resource], config: dict, convert: Callable[[], Resource]) -> Resource:
+    """Converts a resource, unless its config is the same as last time, then the resource from last time is reused.
+
+    Args:
+        previous (Resource): The resource from the last version, None if it is new.
+        config (dict): The config of the resource.
+        convert (callable): Converts the resource.
+
+    Returns:
+        Resource: The commands the resource converts to.
+
+    """
+    if previous is not None and previous.config == config:
+        return previous
+    return convert()._replace(config=config)
+
+
+def _convert_network(name: str, config: dict) -> Resource:
+    network = NetworkParser(network_name=name, network_config=config)
+    return Resource(
+        build_commands=[],
+        start_commands=[network.get_start_command()],
+        connect_commands=[],
+        delete_commands=[] if is_external(config) else [network.get_delete_command()],
+    )
+
+
+def _convert_volume(name: str, config: dict) -> Resource:
+    volume = VolumeParser(volume_name=name, volume_config=config)
+    return Resource(
+        build_commands=[],
+        start_commands=[volume.get_start_command()],
+        connect_commands=[],
+        delete_commands=[] if is_external(config) else [Command(subcommand=("volume", "rm"), args=[name])],
+    )
+
+
+def _convert_service(service: ServicesParser) -> Resource:
+    build_command = service.get_build_command()
+    run_command, *connect_commands = service.get_run_commands()
+    return Resource(
+        build_commands=[build_command] if build_command else [],
+        start_commands=[run_command],
+        connect_commands=connect_commands,
+        delete_commands=service.get_delete_command(),
+    )
+
+
+def render_resources(documents: Iterable[dict], resources: dict) -> list:
+    """Renders the commands of every resource into the same lines ``get_docker_commands`` gives for each document, so
+    a file which has just been converted by ``get_resources`` doesn't need to be converted again to print it.
+
+    Args:
+        documents (iterable): The contents of each docker-compose document in the file, as given to ``get_resources``.
+        resources (dict): Of ``Resource``, as returned by ``get_resources``.
+
+    Returns:
+        list: Of lines to output, the start commands followed by the delete commands of each document.
+
+    """
+    document_resources = {}
+    for (index, kind, name), resource in resources.items():
+        document_resources.setdefault(index, []).append((kind, name, resource))
+
+    lines = []
+    for index, docker_compose in enumerate(documents):
+        document = document_resources.get(index, [])
+        start_commands = [
+            command for kind, _, resource in document if kind != "service" for command in resource.start_commands
+        ]
+        services = [resource for kind, _, resource in document if kind == "service"]
+        start_commands += merge_build_commands([command for service in services for command in service.build_commands])
+        for service in services:
+            start_commands += service.start_commands + service.connect_commands
+
+        # Services are deleted a level at a time in reverse, but in file order within each level.
+        delete_commands = []
+        for level in reversed(get_start_levels(docker_compose.get("services", {}))):
+            for name in level:
+                delete_commands += resources[(index, "service", name)].delete_commands
+        for kind, name, resource in document:
+            if kind == "network":
+                network = NetworkParser(network_name=name, network_config=resource.config)
+                delete_commands.append(network.get_delete_command())
+        lines += render_docker_commands(start_commands, delete_commands)
+    return lines
+
+
+def reconcile(previous: dict, current: dict, remove_volumes: bool = False) -> Reconciliation:
+    """Works out the commands to go from the resources of one version of a docker-compose file to another.
+
+    The commands are in the order they need to be run. Changed and removed services are stopped and removed, and
+    services are disconnected from networks they no longer use. Then changed and removed networks and volumes are
+    removed, new and changed ones are created. Finally new and changed services are built and run, and services are
+    connected to their new networks. External networks and volumes, and volumes unless ``remove_volumes`` is set, are
+    kept as they are, so the services using them aren't recreated either.
+
+    Args:
+        previous (dict): Of ``Resource`` from the old version, as returned by ``get_resources``.
+        current (dict): Of ``Resource`` from the new version.
+        remove_volumes (bool, optional): Remove volumes which changed or no longer exist, deleting their data.
+
+    Returns:
+        Reconciliation: What changed and the commands to apply the changes.
+
+    """
+    added = [key for key in current if key not in previous]
+    removed = [key for key in previous if key not in current]
+    changed = set()
+    for key, resource in current.items():
+        _, kind, _ = key
+        if kind != "service" and key in previous and resource.start_commands != previous[key].start_commands:
+            changed.add(key)
+
+    kept = []
+    for key, resource in previous.items():
+        _, kind, _ = key
+        if key in current and key not in changed:
+            continue
+        external = is_external(resource.config) or (key in current and is_external(current[key].config))
+        if external or (kind == "volume" and not remove_volumes):
+            kept.append(key)
+    changed.difference_update(kept)
+    removed = [key for key in removed if key not in kept]
+
+    replaced = {name for _, kind, name in changed.union(removed) if kind != "service"}
+    reconnected = []
+    for key, resource in current.items():
+        _, kind, _ = key
+        if kind != "service" or key not in previous:
+            continue
+
+        old_resource = previous[key]
+        if (
+            resource.build_commands != old_resource.build_commands
+            or resource.start_commands != old_resource.start_commands
+            or replaced & get_used_resources(old_resource)
+        ):
+            changed.add(key)
+        elif resource.connect_commands != old_resource.connect_commands:
+            reconnected.append(key)
+
+    changed = [key for key in current if key in changed]
+    deleted = [key for key in previous if key in changed or key in removed]
+    delete_commands = []
+    for key in reconnected:
+        connect_commands = current[key].connect_commands
+        for command in previous[key].connect_commands:
+            if command not in connect_commands:
+                delete_commands.append(get_disconnect_command(command))
+    delete_commands += [command for key in reversed(deleted) for command in previous[key].delete_commands]
+
+    created = [key for key in current if key in changed or key not in previous]
+    start_commands = [command for key in created if key[1] != "service" for command in current[key].start_commands]
+    services = [current[key] for key in created if key[1] == "service"]
+    start_commands += merge_build_commands([command for service in services for command in service.build_commands])
+    for service in services:
+        start_commands += service.start_commands + service.connect_commands
+    for key in reconnected:
+        old_connect_commands = previous[key].connect_commands
+        start_commands += [command for command in current[key].connect_commands if command not in old_connect_commands]
+
+    return Reconciliation(
+        added=added,
+        changed=changed,
+        reconnected=reconnected,
+        removed=removed,
+        kept=kept,
+        delete_commands=delete_commands,
+        start_commands=start_commands,
+    )
+
+
+def is_external(config: Optional[dict]) -> bool:
+    """Checks if a network or volume is external, created outside of the docker-compose file.
+
+    Args:
+        config (dict): The config of the network or volume, None if it doesn't set any options.
+
+    Returns:
+        bool: True if it is external.
+
+    """
+    return bool(config and config.get("external"))
+
+
+def get_used_resources(service: Resource) -> set:
+    """Gets the names of the networks and volumes a service uses, from its `docker run` and `docker network connect`
+    commands.
+
+    Args:
+        service (Resource): The service.
+
+    Returns:
+        set: Of the network and volume names.
+
+    """
+    names = set()
+    for command in service.start_commands:
+        for option, value in zip(command.args, command.args[1:]):
+            if option == "--network":
+                names.add(value)
+            elif option == "--volume":
+                names.add(value.split(":")[0])
+    names.update(command.args[-2] for command in service.connect_commands)
+    return names
+
+
+def get_disconnect_command(connect_command: Command) -> Command:
+    """Gets the `docker network disconnect` command which undoes a `docker network connect` command.
+
+    Args:
+        connect_command (Command): i.e. ``docker network connect --alias db backend example_db``.
+
+    Returns:
+        Command: i.e. ``docker network disconnect backend example_db``.
+
+    """
+    *_, network, container = connect_command.args
+    return Command(subcommand=("network", "disconnect"), args=[network, container])
+
+
+def render_reconciliation(reconciliation: Reconciliation) -> list:
+    """Renders the commands into the lines printed by the cli, with comments listing what changed.
+
+    Args:
+        reconciliation (Reconciliation): What changed and the commands to apply the changes.
+
+    Returns:
+        list: Of lines to output, empty if nothing changed.
+
+    """
+    lines = []
+    for description, keys in [
+        ("Added", reconciliation.added),
+        ("Changed", reconciliation.changed),
+        ("Reconnected", reconciliation.reconnected),
+        ("Removed", reconciliation.removed),
+        ("Kept", reconciliation.kept),
+    ]:
+        if keys:
+            lines.append(f"# {description}: {', '.join(f'{kind} {name}' for _, kind, name in keys)}")
+    if not lines:
+        return []
+
+    lines.insert(0, "")
+    if reconciliation.delete_commands:
+        lines += ["", "# Delete Commands: ", ""]
+        lines += [command.render() for command in reconciliation.delete_commands]
+    if reconciliation.start_commands:
+        lines += ["", "# Start Commands: ", ""]
+        lines += [command.render() for command in reconciliation.start_commands]
+    return lines
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""This module renders a plan (see ``composerisation.executor``) as a bash script, so independent commands are run in
+parallel by the shell. Each chain is started as a background job, at most ``MAX_JOBS`` jobs run at once and each stage
+waits for all of its jobs to finish before the next stage starts. Once a command fails no new jobs are started, and
+the script exits with the exit code of the first command that failed.
+
+.. _Google Python Style Guide:
+    http://google.github.io/styleguide/pyguide.html
+
+"""
+import os
+
+START_SCRIPT = "start.sh"
+STOP_SCRIPT = "stop.sh"
+
+SCRIPT_HEADER = """#!/usr/bin/env bash
+# {description}, generated by composerisation.
+# Independent commands run in parallel, set MAX_JOBS to change how many run at once.
+set -u
+
+MAX_JOBS="${{MAX_JOBS:-{max_jobs}}}"
+status=0
+pids=()
+
+# Keeps the exit code of the first command that failed.
+record() {{
+    [ "$status" -ne 0 ] || status=$1
+}}
+
+# Waits for every job in the stage to finish, then exits if any command has failed.
+join() {{
+    for pid in ${{pids[@]+"${{pids[@]}}"}}; do
+        wait "$pid" || record $?
+    done
+    pids=()
+    if [ "$status" -ne 0 ]; then
+        echo "A command failed with exit code $status, stopping." >&2
+        exit "$status"
+    fi
+}}
+
+# Waits until fewer than MAX_JOBS jobs are running, stops starting new jobs once a command has failed.
+throttle() {{
+    while [ "$(jobs -pr | wc -l)" -ge "$MAX_JOBS" ]; do
+        wait -n || record $?
+    done
+    [ "$status" -eq 0 ] || join
+}}
+"""
+
+
+def render_script(plan: list, description: str, max_jobs: int = 4) -> str:
+    """Renders a plan as a bash script, each chain becomes a background job with its commands joined by ``&&``.
+
+    ::
+
+        throttle
+        { docker build --tag example_web . && docker run --name example_web --detach example_web; } & pids+=("$!")
+        join
+
+    Args:
+        plan (list): The stages to run, see ``composerisation.executor``.
+        description (str): What the script does, added as a comment at the top of the script.
+        max_jobs (int, optional): The default number of jobs to run at once.
+
+    Returns:
+        str: The bash script.
+
+    """
+    lines = [SCRIPT_HEADER.format(description=description, max_jobs=max_jobs)]
+    for stage in plan:
+        for chain in stage:
+            commands = " && ".join(command.render() for command in chain)
+            lines.append("throttle")
+            lines.append(f'{{ {commands}; }} & pids+=("$!")')
+        lines.append("join\n")
+    return "\n".join(lines)
+
+
+def write_script(path: str, script: str):
+    """Writes a script and makes it executable.
+
+    Args:
+        path (str): Where to write the script to.
+        script (str): The contents of the script.
+
+    """
+    with open(path, "w") as script_file:
+        script_file.write(script)
+    os.chmod(path, 0o755)
@@ -1,4 +1,25 @@
 class IncorrectConfigException(Exception):
     def __init__(self, config_name, incorrect_key):
+        super().__init__(f"Invalid key {incorrect_key} in {config_name}.")
         self.config_name = config_name
         self.incorrect_key = incorrect_key
+
+
+class InvalidDocumentException(IncorrectConfigException):
+    def __init__(self, document_type):
+        Exception.__init__(self, f"A docker-compose file must be a mapping, not {document_type}.")
+        self.config_name = "docker-compose file"
+        self.incorrect_key = None
+        self.document_type = document_type
+
+
+class CyclicDependencyException(Exception):
+    def __init__(self, services):
+        super().__init__(f"Services depend on each other, {' -> '.join(services)}.")
+        self.services = services
+
+
+class DaemonRunningException(Exception):
+    def __init__(self, socket_path):
+        super().__init__(f"A server is already listening on {socket_path}.")
+        self.socket_path = socket_path
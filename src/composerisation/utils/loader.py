@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""This module parses yaml, using the much faster libyaml based loader when PyYaml was built with libyaml and falling
+back to the pure Python loader otherwise. Both raise a ``yaml.YAMLError`` for invalid yaml.
+
+.. _Google Python Style Guide:
+    http://google.github.io/styleguide/pyguide.html
+
+"""
+from typing import Iterator
+from typing import TextIO
+from typing import Union
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as Loader
+except ImportError:
+    from yaml import SafeLoader as Loader
+
+
+def load(data: Union[str, TextIO]):
+    """Parses a yaml document.
+
+    Args:
+        data (str, file): The yaml document, or the file to read it from.
+
+    Returns:
+        any: The parsed yaml document.
+
+    Raises:
+        YAMLError: When the data is not valid yaml.
+
+    """
+    return yaml.load(data, Loader=Loader)
+
+
+def load_all(stream: Union[str, TextIO]) -> Iterator:
+    """Parses each document in a yaml stream, i.e. separated by ``---``. Documents are parsed one at a time as you
+    iterate, so only the current document is kept in memory.
+
+    Args:
+        stream (str, file): The yaml documents, or the file to read them from.
+
+    Yields:
+        any: Each parsed yaml document.
+
+    Raises:
+        YAMLError: When the data is not valid yaml.
+
+    """
+    return yaml.load_all(stream, Loader=Loader)
+
+
+def get_loader_name() -> str:
+    """Gets the name of the loader we parse yaml with.
+
+    Returns:
+        str: ``CSafeLoader`` when using libyaml, else ``SafeLoader``.
+
+    """
+    return Loader.__name__
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""This module watches a docker-compose file for changes (``--watch``), printing only the commands for the networks,
+volumes and services which changed since the file was last converted, see ``composerisation.reconcile``.
+
+Only the resources whose config changed are converted again, the commands of the rest are kept from the last time.
+The file is polled rather than watched with inotify, so it works on every platform without any extra dependencies.
+
+.. _Google Python Style Guide:
+    http://google.github.io/styleguide/pyguide.html
+
+"""
+import logging
+import os
+import threading
+from typing import Callable
+from typing import TextIO
+from typing import Union
+
+from .converter import load_docker_compose_documents
+from .docker_compose.project import Project
+from .docker_compose.project import get_project
+from .reconcile import get_resources
+from .reconcile import reconcile
+from .reconcile import render_reconciliation
+from .reconcile import render_resources
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.5
+
+
+class Watcher:
+    """Converts a docker-compose file each time it changes, keeping the commands of every resource so the next time
+    only the resources which changed are converted.
+
+    ::
+
+        watcher = Watcher()
+        print("\\n".join(watcher.update(data)))  # Every command, the same as the cli prints.
+        print("\\n".join(watcher.update(new_data)))  # Only the commands for the resources which changed.
+
+    Args:
+        project (Project, optional): The project to convert for, by default named after the current directory.
+        remove_volumes (bool, optional): Remove volumes which changed or no longer exist, deleting their data.
+
+    Attributes:
+        resources (dict): Of ``Resource`` from the last update, see ``composerisation.reconcile.get_resources``.
+
+    """
+
+    def __init__(self, project: Project = None, remove_volumes: bool = False):
+        self.project = project or get_project()
+        self.remove_volumes = remove_volumes
+        self.resources = None
+
+    def update(self, stream: Union[str, TextIO]) -> list:
+        """Converts the latest contents of the docker-compose file. If the file is invalid, the resources from the
+        last update are kept so the next update is compared against them.
+
+        Args:
+            stream (str, file): The contents of the docker-compose file, or the file to read them from.
+
+        Returns:
+            list: Of lines to output. The first time every command, after that only the commands for the resources
+                which changed (see ``composerisation.reconcile``).
+
+        Raises:
+            YAMLError: When the data is not valid yaml.
+            IncorrectConfigException: When a resource has an invalid config.
+            CyclicDependencyException: When services depend on each other.
+
+        """
+        documents = list(load_docker_compose_documents(stream))
+        resources = get_resources(documents, previous=self.resources, project=self.project)
+        if self.resources is None:
+            lines = render_resources(documents, resources)
+        else:
+            lines = render_reconciliation(reconcile(self.resources, resources, remove_volumes=self.remove_volumes))
+        self.resources = resources
+        return lines
+
+
+def watch_file(
+    path: str, on_change: Callable[[], None], interval: float = POLL_INTERVAL, stop: threading.Event = None
+):
+    """Polls a file, calling ``on_change`` straight away and then every time the file changes. A file counts as
+    changed when its modified time or size changes, so saving it without changing anything also counts. If the file
+    is removed, i.e. some editors save by replacing the file, we wait for it to come back.
+
+    Args:
+        path (str): The file to watch.
+        on_change (callable): Called every time the file changes.
+        interval (float, optional): How often to check the file, in seconds.
+        stop (threading.Event, optional): Stops watching once set, otherwise we watch until interrupted.
+
+    """
+    stop = stop or threading.Event()
+    last_seen = None
+    while not stop.is_set():
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            stat = None
+
+        if stat is not None:
+            seen = (stat.st_mtime_ns, stat.st_size)
+            if seen != last_seen:
+                last_seen = seen
+                on_change()
+        stop.wait(interval)
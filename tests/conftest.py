@@ -1,3 +1,5 @@
+import os
+
 import pytest
 from click.testing import CliRunner
 
@@ -5,3 +7,35 @@ from click.testing import CliRunner
 @pytest.fixture(scope="module")
 def runner():
     return CliRunner()
+
+
+STUB_DOCKER = """#!/bin/sh
+echo "start $*" >> "$DOCKER_LOG"
+sleep "${DOCKER_SLEEP:-0}"
+echo "end $*" >> "$DOCKER_LOG"
+if [ -n "$DOCKER_FAIL" ]; then
+    case "$*" in *"$DOCKER_FAIL"*) echo "stub docker failed" && exit 1 ;; esac
+fi
+"""
+
+
+@pytest.fixture
+def docker(tmp_path, monkeypatch):
+    """A stub ``docker`` executable on the ``PATH``, which logs when each command starts and ends. Returns a function
+    to read the log as a list of ``(event, command)``."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    stub = bin_dir / "docker"
+    stub.write_text(STUB_DOCKER)
+    stub.chmod(0o755)
+    log = tmp_path / "docker.log"
+    log.touch()
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("DOCKER_LOG", str(log))
+    monkeypatch.delenv("DOCKER_FAIL", raising=False)
+    monkeypatch.delenv("DOCKER_SLEEP", raising=False)
+
+    def read_log():
+        return [tuple(line.split(" ", 1)) for line in log.read_text().splitlines()]
+
+    return read_log
@@ -8,7 +8,7 @@ from composerisation.docker_compose.networks.networks import NetworkParser
     [
         (
             {"example": {"driver": "foobar", "driver_opts": {"foo": "bar", "baz": 1}, "name": "my-network"}},
-            ['docker network create --driver foobar --opt "foo=bar" --opt "baz=1" --name my-network example'],
+            ["docker network create --driver foobar --opt foo=bar --opt baz=1 --name my-network example"],
         ),
         (
             {
@@ -24,7 +24,7 @@ from composerisation.docker_compose.networks.networks import NetworkParser
             [
                 "docker network create --internal network1",
                 'docker network create --label "com.example.description=Financial transaction network"'
-                ' --label "com.example.department=Finance" --label "com.example.label-with-empty-value" network2',
+                " --label com.example.department=Finance --label com.example.label-with-empty-value network2",
             ],
         ),
         (
@@ -42,7 +42,7 @@ def test_get_start_networks_command(networks_data, expected_command):
     for name, config in networks_data.items():
         networks = NetworkParser(network_name=name, network_config=config)
         command = networks.get_start_command()
-        commands.append(command)
+        commands.append(command.render())
     assert commands == expected_command
 
 
@@ -76,5 +76,5 @@ def test_get_delete_network_commands(networks_data, expected_command):
     for name, config in networks_data.items():
         networks = NetworkParser(network_name=name, network_config=config)
         command = networks.get_delete_command()
-        commands.append(command)
+        commands.append(command.render())
     assert commands == expected_command
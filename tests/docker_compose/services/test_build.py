@@ -1,6 +1,7 @@
 import pytest
 
 from composerisation.docker_compose.services.build import ServiceBuildParser
+from composerisation.docker_compose.services.build import merge_build_commands
 
 
 @pytest.mark.parametrize(
@@ -14,8 +15,8 @@ from composerisation.docker_compose.services.build import ServiceBuildParser
                 "shm_size": "2gb",
             },
             (
-                'docker build --build-arg "buildno=1" --build-arg "gitcommithash=cdc3b19" --cache-from "alpine:latest"'
-                ' --cache-from "corp/web_app:3.14" --shm-size 2gb --tag build2 .'
+                "docker build --build-arg buildno=1 --build-arg gitcommithash=cdc3b19 --cache-from alpine:latest"
+                " --cache-from corp/web_app:3.14 --shm-size 2gb --tag build2 ."
             ),
         ),
         (
@@ -33,9 +34,9 @@ from composerisation.docker_compose.services.build import ServiceBuildParser
                 "target": "prod",
             },
             (
-                'docker build --file ./dir/Dockerfile-alternate --build-arg "buildno=1" --shm-size 10000000'
-                ' --label "com.example.description=Accounting webapp" --label "com.example.department=Finance"'
-                ' --label "com.example.label-with-empty-value" --target prod --tag build1 ./dir'
+                "docker build --file ./dir/Dockerfile-alternate --build-arg buildno=1 --shm-size 10000000"
+                ' --label "com.example.description=Accounting webapp" --label com.example.department=Finance'
+                " --label com.example.label-with-empty-value --target prod --tag build1 ./dir"
             ),
         ),
         (
@@ -50,9 +51,9 @@ from composerisation.docker_compose.services.build import ServiceBuildParser
                 },
             },
             (
-                'docker build --cache-from "alpine:latest" --cache-from "corp/web_app:3.14" --build-arg "buildno=1" --build-arg "gitcommithash=cdc3b19"'
-                ' --label "com.example.description=Accounting webapp" --label "com.example.department=Finance"'
-                ' --label "com.example.label-with-empty-value=" --tag build .'
+                "docker build --cache-from alpine:latest --cache-from corp/web_app:3.14 --build-arg buildno=1"
+                ' --build-arg gitcommithash=cdc3b19 --label "com.example.description=Accounting webapp"'
+                " --label com.example.department=Finance --label com.example.label-with-empty-value= --tag build ."
             ),
         ),
     ],
@@ -60,4 +61,30 @@ from composerisation.docker_compose.services.build import ServiceBuildParser
 def test_get_build_command(service_name, build_data, expected_command):
     build = ServiceBuildParser(service_name=service_name, build_config=build_data)
     command = build.get_command()
-    assert command == expected_command
+    assert command.render() == expected_command
+
+
+@pytest.mark.parametrize(
+    "builds, expected_commands",
+    [
+        (
+            [
+                ("worker", {"context": "./app", "args": {"buildno": 1}}),
+                ("web", {"context": "./web"}),
+                ("scheduler", {"context": "./app", "args": ["buildno=1"]}),
+                ("beat", {"context": "./app", "args": {"buildno": 1}, "target": "beat"}),
+            ],
+            [
+                "docker build --build-arg buildno=1 --tag worker --tag scheduler ./app",
+                "docker build --tag web ./web",
+                "docker build --build-arg buildno=1 --target beat --tag beat ./app",
+            ],
+        ),
+        ([("web", {}), ("web", {})], ["docker build --tag web ."]),
+        ([], []),
+    ],
+)
+def test_merge_build_commands(builds, expected_commands):
+    parsers = [ServiceBuildParser(service_name=name, build_config=config) for name, config in builds]
+    commands = merge_build_commands([parser.get_command() for parser in parsers])
+    assert [command.render() for command in commands] == expected_commands
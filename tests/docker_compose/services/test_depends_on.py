@@ -0,0 +1,77 @@
+import pytest
+
+from composerisation.docker_compose.services.depends_on import get_dependencies
+from composerisation.docker_compose.services.depends_on import get_start_levels
+from composerisation.utils.exceptions import CyclicDependencyException
+from composerisation.utils.exceptions import IncorrectConfigException
+
+
+@pytest.mark.parametrize(
+    "service_options, expected_dependencies",
+    [
+        ({}, []),
+        ({"depends_on": ["db", "redis"]}, ["db", "redis"]),
+        ({"depends_on": {"db": {"condition": "service_healthy"}, "redis": {}}}, ["db", "redis"]),
+    ],
+)
+def test_get_dependencies(service_options, expected_dependencies):
+    assert get_dependencies("web", service_options) == expected_dependencies
+
+
+def test_get_dependencies_invalid():
+    with pytest.raises(IncorrectConfigException):
+        get_dependencies("web", {"depends_on": "db"})
+
+
+@pytest.mark.parametrize(
+    "services_data, expected_levels",
+    [
+        ({}, []),
+        ({"web": {}, "db": {}}, [["web", "db"]]),
+        (
+            {"web": {"depends_on": ["app"]}, "app": {"depends_on": ["db"]}, "db": {}},
+            [["db"], ["app"], ["web"]],
+        ),
+        (
+            {
+                "proxy": {"depends_on": ["web", "api"]},
+                "web": {"depends_on": {"db": {"condition": "service_started"}}},
+                "api": {"depends_on": ["db", "cache"]},
+                "db": {},
+                "cache": {},
+            },
+            [["db", "cache"], ["web", "api"], ["proxy"]],
+        ),
+        ({"web": {"depends_on": ["missing"]}, "db": {}}, [["web", "db"]]),
+        ({"web": {"depends_on": ["db", "db"]}, "db": {}}, [["db"], ["web"]]),
+    ],
+)
+def test_get_start_levels(services_data, expected_levels):
+    assert get_start_levels(services_data) == expected_levels
+
+
+def test_get_start_levels_chain():
+    count = 20000
+    services_data = {f"service{index}": {"depends_on": [f"service{index + 1}"]} for index in range(count - 1)}
+    services_data[f"service{count - 1}"] = {}
+    levels = get_start_levels(services_data)
+    assert len(levels) == count
+    assert levels[0] == [f"service{count - 1}"]
+    assert levels[-1] == ["service0"]
+
+
+@pytest.mark.parametrize(
+    "services_data, expected_cycle",
+    [
+        ({"web": {"depends_on": ["web"]}}, ["web", "web"]),
+        (
+            {"web": {"depends_on": ["app"]}, "app": {"depends_on": ["db"]}, "db": {"depends_on": ["app"]}},
+            ["app", "db", "app"],
+        ),
+    ],
+)
+def test_get_start_levels_cycle(services_data, expected_cycle):
+    with pytest.raises(CyclicDependencyException) as e:
+        get_start_levels(services_data)
+    assert e.value.services == expected_cycle
+    assert str(e.value) == f"Services depend on each other, {' -> '.join(expected_cycle)}."
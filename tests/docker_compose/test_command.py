@@ -0,0 +1,56 @@
+import os
+import subprocess
+
+import pytest
+
+from composerisation.docker_compose.command import Command
+from composerisation.docker_compose.command import expand_variables
+from composerisation.docker_compose.command import quote
+
+
+@pytest.mark.parametrize(
+    "arg, expected_arg",
+    [
+        ("nginx:latest", "nginx:latest"),
+        ("com.example.department=IT/Ops", "com.example.department=IT/Ops"),
+        ("com.example.description=Accounting webapp", '"com.example.description=Accounting webapp"'),
+        ("$HOME/data:/data", '"$HOME/data:/data"'),
+        ('say "hello"', '"say \\"hello\\""'),
+        ("`whoami`", '"\\`whoami\\`"'),
+        ("", '""'),
+    ],
+)
+def test_quote(arg, expected_arg):
+    assert quote(arg) == expected_arg
+
+
+def test_command():
+    command = Command(subcommand=("network", "connect"), args=["--alias", "my db", "backend", "example_db"])
+    assert command.argv == ["docker", "network", "connect", "--alias", "my db", "backend", "example_db"]
+    assert command.render() == 'docker network connect --alias "my db" backend example_db'
+
+
+ENVIRON = {"TAG": "1.19", "EMPTY": "", "HOME": "/home/user"}
+
+
+@pytest.mark.parametrize(
+    "arg, expected_arg",
+    [
+        ("nginx:${TAG}", "nginx:1.19"),
+        ("$HOME/data:/data", "/home/user/data:/data"),
+        ("${MISSING}-$MISSING", "-"),
+        ("${MISSING:-latest}", "latest"),
+        ("${EMPTY:-latest}", "latest"),
+        ("${EMPTY-latest}", ""),
+        ("${MISSING-$TAG}", "1.19"),
+        ("costs 5$", "costs 5$"),
+        ("no variables", "no variables"),
+    ],
+)
+def test_expand_variables(arg, expected_arg):
+    assert expand_variables(arg, ENVIRON) == expected_arg
+    # The same as the shell expands the printed command.
+    process = subprocess.run(
+        f"printf %s {quote(arg)}", shell=True, env={**os.environ, **ENVIRON}, stdout=subprocess.PIPE, check=True
+    )
+    assert process.stdout.decode() == expected_arg
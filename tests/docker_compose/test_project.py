@@ -0,0 +1,32 @@
+import os
+
+from composerisation.converter import get_docker_commands
+from composerisation.docker_compose.project import Project
+from composerisation.docker_compose.project import get_project
+from composerisation.docker_compose.services.services import ServicesParser
+
+
+def test_project():
+    project = Project(name="example")
+    assert project.network_name == "example_network"
+    assert project.get_resource_name("web") == "example_web"
+
+
+def test_get_project():
+    assert get_project("example") == Project(name="example")
+    assert get_project() == Project(name=os.path.basename(os.getcwd()))
+
+
+def test_project_shared(monkeypatch):
+    project = get_project()
+
+    def getcwd():
+        raise AssertionError("The project should only be worked out once.")
+
+    monkeypatch.setattr(os, "getcwd", getcwd)
+    service = ServicesParser(service_name="web", service_options={"build": {"context": "."}}, project=project)
+    assert service.get_build_command().args[-2] == f"{project.name}_web"
+
+    docker_compose = {"services": {"web": {"image": "nginx"}, "db": {"image": "postgres"}}}
+    commands = get_docker_commands(docker_compose, project=project)
+    assert f"docker network rm {project.network_name}" in commands
@@ -0,0 +1,95 @@
+import os
+import shutil
+
+import pytest
+
+from composerisation.batch import convert_file
+from composerisation.batch import convert_files
+from composerisation.batch import find_docker_compose_files
+from composerisation.batch import get_output_path
+from composerisation.cli import cli
+
+
+@pytest.fixture
+def input_dir(tmp_path):
+    os.makedirs(tmp_path / "app")
+    shutil.copy("tests/data/1.yml", tmp_path / "docker-compose.yml")
+    shutil.copy("tests/data/2.yml", tmp_path / "app" / "docker-compose.prod.yml")
+    shutil.copy("tests/data/invalid_option.yml", tmp_path / "app" / "docker-compose.invalid.yaml")
+    shutil.copy("tests/data/3.yml", tmp_path / "app" / "other.yml")
+    return str(tmp_path)
+
+
+def test_find_docker_compose_files(input_dir):
+    paths = find_docker_compose_files(input_dir)
+    assert paths == [
+        os.path.join(input_dir, "app", "docker-compose.invalid.yaml"),
+        os.path.join(input_dir, "app", "docker-compose.prod.yml"),
+        os.path.join(input_dir, "docker-compose.yml"),
+    ]
+
+
+def test_get_output_path():
+    output_path = get_output_path("input/app/docker-compose.yml", "input", "output")
+    assert output_path == os.path.join("output", "app", "docker-compose.sh")
+
+
+@pytest.mark.parametrize(
+    "path, expected_output, expected_error",
+    [
+        ("tests/data/1.yml", open("tests/data/1.txt").read().rstrip("\n"), ""),
+        ("tests/data/invalid_option.yml", "", "Invalid key context in web_server."),
+        ("tests/data/invalid_yaml.yml", "", "Invalid yaml file, tests/data/invalid_yaml.yml."),
+        ("tests/data/missing.yml", "", "Could not read file, No such file or directory."),
+        ("tests/data/not_a_mapping.yml", "", "A docker-compose file must be a mapping, not str."),
+        ("tests/data/null_services.yml", "", "Invalid key services in docker-compose file."),
+        ("tests/data/scalar_service.yml", "", "Invalid key web in services."),
+        (
+            "tests/data/invalid_type.yml",
+            "",
+            "Invalid config in tests/data/invalid_type.yml, 'int' object is not subscriptable.",
+        ),
+    ],
+)
+def test_convert_file(path, expected_output, expected_error):
+    result = convert_file(path)
+    assert result.path == path
+    assert result.output == expected_output
+    assert result.error == expected_error
+
+
+def test_convert_files():
+    paths = ["tests/data/1.yml", "tests/data/invalid_option.yml", "tests/data/not_a_mapping.yml", "tests/data/2.yml"]
+    results = list(convert_files(paths, workers=2))
+    assert [result.path for result in results] == paths
+    assert [bool(result.error) for result in results] == [False, True, True, False]
+
+
+def test_convert_files_cache_dir(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    paths = ["tests/data/1.yml", "tests/data/2.yml"]
+    expected_outputs = [result.output for result in convert_files(paths, workers=2)]
+    for _ in range(2):
+        results = list(convert_files(paths, workers=2, cache_dir=cache_dir))
+        assert [result.output for result in results] == expected_outputs
+    assert os.listdir(cache_dir)
+
+
+def test_cli_input_dir_output_dir(runner, input_dir, tmp_path_factory):
+    output_dir = str(tmp_path_factory.mktemp("output"))
+    result = runner.invoke(cli, ["-d", input_dir, "-o", output_dir, "-w", "2"])
+    assert result.exit_code == 1
+    assert "Invalid key context in web_server." in result.stdout
+    assert open(os.path.join(output_dir, "docker-compose.sh")).read() == open("tests/data/1.txt").read().rstrip("\n")
+    assert open(os.path.join(output_dir, "app", "docker-compose.prod.sh")).read() == (
+        open("tests/data/2.txt").read().rstrip("\n")
+    )
+    assert not os.path.exists(os.path.join(output_dir, "app", "docker-compose.invalid.sh"))
+
+
+def test_cli_input_dir(runner, tmp_path):
+    shutil.copy("tests/data/1.yml", tmp_path / "docker-compose.yml")
+    result = runner.invoke(cli, ["-d", str(tmp_path)])
+    assert result.exit_code == 0
+    path = os.path.join(str(tmp_path), "docker-compose.yml")
+    assert result.stdout == f"\n# {path}\n{open('tests/data/1.txt').read()}"
@@ -0,0 +1,54 @@
+from benchmarks.generator import dump
+from benchmarks.generator import get_docker_compose
+from benchmarks.suite import benchmark
+from benchmarks.suite import compare
+from benchmarks.website_load import get_documents
+from benchmarks.website_load import percentile
+from composerisation.converter import load_docker_compose
+from composerisation.docker_compose.services.depends_on import get_start_levels
+
+
+def test_get_docker_compose():
+    docker_compose = get_docker_compose(100, labels=2, env_vars=3, ulimits=False)
+    assert len(docker_compose["services"]) == 100
+    assert len(docker_compose["networks"]) == 10
+    assert len(docker_compose["volumes"]) == 10
+    assert len(get_start_levels(docker_compose["services"])) == 7
+
+    service = docker_compose["services"]["service1"]
+    assert len(service["labels"]) == 2
+    assert len(service["environment"]) == 3
+    assert "ulimits" not in service
+    assert "logging" in service
+    assert load_docker_compose(dump(docker_compose)) == docker_compose
+
+
+def test_benchmark():
+    result = benchmark(10, repeat=1)
+    assert sorted(result) == ["cli", "delete", "load", "start"]
+    assert all(step["services_per_second"] > 0 for step in result.values())
+
+
+def test_compare():
+    baseline = {"10": {"load": {"services_per_second": 100}, "start": {"services_per_second": 100}}}
+    results = {
+        "10": {"load": {"services_per_second": 70}, "start": {"services_per_second": 90}},
+        "100": {"load": {"services_per_second": 1}},
+    }
+    assert compare(results, baseline, tolerance=0.25) == ["load (10 services) is 30% slower than the baseline."]
+
+
+def test_get_documents():
+    documents = get_documents(50, large=0.2, large_services=20)
+    sizes = [size for size, _ in documents]
+    assert 0 < sizes.count("large") < sizes.count("small")
+    assert len({document for _, document in documents}) == 50
+    small = max(len(document) for size, document in documents if size == "small")
+    assert all(len(document) > small for size, document in documents if size == "large")
+
+
+def test_percentile():
+    latencies = list(range(1, 101))
+    assert percentile(latencies, 50) == 51
+    assert percentile(latencies, 99) == 100
+    assert percentile([5], 99) == 5
@@ -0,0 +1,120 @@
+import os
+
+import pytest
+
+from composerisation.cache import ConversionCache
+from composerisation.cache import get_key
+from composerisation.cli import cli
+from composerisation.converter import get_docker_commands
+from composerisation.converter import get_docker_start_plan
+from composerisation.converter import load_docker_compose
+from composerisation.docker_compose.command import Command
+
+DATA = open("tests/data/1.yml").read()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ConversionCache(str(tmp_path / "cache"))
+
+
+def test_cached_output(cache):
+    expected_output = get_docker_commands(load_docker_compose(DATA))
+    assert get_docker_commands(load_docker_compose(DATA), cache=cache) == expected_output
+    assert cache.hits == 0 and cache.misses
+
+    cache = ConversionCache(cache.directory)
+    assert get_docker_commands(load_docker_compose(DATA), cache=cache) == expected_output
+    assert cache.hits and cache.misses == 0
+
+
+def test_cached_plan(cache):
+    expected_plan = get_docker_start_plan(load_docker_compose(DATA))
+    get_docker_start_plan(load_docker_compose(DATA), cache=cache)
+    cache = ConversionCache(cache.directory)
+    assert get_docker_start_plan(load_docker_compose(DATA), cache=cache) == expected_plan
+
+
+def test_changed_service(cache):
+    get_docker_commands(load_docker_compose(DATA), cache=cache)
+    docker_compose = load_docker_compose(DATA)
+    service = next(iter(docker_compose["services"].values()))
+    service["restart"] = "on-failure"
+
+    cache = ConversionCache(cache.directory)
+    commands = get_docker_commands(docker_compose, cache=cache)
+    assert cache.misses == 1
+    assert any("--restart on-failure" in command for command in commands)
+
+
+def test_get_key():
+    key = get_key("service", "web", {"image": "nginx"}, {"project": "example"})
+    assert key == get_key("service", "web", {"image": "nginx"}, {"project": "example"})
+    assert key != get_key("service", "web", {"image": "nginx"}, {"project": "other"})
+    assert key != get_key("service", "web", {"image": "nginx:1.19"}, {"project": "example"})
+    assert get_key("service", "web", {1: "a"}, {}) != get_key("service", "web", {"1": "a"}, {})
+    assert get_key("service", "web", {"a": 1}, {}) != get_key("service", "web", [["a", 1]], {})
+
+
+def test_get_key_order():
+    config = {"image": "nginx", "restart": "always", "labels": {"a": "1", "b": "2"}}
+    key = get_key("service", "web", config, {})
+    assert key != get_key("service", "web", {"restart": "always", "image": "nginx", "labels": config["labels"]}, {})
+    assert key != get_key("service", "web", {**config, "labels": {"b": "2", "a": "1"}}, {})
+
+
+def test_cached_output_order(cache):
+    docker_compose = {"services": {"web": {"image": "nginx", "restart": "always", "ports": ["80:80"]}}}
+    get_docker_commands(docker_compose, cache=cache)
+
+    reordered = {"services": {"web": {"ports": ["80:80"], "restart": "always", "image": "nginx"}}}
+    cache = ConversionCache(cache.directory)
+    assert get_docker_commands(reordered, cache=cache) == get_docker_commands(reordered)
+    assert cache.misses == 1
+
+
+def test_invalid_entry(cache):
+    def convert():
+        return {"start": [Command(subcommand=("volume", "create"), args=["data"])]}
+
+    commands = cache.get_commands("volume", "data", {}, {}, convert)
+    for name in os.listdir(cache.directory):
+        with open(os.path.join(cache.directory, name), "w") as entry_file:
+            entry_file.write("{")
+
+    cache = ConversionCache(cache.directory)
+    assert cache.get_commands("volume", "data", {}, {}, convert) == commands
+    assert cache.misses == 1
+
+
+def test_prune(cache):
+    def convert():
+        return {"start": [Command(subcommand=("volume", "create"), args=["data"])]}
+
+    for index in range(10):
+        cache.get_commands("volume", f"volume{index}", {}, {}, convert)
+        path = os.path.join(cache.directory, f"{get_key('volume', f'volume{index}', {}, {})}.json")
+        os.utime(path, (index, index))
+    entry_size = os.path.getsize(path)
+
+    cache.max_size = entry_size * 4
+    assert cache.prune() == 6
+    assert len(os.listdir(cache.directory)) == 4
+    assert os.path.exists(path)
+
+
+@pytest.mark.parametrize("args, cached", [([], True), (["--no-cache"], False)])
+def test_cli_cache_dir(runner, tmp_path, args, cached):
+    cache_dir = tmp_path / "cache"
+    result = runner.invoke(cli, ["-l", "ERROR", "-i", "tests/data/1.yml", "--cache-dir", str(cache_dir), *args])
+    assert result.exit_code == 0
+    assert result.stdout == open("tests/data/1.txt").read()
+    assert bool(cache_dir.exists() and os.listdir(cache_dir)) == cached
+
+
+def test_cli_cache_dir_env(runner, tmp_path):
+    cache_dir = tmp_path / "cache"
+    env = {"COMPOSERISATION_CACHE_DIR": str(cache_dir)}
+    result = runner.invoke(cli, ["-l", "ERROR", "-i", "tests/data/1.yml"], env=env)
+    assert result.exit_code == 0
+    assert os.listdir(cache_dir)
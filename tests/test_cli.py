@@ -24,9 +24,88 @@ def test_success(runner, args, expected_output):
             ["-i", "tests/data/invalid_yaml.yml"],
             "Invalid yaml file, tests/data/invalid_yaml.yml.\n",
         ),
+        (["-i", "tests/data/cyclic_dependency.yml"], "Services depend on each other, web -> app -> web.\n"),
+        (["-i", "tests/data/scalar_service.yml"], "Invalid key web in services.\n"),
     ],
 )
 def test_fail(runner, args, expected_output):
     result = runner.invoke(cli, args)
     assert result.exit_code == 1
     assert result.stdout == expected_output
+
+
+@pytest.mark.parametrize(
+    "args, expected_output",
+    [
+        (["--stream", "-i", "tests/data/1.yml"], open("tests/data/1.txt").read()),
+        (["--stream", "-i", "tests/data/2.yml"], open("tests/data/2.txt").read()),
+    ],
+)
+def test_stream(runner, args, expected_output):
+    result = runner.invoke(cli, args)
+    assert result.exit_code == 0
+    assert result.stdout == expected_output
+
+
+def test_stream_fail(runner):
+    result = runner.invoke(cli, ["--stream", "-i", "tests/data/invalid_option.yml"])
+    assert result.exit_code == 1
+    assert result.stdout.endswith("Invalid key context in web_server.\n")
+
+
+@pytest.mark.parametrize("args", [["-i", "tests/data/5.yml"], ["--stream", "-i", "tests/data/5.yml"]])
+def test_multiple_documents(runner, args):
+    result = runner.invoke(cli, args)
+    assert result.exit_code == 0
+    assert result.stdout == open("tests/data/5.txt").read()
+
+
+def test_multiple_documents_stdin(runner):
+    result = runner.invoke(cli, [], input=open("tests/data/5.yml").read())
+    assert result.exit_code == 0
+    assert result.stdout == open("tests/data/5.txt").read()
+
+
+def test_multiple_documents_invalid_yaml(runner):
+    docker_compose = open("tests/data/3.yml").read() + "---\n" + open("tests/data/invalid_yaml.yml").read()
+    result = runner.invoke(cli, [], input=docker_compose)
+    assert result.exit_code == 1
+    assert result.stdout.startswith("\n# Start Commands: \n")
+    assert result.stdout.endswith("docker network rm composerisation_network\nInvalid yaml file, <stdin>.\n")
+
+
+def test_shared_build(runner):
+    docker_compose = """
+services:
+  web:
+    build: {context: .}
+  worker:
+    build: {context: .}
+    command: celery worker
+"""
+    result = runner.invoke(cli, ["-l", "ERROR"], input=docker_compose)
+    assert result.exit_code == 0
+    assert result.stdout.count("docker build") == 1
+    assert "docker build --tag composerisation_web --tag composerisation_worker .\n" in result.stdout
+
+
+@pytest.mark.parametrize(
+    "args, env",
+    [(["--project-name", "example"], {}), (["-p", "example"], {}), ([], {"COMPOSE_PROJECT_NAME": "example"})],
+)
+def test_project_name(runner, args, env):
+    result = runner.invoke(cli, ["-i", "tests/data/1.yml", *args], env=env)
+    assert result.exit_code == 0
+    assert result.stdout == open("tests/data/1.txt").read().replace("composerisation_", "example_")
+
+
+def test_converter_functions():
+    from composerisation import cli as cli_module
+    from composerisation import converter
+
+    assert cli_module.get_docker_start_commands is converter.get_docker_start_commands
+    assert cli_module.get_docker_delete_commands is converter.get_docker_delete_commands
+    with open("tests/data/5.yml") as input_file:
+        assert cli_module.get_docker_compose(input_file)["services"].keys() == {"db", "php"}
+    with pytest.raises(AttributeError):
+        cli_module.__getattr__("get_missing")
@@ -0,0 +1,66 @@
+import copy
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from composerisation import converter
+from composerisation.cache import ConversionCache
+from composerisation.converter import get_docker_commands
+from composerisation.converter import get_docker_plan
+from composerisation.converter import load_docker_compose
+from composerisation.reconcile import get_resources
+
+
+@pytest.fixture(params=["tests/data/1.yml", "tests/data/2.yml", "tests/data/3.yml"])
+def docker_compose(request):
+    return load_docker_compose(open(request.param).read())
+
+
+@pytest.mark.parametrize(
+    "convert",
+    [
+        get_docker_commands,
+        get_docker_plan,
+        lambda docker_compose: get_resources([docker_compose]),
+        lambda docker_compose: get_docker_plan(docker_compose, start=False),
+    ],
+)
+def test_input_unchanged(docker_compose, convert):
+    expected = copy.deepcopy(docker_compose)
+    convert(docker_compose)
+    assert docker_compose == expected
+
+
+def test_input_unchanged_cache(tmp_path, docker_compose):
+    expected = copy.deepcopy(docker_compose)
+    get_docker_commands(docker_compose, cache=ConversionCache(str(tmp_path)))
+    assert docker_compose == expected
+
+
+def test_convert_shared_document(docker_compose):
+    expected_output = get_docker_commands(copy.deepcopy(docker_compose))
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        outputs = list(executor.map(get_docker_commands, [docker_compose] * 8))
+    assert outputs == [expected_output] * 8
+
+
+def test_generate_docker_commands_lazy(monkeypatch):
+    parsed = []
+    services_parser = converter.ServicesParser
+
+    def record_parser(service_name, **kwargs):
+        parsed.append(service_name)
+        return services_parser(service_name=service_name, **kwargs)
+
+    monkeypatch.setattr(converter, "ServicesParser", record_parser)
+    docker_compose = {
+        "services": {"web": {"image": "nginx", "depends_on": ["db"]}, "db": {"image": "postgres"}},
+        "volumes": {"data": {}},
+    }
+    lines = converter.generate_docker_commands(docker_compose)
+    assert next(line for line in lines if line.startswith("docker volume create"))
+    assert parsed == []
+    assert next(line for line in lines if line.startswith("docker run"))
+    assert parsed == ["db", "web", "db"]
+    assert list(lines)[-1] == "docker network rm composerisation_network"
+    assert parsed == ["db", "web", "db", "web"]
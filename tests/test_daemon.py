@@ -0,0 +1,185 @@
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from composerisation.cli import cli
+from composerisation.client import SOCKET_ENV
+from composerisation.client import forward
+from composerisation.client import main
+from composerisation.client import reads_stdin
+from composerisation.daemon import get_exit_code
+from composerisation.daemon import remove_stale_socket
+from composerisation.utils import exceptions
+
+
+@pytest.fixture
+def server(tmp_path):
+    socket_path = str(tmp_path / "composerisation.sock")
+    args = [sys.executable, "-c", "from composerisation.cli import cli; cli()", "-l", "ERROR", "--serve", socket_path]
+    process = subprocess.Popen(args)
+    deadline = time.monotonic() + 10
+    # The socket exists as soon as the server binds it, but we can only connect once it listens.
+    while not is_listening(socket_path):
+        assert time.monotonic() < deadline and process.poll() is None
+        time.sleep(0.05)
+
+    yield socket_path
+    process.terminate()
+    assert process.wait(timeout=10) == 0
+    assert not os.path.exists(socket_path)
+
+
+def is_listening(socket_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+def forward_output(socket_path, args, stdin=None):
+    stdout, stderr = io.StringIO(), io.StringIO()
+    exit_code = forward(socket_path, args, stdin=stdin, stdout=stdout, stderr=stderr)
+    return {"stdout": stdout.getvalue(), "stderr": stderr.getvalue(), "exit_code": exit_code}
+
+
+def test_forward(server):
+    response = forward_output(server, ["-l", "ERROR", "-i", "tests/data/1.yml"])
+    assert response == {"stdout": open("tests/data/1.txt").read(), "stderr": "", "exit_code": 0}
+
+
+def test_forward_stdin(server):
+    response = forward_output(server, ["-l", "ERROR"], stdin=open("tests/data/2.yml").read())
+    assert response["stdout"] == open("tests/data/2.txt").read()
+
+
+def test_server_streams_output(server):
+    request = {"args": ["-l", "ERROR", "--stream", "-i", "tests/data/1.yml"], "cwd": os.getcwd(), "env": {}}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(server)
+        client.sendall(json.dumps(request).encode())
+        client.shutdown(socket.SHUT_WR)
+        with client.makefile("rb") as response:
+            frames = [json.loads(line.decode()) for line in response]
+
+    # Each line is sent as soon as it is printed, not all at once when the cli exits.
+    *output, exit_frame = frames
+    assert exit_frame == {"exit_code": 0}
+    assert len(output) == len(open("tests/data/1.txt").read().splitlines())
+    assert "".join(frame["stdout"] for frame in output) == open("tests/data/1.txt").read()
+
+
+@pytest.mark.parametrize(
+    "args, expected_stderr, expected_exit_code",
+    [
+        (["-l", "ERROR", "-i", "tests/data/invalid_option.yml"], "Invalid key context in web_server.\n", 1),
+        (["--bogus"], "Error: No such option: --bogus\n", 2),
+    ],
+)
+def test_forward_error(server, args, expected_stderr, expected_exit_code):
+    response = forward_output(server, args)
+    assert response["stderr"].endswith(expected_stderr)
+    assert response["exit_code"] == expected_exit_code
+
+
+def test_forward_env(server, monkeypatch):
+    monkeypatch.setenv("COMPOSE_PROJECT_NAME", "example")
+    response = forward_output(server, ["-l", "ERROR", "-i", "tests/data/1.yml"])
+    assert response["stdout"] == open("tests/data/1.txt").read().replace("composerisation_", "example_")
+
+
+def test_forward_no_server(tmp_path):
+    assert forward(str(tmp_path / "missing.sock"), ["-i", "tests/data/1.yml"]) is None
+
+
+@pytest.fixture
+def broken_server(tmp_path):
+    """A server which reads the request and then closes the connection without a response, like a server whose
+    process for the request crashed."""
+    socket_path = str(tmp_path / "broken.sock")
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(socket_path)
+    listener.listen(1)
+
+    def accept():
+        connection, _ = listener.accept()
+        with connection:
+            b"".join(iter(lambda: connection.recv(65536), b""))
+
+    thread = threading.Thread(target=accept)
+    thread.start()
+    yield socket_path
+    thread.join(timeout=10)
+    listener.close()
+
+
+def test_forward_no_response(broken_server):
+    response = forward_output(broken_server, ["-i", "tests/data/1.yml"])
+    assert response["stdout"] == ""
+    assert response["stderr"].startswith(f"No response from the server on {broken_server}")
+    assert response["exit_code"] == 1
+
+
+def test_main_no_response(broken_server, monkeypatch, capsys):
+    monkeypatch.setenv(SOCKET_ENV, broken_server)
+    with pytest.raises(SystemExit) as e:
+        main(["-l", "ERROR", "-i", "tests/data/1.yml"])
+    assert e.value.code == 1
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.parametrize("use_server", [True, False])
+def test_main(server, tmp_path, monkeypatch, capsys, use_server):
+    monkeypatch.setenv(SOCKET_ENV, server if use_server else str(tmp_path / "missing.sock"))
+    with pytest.raises(SystemExit) as e:
+        main(["-l", "ERROR", "-i", "tests/data/1.yml"])
+    assert e.value.code == 0
+    assert capsys.readouterr().out == open("tests/data/1.txt").read()
+
+
+@pytest.mark.parametrize(
+    "code, expected_exit_code, expected_stderr", [(None, 0, ""), (0, 0, ""), (2, 2, ""), ("Failed", 1, "Failed\n")]
+)
+def test_get_exit_code(capsys, code, expected_exit_code, expected_stderr):
+    assert get_exit_code(code) == expected_exit_code
+    assert capsys.readouterr().err == expected_stderr
+
+
+def test_remove_stale_socket(server, tmp_path):
+    with pytest.raises(exceptions.DaemonRunningException):
+        remove_stale_socket(server)
+
+    stale_path = tmp_path / "stale.sock"
+    stale_path.touch()
+    remove_stale_socket(str(stale_path))
+    assert not stale_path.exists()
+
+
+@pytest.mark.parametrize(
+    "args, expected",
+    [
+        ([], True),
+        (["-l", "ERROR"], True),
+        (["-i", "-"], True),
+        (["-i", "docker-compose.yml"], False),
+        (["-idocker-compose.yml"], False),
+        (["--input-file=docker-compose.yml"], False),
+        (["-d", "."], False),
+    ],
+)
+def test_reads_stdin(args, expected):
+    assert reads_stdin(args) == expected
+
+
+def test_serve_conflict(runner):
+    result = runner.invoke(cli, ["--serve", "composerisation.sock", "--watch"])
+    assert result.exit_code == 2
+    assert "--watch cannot be used with --serve." in result.stdout
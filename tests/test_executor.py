@@ -0,0 +1,255 @@
+import pytest
+
+from composerisation import converter
+from composerisation.cli import cli
+from composerisation.converter import get_docker_delete_commands
+from composerisation.converter import get_docker_delete_plan
+from composerisation.converter import get_docker_plan
+from composerisation.converter import get_docker_start_commands
+from composerisation.converter import get_docker_start_plan
+from composerisation.converter import merge_docker_plans
+from composerisation.docker_compose.command import Command
+from composerisation.executor import get_resources
+from composerisation.executor import run_command
+from composerisation.executor import run_plan
+
+
+def get_max_concurrency(log):
+    running, max_running = 0, 0
+    for event, _ in log:
+        running += 1 if event == "start" else -1
+        max_running = max(max_running, running)
+    return max_running
+
+
+def get_index(log, event, command):
+    return log.index((event, command))
+
+
+@pytest.fixture
+def docker_compose():
+    return {
+        "services": {
+            "web": {"build": {"context": "."}, "networks": {"backend": {}}},
+            "db": {"image": "postgres"},
+        },
+        "networks": {"backend": {}},
+        "volumes": {"data": {}},
+    }
+
+
+def test_run_command(docker):
+    result = run_command(Command(subcommand=("network", "create"), args=["backend"]))
+    assert result.ok
+    assert result.returncode == 0
+    assert result.duration > 0
+    assert docker() == [("start", "network create backend"), ("end", "network create backend")]
+
+
+def test_run_command_variables(docker, monkeypatch):
+    monkeypatch.setenv("TAG", "1.19")
+    monkeypatch.delenv("MISSING", raising=False)
+    command = Command(subcommand=("run",), args=["--label", "version=${MISSING:-1}", "nginx:${TAG}"])
+    result = run_command(command)
+    assert result.command == command
+    assert docker()[0] == ("start", "run --label version=1 nginx:1.19")
+
+
+def test_run_command_missing_docker(monkeypatch, tmp_path):
+    monkeypatch.setenv("PATH", str(tmp_path))
+    result = run_command(Command(subcommand=("ps",), args=[]))
+    assert result.returncode == 127
+    assert not result.ok
+
+
+def test_get_docker_start_plan(docker_compose):
+    resources, services = get_docker_start_plan(docker_compose)
+    assert [chain[0].argv[-1] for chain in resources] == ["backend", "composerisation_network", "data", "."]
+    assert [[command.subcommand for command in chain] for chain in services] == [
+        [("run",), ("network", "connect")],
+        [("run",)],
+    ]
+
+
+def test_get_docker_start_plan_depends_on(docker_compose):
+    docker_compose["services"]["web"]["depends_on"] = ["db"]
+    _, first_level, second_level = get_docker_start_plan(docker_compose)
+    assert [chain[-1].argv[-1] for chain in first_level] == ["postgres"]
+    assert [chain[-1].subcommand for chain in second_level] == [("network", "connect")]
+
+
+def test_get_docker_delete_plan_depends_on(docker_compose):
+    docker_compose["services"]["web"]["depends_on"] = ["db"]
+    first_level, second_level, _ = get_docker_delete_plan(docker_compose)
+    assert [chain[0].argv[-1] for chain in first_level] == ["composerisation_web"]
+    assert [chain[0].argv[-1] for chain in second_level] == ["composerisation_db"]
+
+
+def test_get_docker_delete_plan(docker_compose):
+    services, networks = get_docker_delete_plan(docker_compose)
+    assert [[command.subcommand for command in chain] for chain in services] == [[("stop",), ("rm",)]] * 2
+    assert [chain[0].argv[-1] for chain in networks] == ["backend", "composerisation_network"]
+
+
+def test_get_docker_plan(docker_compose):
+    plan = get_docker_plan(docker_compose)
+    assert plan.start_stages == get_docker_start_plan(docker_compose)
+    assert plan.delete_stages == get_docker_delete_plan(docker_compose)
+    assert plan.get_start_commands() == get_docker_start_commands(docker_compose)
+    assert plan.get_delete_commands() == get_docker_delete_commands(docker_compose)
+
+
+@pytest.mark.parametrize("start, delete", [(True, False), (False, True)])
+def test_get_docker_plan_only(docker_compose, start, delete):
+    plan = get_docker_plan(docker_compose, start=start, delete=delete)
+    assert bool(plan.start_stages) == start
+    assert bool(plan.delete_stages) == delete
+
+
+def test_merge_docker_plans(docker_compose):
+    other = {"services": {"cache": {"image": "redis"}}}
+    plans = [get_docker_plan(docker_compose), get_docker_plan(other)]
+    plan = merge_docker_plans(plans)
+    assert plan.start_stages[0] == plans[0].start_stages[0]
+    assert plan.start_stages[1:] == plans[0].start_stages[1:] + plans[1].start_stages[1:]
+    assert plan.delete_stages[:-1] == plans[0].delete_stages[:-1] + plans[1].delete_stages[:-1]
+    assert plan.delete_stages[-1] == plans[0].delete_stages[-1]
+
+    start_plans = [get_docker_plan(docker_compose, delete=False), get_docker_plan(other, delete=False)]
+    assert merge_docker_plans(start_plans).delete_stages == []
+
+
+def test_get_docker_plan_single_pass(monkeypatch, docker_compose):
+    parsed = []
+    get_start_levels = converter.get_start_levels
+
+    def count_start_levels(services_data):
+        parsed.append(services_data)
+        return get_start_levels(services_data)
+
+    monkeypatch.setattr(converter, "get_start_levels", count_start_levels)
+    get_docker_plan(docker_compose)
+    assert len(parsed) == 1
+
+
+def test_run_plan_order(docker, docker_compose):
+    results = run_plan(get_docker_start_plan(docker_compose), workers=4)
+    assert len(results) == 7
+    assert all(result.ok for result in results)
+
+    log = docker()
+    resources = ["network create backend", "volume create data", "build --tag composerisation_web ."]
+    last_resource = max(get_index(log, "end", command) for command in resources)
+    first_service = min(index for index, (event, command) in enumerate(log) if command.startswith("run"))
+    assert last_resource < first_service
+    run = get_index(log, "end", "run --name composerisation_web --detach composerisation_web")
+    connect = get_index(log, "start", "network connect backend composerisation_web")
+    assert run < connect
+
+
+@pytest.mark.parametrize("workers, expected_concurrency", [(1, 1), (2, 2), (4, 4)])
+def test_run_plan_concurrency(docker, monkeypatch, workers, expected_concurrency):
+    monkeypatch.setenv("DOCKER_SLEEP", "0.2")
+    plan = [[[Command(subcommand=("network", "create"), args=[f"network{index}"])] for index in range(4)]]
+    results = run_plan(plan, workers=workers)
+    assert len(results) == 4
+    assert get_max_concurrency(docker()) == expected_concurrency
+
+
+def test_run_plan_fail_fast(docker, monkeypatch):
+    monkeypatch.setenv("DOCKER_FAIL", "build")
+    plan = [
+        [[Command(subcommand=("build",), args=["."]), Command(subcommand=("run",), args=["web"])]],
+        [[Command(subcommand=("network", "connect"), args=["backend", "web"])]],
+    ]
+    results = run_plan(plan, workers=2)
+    assert [(result.command.subcommand, result.returncode) for result in results] == [(("build",), 1)]
+    assert results[0].output == "stub docker failed\n"
+
+
+def test_run_plan_continue_on_error(docker, monkeypatch):
+    monkeypatch.setenv("DOCKER_FAIL", "build")
+    plan = [
+        [[Command(subcommand=("build",), args=["."]), Command(subcommand=("run",), args=["web"])]],
+        [[Command(subcommand=("run",), args=["db"])]],
+    ]
+    results = run_plan(plan, workers=2, continue_on_error=True)
+    assert [(result.command.subcommand, result.returncode) for result in results] == [(("build",), 1), (("run",), 0)]
+
+
+def test_run_plan_skip_dependents(docker, monkeypatch):
+    monkeypatch.setenv("DOCKER_FAIL", "run --name b")
+    plan = [
+        [[Command(subcommand=("network", "create"), args=["backend"])]],
+        [
+            [Command(subcommand=("run",), args=["--name", "b", "--network", "backend", "--detach", "nginx"])],
+            [Command(subcommand=("run",), args=["--name", "c", "--detach", "nginx"])],
+        ],
+        [[Command(subcommand=("run",), args=["--name", "d", "--detach", "nginx"])]],
+        [[Command(subcommand=("run",), args=["--name", "e", "--volumes-from", "d", "--detach", "nginx"])]],
+    ]
+    results = run_plan(plan, workers=2, continue_on_error=True, dependencies={"d": ["b"]})
+    assert [result.returncode for result in results] == [0, 1, 0]
+    assert [result.command.get_options("--name") for result in results] == [[], ["b"], ["c"]]
+    assert not any(command.startswith(("run --name d", "run --name e")) for _, command in docker())
+
+
+@pytest.mark.parametrize(
+    "failed_command, skipped_service",
+    [("network create backend", "web"), ("volume create data", "db"), ("build", "web")],
+)
+def test_run_plan_skip_resources(docker, monkeypatch, docker_compose, failed_command, skipped_service):
+    monkeypatch.setenv("DOCKER_FAIL", failed_command)
+    docker_compose["services"]["db"]["volumes"] = ["data:/var/lib/postgresql/data"]
+    results = run_plan(get_docker_start_plan(docker_compose), workers=2, continue_on_error=True)
+    started = [result.command.get_options("--name")[0] for result in results if result.command.subcommand == ("run",)]
+    assert started == [f"composerisation_{name}" for name in ("web", "db") if name != skipped_service]
+
+
+def test_get_docker_plan_dependencies(docker_compose):
+    docker_compose["services"]["web"]["depends_on"] = ["db"]
+    docker_compose["services"]["db"]["container_name"] = "database"
+    plan = get_docker_plan(docker_compose)
+    assert plan.dependencies == {"database": [], "composerisation_web": ["database"]}
+    assert merge_docker_plans([plan, get_docker_plan({"services": {}})]).dependencies == plan.dependencies
+
+
+def test_get_resources():
+    chain = [
+        Command(subcommand=("run",), args=["--name", "web", "-v", "data:/data", "--mount", "src=logs,dst=/logs", "app"]),
+        Command(subcommand=("network", "connect"), args=["--alias", "www", "backend", "web"]),
+    ]
+    created, used = get_resources(chain, {"web": ["db"]})
+    assert created == {("container", "web")}
+    assert {("volume", "data"), ("volume", "logs"), ("network", "backend"), ("container", "db")} <= used
+    assert ("image", "app") in used
+
+
+def test_cli_apply(runner, docker):
+    result = runner.invoke(cli, ["--apply", "start", "-l", "ERROR", "-i", "tests/data/3.yml"])
+    assert result.exit_code == 0
+    assert "# exit code 0" in result.stdout
+    assert len(docker()) == 2 * result.stdout.count("# exit code 0")
+
+
+def test_cli_apply_documents(runner, docker):
+    result = runner.invoke(cli, ["--apply", "start", "-l", "ERROR", "-i", "tests/data/5.yml"])
+    assert result.exit_code == 0
+    commands = [command for event, command in docker() if event == "start"]
+    assert commands.count("network create --driver bridge composerisation_network") == 1
+    assert commands.count("volume create db_volume") == 1
+    assert all(command.startswith(("network", "volume", "build")) for command in commands[:4])
+
+
+def test_cli_apply_fail(runner, docker, monkeypatch):
+    monkeypatch.setenv("DOCKER_FAIL", "network create")
+    result = runner.invoke(cli, ["--apply", "start", "-l", "CRITICAL", "-i", "tests/data/3.yml"])
+    assert result.exit_code == 1
+    assert "# exit code 1" in result.stdout
+    assert "stub docker failed" in result.stdout
+    assert not any(command.startswith("run") for _, command in docker())
+
+
+def test_cli_apply_input_dir(runner):
+    result = runner.invoke(cli, ["--apply", "start", "-d", "tests/data"])
+    assert result.exit_code == 2
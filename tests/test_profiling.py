@@ -0,0 +1,144 @@
+import pstats
+import time
+
+import pytest
+
+from benchmarks.generator import dump
+from benchmarks.generator import get_docker_compose
+from composerisation.cache import ConversionCache
+from composerisation.cli import cli
+from composerisation.profiling import MemoryProfiler
+from composerisation.profiling import TimingProfiler
+from composerisation.profiling import format_duration
+from composerisation.profiling import format_size
+from composerisation.profiling import profile_conversion
+
+STAGES = ["parse", "levels", "networks", "volumes", "builds", "services", "delete"]
+
+
+@pytest.fixture(scope="module")
+def synthetic_profiles():
+    """Memory profiles of a small and a large docker-compose file, with the same networks and volumes."""
+    profiles = []
+    for services in [100, 800]:
+        docker_compose = get_docker_compose(
+            services, networks=10, volumes=10, labels=1, env_vars=1, ulimits=False, logging=False
+        )
+        profiler = MemoryProfiler()
+        for _ in profile_conversion(dump(docker_compose), profiler):
+            pass
+        # The last stage is parsing the end of the file, so only keep the first stage with each name.
+        profiles.append((services, {stage.name: stage for stage in reversed(profiler.stages)}))
+    return profiles
+
+
+@pytest.mark.parametrize("profiler", [MemoryProfiler(), TimingProfiler()])
+def test_profile_conversion(profiler):
+    lines = profile_conversion(open("tests/data/5.yml"), profiler)
+    assert "\n".join(lines) + "\n" == open("tests/data/5.txt").read()
+    assert [stage.name for stage in profiler.stages] == STAGES * 2 + ["parse"]
+
+
+def test_profile_conversion_cache(tmp_path):
+    caches = [ConversionCache(str(tmp_path)) for _ in range(2)]
+    for cache in caches:
+        lines = profile_conversion(open("tests/data/1.yml"), TimingProfiler(), cache=cache)
+        assert "\n".join(lines) + "\n" == open("tests/data/1.txt").read()
+    assert caches[0].misses == caches[1].hits > 0
+
+
+def test_profile_conversion_top(synthetic_profiles):
+    _, stages = synthetic_profiles[-1]
+    assert all(len(stage.top) == 5 for name, stage in stages.items() if name != "delete")
+    assert any("yaml" in statistic.traceback[0].filename for statistic in stages["parse"].top)
+    assert any("composerisation" in statistic.traceback[0].filename for statistic in stages["services"].top)
+
+
+@pytest.mark.parametrize(
+    "stage, max_peak_per_service",
+    [
+        ("parse", 16 * 1024),
+        ("levels", 1024),
+        ("builds", 1024),
+        ("services", 1024),
+        ("networks", 0),
+        ("volumes", 0),
+        ("delete", 0),
+    ],
+)
+def test_peak_memory_per_service(synthetic_profiles, stage, max_peak_per_service):
+    """How much more memory each stage needs for each extra service. The networks, volumes and delete commands are
+    streamed, so they need no more memory however many services there are."""
+    (small, small_stages), (large, large_stages) = synthetic_profiles
+    extra_peak = large_stages[stage].peak - small_stages[stage].peak
+    assert extra_peak <= max_peak_per_service * (large - small) + 2 * 1024
+
+
+def test_memory_profiler():
+    with MemoryProfiler(top=1) as profiler:
+        with profiler.stage("allocate"):
+            data = [bytearray(1024) for _ in range(100)]
+        with profiler.stage("free"):
+            del data
+
+    allocate, free = profiler.stages
+    assert allocate.retained >= 100 * 1024
+    assert free.retained <= -100 * 1024
+    assert len(allocate.top) == 1
+    assert profiler.peak == max(stage.peak for stage in profiler.stages)
+    assert "Stage" in profiler.report().splitlines()[0]
+
+
+@pytest.mark.parametrize("size, expected_size", [(512, "512 B"), (1536, "1.5 KiB"), (-2 * 1024 ** 2, "-2.0 MiB")])
+def test_format_size(size, expected_size):
+    assert format_size(size) == expected_size
+
+
+def test_timing_profiler():
+    with TimingProfiler(top=2) as profiler:
+        with profiler.stage("services"):
+            for name, seconds in [("web", 0.01), ("db", 0.03), ("cache", 0.02)]:
+                with profiler.resource(name):
+                    time.sleep(seconds)
+
+    assert [stage.name for stage in profiler.stages] == ["services"]
+    assert profiler.total >= 0.06
+    report = profiler.report().splitlines()
+    assert report[1].startswith("services ")
+    assert report[-3] == "Slowest 2 of 3 services:"
+    assert [line.split()[-1] for line in report[-2:]] == ["db", "cache"]
+
+
+def test_timing_profiler_services():
+    profiler = TimingProfiler()
+    lines = list(profile_conversion(open("tests/data/1.yml"), profiler))
+    assert lines
+    assert sorted(resource.name for resource in profiler.resources) == ["app", "database", "web_server"]
+
+
+@pytest.mark.parametrize("seconds, expected_duration", [(2, "2.00 s"), (0.0015, "1.50 ms"), (0.0000025, "2.5 us")])
+def test_format_duration(seconds, expected_duration):
+    assert format_duration(seconds) == expected_duration
+
+
+def test_cli_profile(runner, tmp_path):
+    profile_output = str(tmp_path / "cli.pstats")
+    args = ["-l", "ERROR", "--profile", "--profile-output", profile_output, "-i", "tests/data/1.yml"]
+    result = runner.invoke(cli, args)
+    assert result.exit_code == 0
+    assert result.stdout.startswith(open("tests/data/1.txt").read())
+    assert "Slowest 3 of 3 services:" in result.stdout
+    assert pstats.Stats(profile_output).total_calls > 0
+
+
+def test_cli_memory_profile(runner):
+    result = runner.invoke(cli, ["-l", "ERROR", "--memory-profile", "-i", "tests/data/1.yml"])
+    assert result.exit_code == 0
+    assert result.stdout.startswith(open("tests/data/1.txt").read())
+    assert "\ndelete " in result.stdout
+
+
+def test_cli_memory_profile_invalid_yaml(runner):
+    result = runner.invoke(cli, ["--memory-profile", "-i", "tests/data/invalid_yaml.yml"])
+    assert result.exit_code == 1
+    assert result.stdout.endswith("Invalid yaml file, tests/data/invalid_yaml.yml.\n")
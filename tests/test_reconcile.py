@@ -0,0 +1,162 @@
+import copy
+
+import pytest
+
+from composerisation.cli import cli
+from composerisation.reconcile import get_resources
+from composerisation.reconcile import reconcile
+from composerisation.reconcile import render_reconciliation
+
+OLD = {
+    "services": {
+        "web": {"image": "nginx:1.19", "networks": {"front": {}}},
+        "api": {"image": "api:1", "networks": {"front": {}, "back": {}}},
+        "db": {"image": "postgres", "volumes": ["data:/var/lib/postgresql"]},
+        "old": {"image": "busybox"},
+    },
+    "networks": {"front": {}, "back": {}},
+    "volumes": {"data": {}, "logs": {}},
+}
+
+
+def get_new():
+    new = copy.deepcopy(OLD)
+    new["services"]["web"]["image"] = "nginx:1.20"
+    new["services"]["api"]["networks"] = {"front": {"aliases": ["api"]}}
+    del new["services"]["old"]
+    new["services"]["cache"] = {"image": "redis"}
+    del new["volumes"]["logs"]
+    return new
+
+
+def render(old: dict, new: dict, remove_volumes: bool = False) -> list:
+    previous, current = get_resources([copy.deepcopy(old)]), get_resources([copy.deepcopy(new)])
+    return render_reconciliation(reconcile(previous, current, remove_volumes=remove_volumes))
+
+
+def test_no_changes():
+    assert render(OLD, OLD) == []
+
+
+def test_reconcile():
+    reconciliation = reconcile(get_resources([copy.deepcopy(OLD)]), get_resources([get_new()]), remove_volumes=True)
+    assert reconciliation.added == [(0, "service", "cache")]
+    assert reconciliation.changed == [(0, "service", "web")]
+    assert reconciliation.reconnected == [(0, "service", "api")]
+    assert reconciliation.removed == [(0, "volume", "logs"), (0, "service", "old")]
+    assert reconciliation.kept == []
+    assert [command.render() for command in reconciliation.delete_commands] == [
+        "docker network disconnect front composerisation_api",
+        "docker network disconnect back composerisation_api",
+        "docker stop composerisation_old",
+        "docker rm composerisation_old",
+        "docker stop composerisation_web",
+        "docker rm composerisation_web",
+        "docker volume rm logs",
+    ]
+    assert [command.render() for command in reconciliation.start_commands] == [
+        "docker run --name composerisation_web --detach nginx:1.20",
+        "docker network connect front composerisation_web",
+        "docker run --network composerisation_network --name composerisation_cache --detach redis",
+        "docker network connect --alias api front composerisation_api",
+    ]
+
+
+@pytest.mark.parametrize(
+    "kind, name, service",
+    [("volumes", "data", "db"), ("networks", "front", "web")],
+)
+def test_changed_resource_recreates_services(kind, name, service):
+    new = copy.deepcopy(OLD)
+    new[kind][name] = {"labels": ["com.example=changed"]}
+    reconciliation = reconcile(get_resources([copy.deepcopy(OLD)]), get_resources([new]), remove_volumes=True)
+    assert (0, kind[:-1], name) in reconciliation.changed
+    assert (0, "service", service) in reconciliation.changed
+
+    delete_commands = [command.render() for command in reconciliation.delete_commands]
+    assert delete_commands.index(f"docker stop composerisation_{service}") < delete_commands.index(
+        f"docker {kind[:-1]} rm {name}"
+    )
+
+
+def test_volumes_kept():
+    old = {
+        "services": {"db": {"image": "postgres", "volumes": ["db:/var/lib/postgresql"]}},
+        "volumes": {"db": {"labels": ["com.example=old"]}, "logs": {}},
+    }
+    new = copy.deepcopy(old)
+    new["volumes"]["db"]["labels"] = ["com.example=new"]
+    del new["volumes"]["logs"]
+    reconciliation = reconcile(get_resources([copy.deepcopy(old)]), get_resources([new]))
+    assert reconciliation.kept == [(0, "volume", "db"), (0, "volume", "logs")]
+    assert reconciliation.changed == []
+    assert reconciliation.removed == []
+    assert reconciliation.delete_commands == []
+    assert reconciliation.start_commands == []
+    assert render(old, new) == ["", "# Kept: volume db, volume logs"]
+
+
+@pytest.mark.parametrize("kind", ["networks", "volumes"])
+def test_external_never_removed(kind):
+    old = {"services": {"web": {"image": "nginx"}}, kind: {"shared": {"external": True}}}
+    new = {"services": {"web": {"image": "nginx"}}}
+    reconciliation = reconcile(get_resources([copy.deepcopy(old)]), get_resources([new]), remove_volumes=True)
+    assert reconciliation.kept == [(0, kind[:-1], "shared")]
+    assert reconciliation.removed == []
+    assert reconciliation.delete_commands == []
+
+    new[kind] = {"shared": {"external": True, "labels": ["com.example=changed"]}}
+    reconciliation = reconcile(get_resources([copy.deepcopy(old)]), get_resources([new]), remove_volumes=True)
+    assert reconciliation.changed == []
+    assert reconciliation.delete_commands == []
+
+
+def test_changed_build():
+    old = {"services": {"web": {"build": {"context": "."}}}}
+    new = {"services": {"web": {"build": {"context": ".", "target": "prod"}}}}
+    lines = render(old, new)
+    assert lines[1] == "# Changed: service web"
+    assert lines[-2:] == [
+        "docker build --target prod --tag composerisation_web .",
+        "docker run --network composerisation_network --name composerisation_web --detach composerisation_web",
+    ]
+
+
+def test_cli_diff(runner, tmp_path):
+    old_path = tmp_path / "docker-compose.old.yml"
+    old_path.write_text(open("tests/data/1.yml").read().replace("- 80:80", "- 8080:80"))
+    result = runner.invoke(cli, ["-l", "ERROR", "-i", "tests/data/1.yml", "--diff", str(old_path)])
+    assert result.exit_code == 0
+    assert result.stdout.splitlines()[:7] == [
+        "",
+        "# Changed: service web_server",
+        "",
+        "# Delete Commands: ",
+        "",
+        "docker stop nginx",
+        "docker rm nginx",
+    ]
+
+
+def test_cli_diff_volumes(runner, tmp_path):
+    old_path = tmp_path / "docker-compose.old.yml"
+    new_path = tmp_path / "docker-compose.yml"
+    old_path.write_text("services:\n  db:\n    image: postgres\nvolumes:\n  db: {}\n  data:\n    external: true\n")
+    new_path.write_text("services:\n  db:\n    image: postgres\nvolumes:\n  db:\n    labels: [com.example=new]\n")
+    args = ["-l", "ERROR", "-i", str(new_path), "--diff", str(old_path)]
+    result = runner.invoke(cli, args)
+    assert result.exit_code == 0
+    assert "volume rm" not in result.stdout
+    assert "# Kept: volume db, volume data" in result.stdout
+
+    result = runner.invoke(cli, args + ["--remove-volumes"])
+    assert result.exit_code == 0
+    assert "docker volume rm db" in result.stdout
+    assert "docker volume rm data" not in result.stdout
+    assert "# Kept: volume data" in result.stdout
+
+
+def test_cli_diff_same(runner):
+    result = runner.invoke(cli, ["-l", "ERROR", "-i", "tests/data/1.yml", "--diff", "tests/data/1.yml"])
+    assert result.exit_code == 0
+    assert result.stdout == ""
@@ -0,0 +1,82 @@
+import os
+import subprocess
+
+import pytest
+
+from composerisation.cli import cli
+from composerisation.docker_compose.command import Command
+from composerisation.script import render_script
+from composerisation.script import write_script
+from tests.test_executor import get_index
+from tests.test_executor import get_max_concurrency
+
+
+def get_plan():
+    networks = [[Command(subcommand=("network", "create"), args=[f"network{index}"])] for index in range(4)]
+    service = [[Command(subcommand=("run",), args=["web"]), Command(subcommand=("network", "connect"), args=["web"])]]
+    return [networks, service]
+
+
+def run_script(tmp_path, plan, **env):
+    path = str(tmp_path / "start.sh")
+    write_script(path, render_script(plan, "Starts your containers"))
+    return subprocess.run([path], env={**os.environ, **env}, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+
+def test_render_script():
+    script = render_script(get_plan(), "Starts your containers", max_jobs=8)
+    assert script.startswith("#!/usr/bin/env bash\n# Starts your containers, generated by composerisation.\n")
+    assert 'MAX_JOBS="${MAX_JOBS:-8}"' in script
+    assert script.endswith(
+        'throttle\n{ docker network create network3; } & pids+=("$!")\njoin\n\n'
+        'throttle\n{ docker run web && docker network connect web; } & pids+=("$!")\njoin\n'
+    )
+
+
+@pytest.mark.parametrize("max_jobs, expected_concurrency", [("1", 1), ("2", 2), ("4", 4)])
+def test_script_concurrency(docker, tmp_path, max_jobs, expected_concurrency):
+    process = run_script(tmp_path, get_plan(), MAX_JOBS=max_jobs, DOCKER_SLEEP="0.2")
+    assert process.returncode == 0
+
+    log = docker()
+    assert len(log) == 12
+    assert get_max_concurrency(log) == expected_concurrency
+    last_network = max(get_index(log, "end", f"network create network{index}") for index in range(4))
+    assert last_network < get_index(log, "start", "run web") < get_index(log, "start", "network connect web")
+
+
+def test_script_fail(docker, tmp_path):
+    process = run_script(tmp_path, get_plan(), DOCKER_FAIL="network1")
+    assert process.returncode == 1
+    assert b"A command failed with exit code 1, stopping." in process.stdout
+    assert not any(command == "run web" for _, command in docker())
+
+
+def test_cli_script_dir(runner, tmp_path):
+    script_dir = tmp_path / "scripts"
+    result = runner.invoke(cli, ["-l", "ERROR", "-i", "tests/data/1.yml", "--script-dir", str(script_dir), "-w", "3"])
+    assert result.exit_code == 0
+    assert sorted(os.listdir(script_dir)) == ["start.sh", "stop.sh"]
+    assert os.access(script_dir / "start.sh", os.X_OK)
+
+    start_script = (script_dir / "start.sh").read_text()
+    assert 'MAX_JOBS="${MAX_JOBS:-3}"' in start_script
+    assert start_script.count("docker run") == 3
+    assert (script_dir / "stop.sh").read_text().count("docker stop") == 3
+
+
+def test_cli_script_dir_documents(runner, tmp_path):
+    result = runner.invoke(cli, ["-l", "ERROR", "-i", "tests/data/5.yml", "--script-dir", str(tmp_path)])
+    assert result.exit_code == 0
+    start_script = (tmp_path / "start.sh").read_text()
+    assert start_script.count("docker network create --driver bridge composerisation_network") == 1
+    assert start_script.count("docker run") == 5
+
+    stop_script = (tmp_path / "stop.sh").read_text()
+    assert stop_script.count("docker network rm composerisation_network") == 1
+    assert stop_script.rindex("docker rm") < stop_script.index("docker network rm")
+
+
+def test_cli_script_dir_apply(runner, tmp_path):
+    result = runner.invoke(cli, ["-i", "tests/data/1.yml", "--script-dir", str(tmp_path), "--apply", "start"])
+    assert result.exit_code == 2
@@ -0,0 +1,41 @@
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative time, in seconds, allowed to import the cli and everything it imports. Usually about 0.06s, the budget
+# is generous so slow CI machines don't fail, but still catches eagerly importing yaml or the parsers again.
+STARTUP_BUDGET = 0.25
+LAZY_MODULES = ["yaml", "composerisation.converter", "composerisation.docker_compose"]
+
+
+def get_import_times(*args: str) -> dict:
+    """Runs the cli with ``python -X importtime``, returns the cumulative import time of each module in seconds."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "from composerisation.cli import cli; cli()", *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    assert process.returncode == 0, process.stderr
+
+    import_times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        import_times[module.strip()] = int(cumulative) / 1e6
+    return import_times
+
+
+@pytest.mark.parametrize("args", [["--help"], ["--version"]])
+def test_lazy_imports(args):
+    import_times = get_import_times(*args)
+    imported = [module for module in import_times if module.startswith(tuple(LAZY_MODULES))]
+    assert imported == []
+
+
+def test_startup_budget():
+    runs = [get_import_times("--version") for _ in range(3)]
+    import_times = min(runs, key=lambda times: times["composerisation.cli"])
+    assert import_times["composerisation.cli"] < STARTUP_BUDGET
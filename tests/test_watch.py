@@ -0,0 +1,128 @@
+import threading
+
+import pytest
+import yaml
+
+from composerisation.cli import cli
+from composerisation.converter import get_docker_commands
+from composerisation.converter import load_docker_compose_documents
+from composerisation.docker_compose.services.services import ServicesParser
+from composerisation.watch import Watcher
+from composerisation.watch import watch_file
+
+DATA = open("tests/data/1.yml").read()
+
+
+def get_docker_compose_lines(path):
+    return [line for document in load_docker_compose_documents(open(path)) for line in get_docker_commands(document)]
+
+
+@pytest.fixture
+def watcher():
+    watcher = Watcher()
+    watcher.update(DATA)
+    return watcher
+
+
+def test_first_update():
+    assert "\n".join(Watcher().update(DATA)) + "\n" == open("tests/data/1.txt").read()
+
+
+@pytest.mark.parametrize("path", ["tests/data/2.yml", "tests/data/3.yml", "tests/data/5.yml"])
+def test_first_update_same_as_cli(path):
+    expected = "".join(f"{line}\n" for line in get_docker_compose_lines(path))
+    assert "\n".join(Watcher().update(open(path))) + "\n" == expected
+
+
+def test_first_update_converts_once(monkeypatch):
+    converted = []
+    get_run_commands = ServicesParser.get_run_commands
+
+    def record_run_commands(self):
+        converted.append(self.config_name)
+        return get_run_commands(self)
+
+    monkeypatch.setattr(ServicesParser, "get_run_commands", record_run_commands)
+    Watcher().update(DATA)
+    assert sorted(converted) == ["app", "database", "web_server"]
+
+
+def test_no_changes(watcher):
+    assert watcher.update(DATA) == []
+
+
+def test_changed_service(watcher):
+    lines = watcher.update(DATA.replace("- 80:80", "- 8080:80"))
+    assert lines == [
+        "",
+        "# Changed: service web_server",
+        "",
+        "# Delete Commands: ",
+        "",
+        "docker stop nginx",
+        "docker rm nginx",
+        "",
+        "# Start Commands: ",
+        "",
+        "docker build --file ./docker/nginx/Dockerfile --tag composerisation_web_server .",
+        "docker run --name nginx --publish 8080:80 --network composerisation_network --detach "
+        "composerisation_web_server",
+    ]
+
+
+def test_added_and_removed(watcher):
+    docker_compose = yaml.safe_load(DATA)
+    del docker_compose["services"]["web_server"]
+    docker_compose["services"]["cache"] = {"image": "redis"}
+    docker_compose["volumes"]["cache_volume"] = {}
+
+    lines = watcher.update(yaml.safe_dump(docker_compose))
+    assert lines[1:3] == ["# Added: volume cache_volume, service cache", "# Removed: service web_server"]
+    assert lines[6:8] == ["docker stop nginx", "docker rm nginx"]
+    assert lines[11:] == [
+        "docker volume create cache_volume",
+        "docker run --network composerisation_network --name composerisation_cache --detach redis",
+    ]
+
+
+def test_invalid_update(watcher):
+    with pytest.raises(yaml.YAMLError):
+        watcher.update("services: [")
+    assert watcher.update(DATA) == []
+
+
+def test_watch_file(tmp_path):
+    path = tmp_path / "docker-compose.yml"
+    path.write_text(DATA)
+    changes = []
+    changed = threading.Event()
+    stop = threading.Event()
+
+    def on_change():
+        changes.append(path.read_text())
+        changed.set()
+
+    thread = threading.Thread(target=watch_file, args=(str(path), on_change), kwargs={"interval": 0.01, "stop": stop})
+    thread.start()
+    try:
+        assert changed.wait(5)
+        changed.clear()
+        path.write_text(DATA + "\n")
+        assert changed.wait(5)
+    finally:
+        stop.set()
+        thread.join()
+    assert changes == [DATA, DATA + "\n"]
+
+
+@pytest.mark.parametrize(
+    "args, expected_output",
+    [
+        (["--watch"], "--watch needs a file to watch, it cannot be used with stdin."),
+        (["--watch", "-i", "tests/data/1.yml", "--apply", "start"], "--apply cannot be used with --watch."),
+    ],
+)
+def test_cli_watch_usage(runner, args, expected_output):
+    result = runner.invoke(cli, args, input=DATA)
+    assert result.exit_code == 2
+    assert expected_output in result.stdout
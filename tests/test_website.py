@@ -0,0 +1,85 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+pytest.importorskip("flask")
+
+WEBSITE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "website")
+SCALAR_SERVICE = "services:\n  web: hello\n"
+INVALID_TYPE = "services:\n  web:\n    ports: 80\n"
+
+
+@pytest.fixture
+def website(monkeypatch):
+    monkeypatch.chdir(WEBSITE_DIR)
+    monkeypatch.syspath_prepend(WEBSITE_DIR)
+    import asgi
+    import main
+
+    yield main, asgi
+    asgi.small_lane.shutdown()
+    asgi.large_lane.shutdown()
+
+
+async def post_asgi(app, path: str, data: dict) -> tuple:
+    body = json.dumps(data).encode("utf-8")
+    scope = {"type": "http", "method": "POST", "path": path, "query_string": b"", "headers": []}
+    response = {}
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        else:
+            response["body"] = message["body"]
+
+    await app(scope, receive, send)
+    return response["status"], json.loads(response["body"].decode("utf-8"))
+
+
+@pytest.mark.parametrize(
+    "document, expected_error",
+    [
+        ("hello", "A docker-compose file must be a mapping, not str."),
+        ("services:\n", "Invalid key services in docker-compose file."),
+        (SCALAR_SERVICE, "Invalid key web in services."),
+        (INVALID_TYPE, "Could not convert the docker-compose file, please try again later."),
+    ],
+)
+def test_convert_error(website, document, expected_error):
+    main, _ = website
+    response = main.app.test_client().post("/docker/compose", json={"docker_compose": document})
+    assert response.status_code == 200
+    assert response.get_json() == {"docker_cli": f"{expected_error}\n"}
+
+
+def test_batch_error(website):
+    main, _ = website
+    documents = [main.yaml, "hello", INVALID_TYPE]
+    response = main.app.test_client().post("/docker/compose/batch", json={"docker_compose": documents})
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert results[0]["docker_cli"] and results[0]["error"] is None
+    assert results[1] == {"docker_cli": None, "error": "A docker-compose file must be a mapping, not str."}
+    assert results[2] == {"docker_cli": None, "error": main.INTERNAL_ERROR}
+
+
+def test_asgi_batch_error(website):
+    main, asgi = website
+    documents = [main.yaml, "hello", INVALID_TYPE]
+    request = post_asgi(asgi.app, "/docker/compose/batch", {"docker_compose": documents})
+    status, data = asyncio.new_event_loop().run_until_complete(request)
+    assert status == 200
+    assert data["results"][0]["docker_cli"] and data["results"][0]["error"] is None
+    assert data["results"][1] == {"docker_cli": None, "error": "A docker-compose file must be a mapping, not str."}
+    assert data["results"][2] == {"docker_cli": None, "error": main.INTERNAL_ERROR}
+
+
+def test_sample_output(website):
+    main, _ = website
+    response = main.app.test_client().post("/docker/compose", json={"docker_compose": main.yaml})
+    assert response.get_json() == {"docker_cli": main.bash}
@@ -0,0 +1,27 @@
+import pytest
+import yaml
+
+from composerisation.utils import loader
+
+LOADERS = [yaml.SafeLoader] + ([yaml.CSafeLoader] if yaml.__with_libyaml__ else [])
+
+
+@pytest.fixture(params=LOADERS, ids=lambda yaml_loader: yaml_loader.__name__)
+def yaml_loader(request, monkeypatch):
+    monkeypatch.setattr(loader, "Loader", request.param)
+    return request.param
+
+
+@pytest.mark.parametrize("path", ["tests/data/1.yml", "tests/data/2.yml", "tests/data/3.yml", "tests/data/4.yml"])
+def test_load(yaml_loader, path):
+    data = open(path).read()
+    assert loader.load(data) == yaml.load(data, Loader=yaml.SafeLoader)
+
+
+def test_load_invalid_yaml(yaml_loader):
+    with pytest.raises(yaml.YAMLError):
+        loader.load(open("tests/data/invalid_yaml.yml").read())
+
+
+def test_get_loader_name(yaml_loader):
+    assert loader.get_loader_name() == yaml_loader.__name__
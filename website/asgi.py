@@ -0,0 +1,235 @@
+"""An async entry point for the website, served by an ASGI server i.e. ``uvicorn asgi:app``. Requests are handled on
+an event loop and conversions run in pools of processes, so converting a large docker-compose file never blocks
+other requests. Small files have their own pool, so they are never stuck behind large ones. Once a pool has
+``max_pending`` files waiting or being converted, new files are rejected with a 429 rather than queueing forever.
+
+Only the conversion routes and ``/metrics`` are handled here, every other route is passed to the Flask app in
+``main.py`` and run in a thread."""
+import asyncio
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Tuple
+
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+import metrics
+from main import MAX_BATCH_SIZE, Conversion, add_to_cache, app as flask_app, convert, get_cached, get_etag
+from main import internal_error, record_conversion
+
+CPU_COUNT = os.cpu_count() or 1
+SMALL_DOCUMENT_SIZE = int(os.environ.get("SMALL_DOCUMENT_SIZE", 16 * 1024))
+SMALL_WORKERS = int(os.environ.get("SMALL_WORKERS", max(1, CPU_COUNT // 4)))
+LARGE_WORKERS = int(os.environ.get("LARGE_WORKERS", max(1, CPU_COUNT - SMALL_WORKERS)))
+MAX_PENDING_PER_WORKER = int(os.environ.get("MAX_PENDING_PER_WORKER", 8))
+RETRY_AFTER_SECONDS = 1
+
+logger = logging.getLogger(__name__)
+
+Response = Tuple[int, dict, bytes]
+
+
+class Lane:
+    """A pool of processes converting docker-compose files of one size, which rejects new files once ``max_pending``
+    are waiting or being converted. Only used from the event loop, so ``pending`` doesn't need a lock."""
+
+    def __init__(self, name: str, workers: int, max_pending: int):
+        self.name = name
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.executor = None
+
+    def has_room(self, count: int = 1) -> bool:
+        return self.pending + count <= self.max_pending
+
+    async def convert(self, docker_compose_data: str) -> Conversion:
+        """Converts a docker-compose file in the pool, callers check ``has_room`` first. Never raises, if the pool fails
+        the file gets an internal error, so one file can't fail a whole batch."""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+
+        self.pending += 1
+        metrics.conversions_pending.inc(lane=self.name)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, convert, docker_compose_data)
+        except Exception as e:
+            logger.exception(f"Failed to convert a docker-compose file in the {self.name} pool.")
+            if isinstance(e, BrokenProcessPool):
+                # A worker died, the pool can't be used again so the next file starts a new one.
+                self.executor = None
+            return internal_error()
+        finally:
+            self.pending -= 1
+            metrics.conversions_pending.dec(lane=self.name)
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+small_lane = Lane("small", SMALL_WORKERS, SMALL_WORKERS * MAX_PENDING_PER_WORKER)
+large_lane = Lane("large", LARGE_WORKERS, LARGE_WORKERS * MAX_PENDING_PER_WORKER)
+
+
+def get_lane(docker_compose_data: str) -> Lane:
+    return small_lane if len(docker_compose_data) <= SMALL_DOCUMENT_SIZE else large_lane
+
+
+async def app(scope: dict, receive, send):
+    if scope["type"] == "lifespan":
+        await handle_lifespan(receive, send)
+        return
+
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    body = b"".join(chunks)
+
+    route = routes.get((scope["method"], scope["path"]))
+    if route is None:
+        status, headers, content = await call_flask(scope, body)
+    else:
+        start = time.perf_counter()
+        metrics.requests_in_flight.inc()
+        try:
+            status, headers, content = await route(get_headers(scope), body)
+        finally:
+            metrics.requests_in_flight.dec()
+        metrics.requests_total.inc(route=scope["path"], status=status)
+        metrics.request_seconds.observe(time.perf_counter() - start, route=scope["path"])
+
+    headers = [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": content})
+
+
+async def handle_lifespan(receive, send):
+    """Shuts the pools down when the server stops."""
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            small_lane.shutdown()
+            large_lane.shutdown()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def docker_compose_to_docker_cli(headers: dict, body: bytes) -> Response:
+    data = get_json(body)
+    docker_compose_data = data.get("docker_compose") if isinstance(data, dict) else None
+    if not isinstance(docker_compose_data, str):
+        return json_response({"error": "docker_compose must be a docker-compose file."}, 400)
+
+    etag = get_etag(docker_compose_data)
+    if_none_match = get_if_none_match(headers)
+    if etag in if_none_match or "*" in if_none_match:
+        return 304, {"ETag": f'"{etag}"'}, b""
+
+    result = get_cached(etag)
+    if result is None:
+        lane = get_lane(docker_compose_data)
+        if not lane.has_room():
+            return too_many_requests()
+        result = add_to_cache(etag, record_conversion(docker_compose_data, await lane.convert(docker_compose_data)))
+
+    docker_cli = f"{result.error}\n" if result.error else result.docker_cli
+    return json_response({"docker_cli": docker_cli}, 200, {"ETag": f'"{etag}"'})
+
+
+async def docker_compose_batch_to_docker_cli(headers: dict, body: bytes) -> Response:
+    """The same as ``/docker/compose/batch`` in ``main.py``. The whole batch is rejected if there isn't room for all of
+    its files, so a batch is never half converted."""
+    data = get_json(body)
+    documents = data.get("docker_compose") if isinstance(data, dict) else None
+    if not isinstance(documents, list) or not all(isinstance(document, str) for document in documents):
+        return json_response({"error": "docker_compose must be a list of docker-compose files."}, 400)
+    if len(documents) > MAX_BATCH_SIZE:
+        return json_response({"error": f"Can convert at most {MAX_BATCH_SIZE} docker-compose files at once."}, 400)
+
+    keys = [get_etag(document) for document in documents]
+    results = {key: get_cached(key) for key in keys}
+    missing = {key: document for key, document in zip(keys, documents) if results[key] is None}
+    lanes = [get_lane(document) for document in missing.values()]
+    if not all(lane.has_room(lanes.count(lane)) for lane in {small_lane, large_lane}):
+        return too_many_requests()
+
+    conversions = await asyncio.gather(*[lane.convert(document) for lane, document in zip(lanes, missing.values())])
+    for (key, document), result in zip(missing.items(), conversions):
+        results[key] = add_to_cache(key, record_conversion(document, result))
+
+    response = [{"docker_cli": results[key].docker_cli, "error": results[key].error} for key in keys]
+    return json_response({"results": response}, 200)
+
+
+async def get_metrics(headers: dict, body: bytes) -> Response:
+    return 200, {"Content-Type": "text/plain; version=0.0.4"}, metrics.render().encode("utf-8")
+
+
+routes = {
+    ("POST", "/docker/compose"): docker_compose_to_docker_cli,
+    ("POST", "/docker/compose/batch"): docker_compose_batch_to_docker_cli,
+    ("GET", "/metrics"): get_metrics,
+}
+
+
+async def call_flask(scope: dict, body: bytes) -> Response:
+    """Runs the Flask app in a thread, for the routes which aren't handled here i.e. the index page."""
+    builder = EnvironBuilder(
+        path=scope["path"],
+        method=scope["method"],
+        headers=[(name.decode("latin-1"), value.decode("latin-1")) for name, value in scope["headers"]],
+        data=body,
+        query_string=scope["query_string"].decode("latin-1"),
+    )
+
+    def run() -> Response:
+        app_iter, status, headers = run_wsgi_app(flask_app, builder.get_environ(), buffered=True)
+        try:
+            content = b"".join(app_iter)
+        finally:
+            if hasattr(app_iter, "close"):
+                app_iter.close()
+        return int(status.split(" ", 1)[0]), dict(headers), content
+
+    return await asyncio.get_running_loop().run_in_executor(None, run)
+
+
+def get_headers(scope: dict) -> dict:
+    return {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]}
+
+
+def get_if_none_match(headers: dict) -> set:
+    """The ETags in the ``If-None-Match`` header, without quotes or the weak prefix."""
+    etags = set()
+    for etag in headers.get("if-none-match", "").split(","):
+        etag = etag.strip()
+        if etag.startswith("W/"):
+            etag = etag[2:]
+        etags.add(etag.strip('"'))
+    return etags
+
+
+def get_json(body: bytes):
+    try:
+        return json.loads(body.decode("utf-8"))
+    except ValueError:
+        return None
+
+
+def json_response(data: dict, status: int, headers: dict = None) -> Response:
+    return status, {"Content-Type": "application/json", **(headers or {})}, json.dumps(data).encode("utf-8")
+
+
+def too_many_requests() -> Response:
+    error = {"error": "Too many docker-compose files are waiting to be converted, try again later."}
+    return json_response(error, 429, {"Retry-After": str(RETRY_AFTER_SECONDS)})
@@ -1,13 +1,65 @@
-from click.testing import CliRunner
-from flask import Flask, jsonify, request, render_template
-from composerisation.cli import cli
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+from flask import Flask, Response, g, jsonify, request, render_template
+from yaml import YAMLError
+
+import metrics
+from composerisation.converter import get_docker_commands, load_docker_compose_documents
+from composerisation.utils.exceptions import CyclicDependencyException, IncorrectConfigException
+
+CACHE_SIZE = 512
+MAX_BATCH_SIZE = 500
+INTERNAL_ERROR = "Could not convert the docker-compose file, please try again later."
 
 app = Flask(__name__, static_url_path="", static_folder="static", template_folder="static")
+logger = logging.getLogger(__name__)
+logging.getLogger("composerisation").setLevel(logging.ERROR)
 
 bash = open("static/content/bash.txt").read()
 usage = open("static/content/usage.txt").read()
 yaml = open("static/content/yaml.txt").read()
 
+cache = OrderedDict()
+cache_lock = threading.Lock()
+executor = None
+executor_lock = threading.Lock()
+
+
+class Conversion(NamedTuple):
+    """The result of converting a docker-compose file, with how long it took so it can be recorded in the metrics."""
+
+    docker_cli: str
+    error: str
+    error_type: str
+    parse_seconds: float
+    convert_seconds: float
+
+
+@app.before_request
+def start_request():
+    g.start = time.perf_counter()
+    metrics.requests_in_flight.inc()
+
+
+@app.after_request
+def record_request(response):
+    route = request.url_rule.rule if request.url_rule else "unknown"
+    metrics.requests_total.inc(route=route, status=response.status_code)
+    metrics.request_seconds.observe(time.perf_counter() - g.start, route=route)
+    return response
+
+
+@app.teardown_request
+def finish_request(_):
+    metrics.requests_in_flight.dec()
+
 
 @app.route("/")
 def main():
@@ -19,10 +71,125 @@ def main():
 def docker_compose_to_docker_cli():
     data = request.get_json()
     docker_compose_data = data["docker_compose"]
-    runner = CliRunner()
-    result = runner.invoke(cli, args=["-l", "DEBUG"], input=docker_compose_data)
-    response = {"docker_cli": result.stdout}
-    return jsonify(response)
+    etag = get_etag(docker_compose_data)
+    if etag in request.if_none_match:
+        return "", 304, {"ETag": f'"{etag}"'}
+
+    result = get_cached(etag)
+    if result is None:
+        result = add_to_cache(etag, record_conversion(docker_compose_data, convert(docker_compose_data)))
+
+    response = jsonify({"docker_cli": f"{result.error}\n" if result.error else result.docker_cli})
+    response.set_etag(etag)
+    return response
+
+
+@app.route("/docker/compose/batch", methods=["POST"])
+def docker_compose_batch_to_docker_cli():
+    """Converts many docker-compose files in one request, each file is converted in parallel. The results are in the
+    same order as the files, if a file cannot be converted its ``docker_cli`` is null and ``error`` says why.
+    """
+    data = request.get_json()
+    documents = data.get("docker_compose") if isinstance(data, dict) else None
+    if not isinstance(documents, list) or not all(isinstance(document, str) for document in documents):
+        return jsonify({"error": "docker_compose must be a list of docker-compose files."}), 400
+    if len(documents) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"Can convert at most {MAX_BATCH_SIZE} docker-compose files at once."}), 400
+
+    keys = [get_etag(document) for document in documents]
+    results = {key: get_cached(key) for key in keys}
+    missing = {key: document for key, document in zip(keys, documents) if results[key] is None}
+    for (key, document), result in zip(missing.items(), get_executor().map(convert, missing.values())):
+        results[key] = add_to_cache(key, record_conversion(document, result))
+
+    response = [{"docker_cli": results[key].docker_cli, "error": results[key].error} for key in keys]
+    return jsonify({"results": response})
+
+
+@app.route("/metrics")
+def get_metrics():
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+def get_etag(docker_compose_data: str) -> str:
+    """The ETag of a docker-compose file, also used as its key in the cache."""
+    return hashlib.sha256(docker_compose_data.encode("utf-8")).hexdigest()
+
+
+def get_cached(key: str) -> Conversion:
+    """Gets the result of a recent conversion from the cache, None if it isn't there."""
+    with cache_lock:
+        if key not in cache:
+            metrics.cache_total.inc(result="miss")
+            return None
+        cache.move_to_end(key)
+        metrics.cache_total.inc(result="hit")
+        return cache[key]
+
+
+def add_to_cache(key: str, result: Conversion) -> Conversion:
+    """Adds the result of a conversion to the cache, evicting the least recently used result when it is full. Internal
+    errors aren't cached, as they may not happen again."""
+    if result.error_type == "internal":
+        return result
+    with cache_lock:
+        cache[key] = result
+        if len(cache) > CACHE_SIZE:
+            cache.popitem(last=False)
+    return result
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """The pool of processes batches are converted in, created on first use."""
+    global executor
+    with executor_lock:
+        if executor is None:
+            executor = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return executor
+
+
+def convert(docker_compose_data: str) -> Conversion:
+    """Converts a docker-compose file, returning the same output as the cli would print or why it failed. Parsing the
+    yaml and converting it are timed separately, documents are parsed one at a time so the two are interleaved."""
+    commands = []
+    timings = {"parse": 0, "convert": 0}
+    try:
+        start = time.perf_counter()
+        for docker_compose in load_docker_compose_documents(docker_compose_data):
+            converting = time.perf_counter()
+            timings["parse"] += converting - start
+            commands += get_docker_commands(docker_compose)
+            start = time.perf_counter()
+            timings["convert"] += start - converting
+        timings["parse"] += time.perf_counter() - start
+    except YAMLError:
+        return Conversion(None, "Invalid yaml file, <stdin>.", "invalid_yaml", timings["parse"], timings["convert"])
+    except IncorrectConfigException as e:
+        return Conversion(None, str(e), "invalid_config", timings["parse"], timings["convert"])
+    except CyclicDependencyException as e:
+        return Conversion(None, str(e), "cyclic_dependency", timings["parse"], timings["convert"])
+    except Exception:
+        # Any other error is a bug in a parser, it only fails this file rather than the whole request or batch.
+        logger.exception("Failed to convert a docker-compose file.")
+        return internal_error(timings["parse"], timings["convert"])
+
+    return Conversion("\n".join(commands) + "\n", None, None, timings["parse"], timings["convert"])
+
+
+def internal_error(parse_seconds: float = 0, convert_seconds: float = 0) -> Conversion:
+    """The result of a conversion which failed for a reason other than the docker-compose file being invalid."""
+    return Conversion(None, INTERNAL_ERROR, "internal", parse_seconds, convert_seconds)
+
+
+def record_conversion(docker_compose_data: str, result: Conversion) -> Conversion:
+    """Records a conversion in the metrics, this is done in the request rather than ``convert`` as batches are
+    converted in other processes."""
+    metrics.input_bytes.observe(len(docker_compose_data.encode("utf-8")))
+    metrics.parse_seconds.observe(result.parse_seconds)
+    metrics.convert_seconds.observe(result.convert_seconds)
+    if result.error_type:
+        metrics.errors_total.inc(type=result.error_type)
+    return result
 
 
 if __name__ == "__main__":
@@ -0,0 +1,123 @@
+"""Prometheus metrics for the website, rendered in the Prometheus text format. Each metric only takes a lock and
+updates a few numbers, so recording them adds very little time to a request."""
+import bisect
+import threading
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Metric:
+    """A metric with a value per set of labels, i.e. ``route="/docker/compose"``."""
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.values = {}
+        self.lock = threading.Lock()
+        registry.append(self)
+
+    def get_key(self, labels: dict) -> tuple:
+        return tuple(str(labels[label]) for label in self.labels)
+
+    def format_labels(self, key: tuple, **extra) -> str:
+        labels = [*zip(self.labels, key), *extra.items()]
+        if not labels:
+            return ""
+        return "{" + ",".join(f'{name}="{value}"' for name, value in labels) + "}"
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        with self.lock:
+            values = dict(self.values)
+        for key, value in sorted(values.items()):
+            lines += self.render_value(key, value)
+        return lines
+
+    def render_value(self, key: tuple, value) -> list:
+        return [f"{self.name}{self.format_labels(key)} {value}"]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self.get_key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self.get_key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """Counts observations into buckets, each value is ``[count per bucket..., sum]``. Buckets are cumulative when
+    rendered, as Prometheus expects."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = buckets
+
+    def observe(self, value: float, **labels):
+        key = self.get_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            counts = self.values.get(key)
+            if counts is None:
+                counts = self.values[key] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def render_value(self, key: tuple, value) -> list:
+        lines = []
+        count = 0
+        for bucket, bucket_count in zip([*self.buckets, "+Inf"], value[:-1]):
+            count += bucket_count
+            lines.append(f"{self.name}_bucket{self.format_labels(key, le=bucket)} {count}")
+        lines.append(f"{self.name}_count{self.format_labels(key)} {count}")
+        lines.append(f"{self.name}_sum{self.format_labels(key)} {value[-1]}")
+        return lines
+
+
+def render() -> str:
+    """All of the metrics in the Prometheus text format."""
+    return "\n".join(line for metric in registry for line in metric.render()) + "\n"
+
+
+registry = []
+
+requests_total = Counter(
+    "composerisation_requests_total", "Number of requests, by route and status code.", ("route", "status")
+)
+request_seconds = Histogram("composerisation_request_seconds", "Time taken to respond to a request.", ("route",))
+requests_in_flight = Gauge("composerisation_requests_in_flight", "Number of requests currently being handled.")
+parse_seconds = Histogram("composerisation_parse_seconds", "Time taken to parse the yaml of a docker-compose file.")
+convert_seconds = Histogram(
+    "composerisation_convert_seconds", "Time taken to convert a parsed docker-compose file to docker commands."
+)
+input_bytes = Histogram(
+    "composerisation_input_bytes", "Size of the docker-compose files converted.", buckets=SIZE_BUCKETS
+)
+errors_total = Counter(
+    "composerisation_errors_total", "Number of docker-compose files which failed to convert, by type.", ("type",)
+)
+conversions_pending = Gauge(
+    "composerisation_conversions_pending",
+    "Number of docker-compose files waiting for or being converted by the async website, by lane (small or large).",
+    ("lane",),
+)
+cache_total = Counter("composerisation_cache_total", "Number of cache lookups, by result (hit or miss).", ("result",))